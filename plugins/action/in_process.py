@@ -0,0 +1,27 @@
+# action used by the modules of this collection (see 'plugin_routing' in meta/runtime.yml)
+#   opt-in: with 'opnsense_in_process: true' the module runs inside the controller process instead of being shipped
+#   to the target host
+
+from ansible.plugins.action.normal import ActionModule as NormalAction
+from ansible.module_utils.parsing.convert_bool import boolean
+
+from ansible_collections.ansibleguy.opnsense.plugins.plugin_utils.controller import \
+    run_module_in_process, IN_PROCESS_VAR
+
+
+class ActionModule(NormalAction):
+    def run(self, tmp=None, task_vars=None):
+        if task_vars is None or not boolean(task_vars.get(IN_PROCESS_VAR, False), strict=False) or \
+                self._task.async_val:
+            return super().run(tmp=tmp, task_vars=task_vars)
+
+        del tmp
+        # the same internal arguments ansible would pass to the module (check-mode, diff, no_log, socket, ..)
+        internal_args = {}
+        self._update_module_args(self._task.action, internal_args, task_vars)
+
+        return run_module_in_process(
+            name=self._task.action.rsplit('.', 1)[-1],
+            args=self._task.args,
+            internal_args=internal_args,
+        )
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (C) 2024, AnsibleGuy <guy@ansibleguy.net>
+# GNU General Public License v3.0+ (see https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# httpapi plugin for the 'ansible.netcommon.httpapi' connection
+#   the connection process (ansible-connection) is kept alive between tasks - so the API session is re-used
+#   the modules send their requests through it if the task uses 'connection: httpapi'
+# pylint: disable=C0413
+
+DOCUMENTATION = r'''
+---
+author: AnsibleGuy (@ansibleguy)
+name: opnsense
+short_description: HttpApi plugin for the OPNSense API
+description:
+  - Sends the API requests of the ansibleguy.opnsense modules through a persistent connection.
+  - Authenticates using the API key as 'ansible_user' and the API secret as 'ansible_httpapi_password'.
+version_added: '1.2.12'
+'''
+
+from urllib.error import HTTPError
+
+try:
+    from ansible_collections.ansible.netcommon.plugins.plugin_utils.httpapi_base import HttpApiBase
+
+except ImportError as error:
+    raise ImportError("The 'ansible.netcommon' collection is needed to use the httpapi connection!") from error
+
+
+class HttpApi(HttpApiBase):
+    def login(self, username: str, password: str) -> None:
+        # the API uses basic-auth per request; there is no session to log into
+        pass
+
+    def logout(self) -> None:
+        pass
+
+    def handle_httperror(self, exc: HTTPError) -> HTTPError:
+        # the modules check the status-code & error-message of the response themselves
+        return exc
+
+    def send_request(self, data: (str, None), path: str, method: str = 'GET', headers: dict = None) -> tuple:
+        response, response_data = self.connection.send(
+            path=path,
+            data=data,
+            method=method,
+            headers=headers or {},
+        )
+
+        # errors are returned as response by 'handle_httperror'; the body was already read into the buffer
+        #   only serializable values can be passed back through the connection
+        return response.getcode(), response_data.getvalue().decode('utf-8'), dict(response.headers.items())
@@ -1,4 +1,10 @@
+from json import dumps as json_dumps
 from socket import setdefaulttimeout
+from threading import Lock
+from atexit import register as atexit_register
+from importlib.util import find_spec
+from pathlib import Path
+from time import perf_counter, sleep
 
 import httpx
 
@@ -8,45 +14,216 @@ from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.api imp
     check_host, ssl_verification, check_response, get_params_path, debug_api, \
     check_or_load_credentials, api_pretty_exception
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import is_ip6
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.cache import ResponseCache
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.trace import trace_api, trace_enabled
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.retry import RetryPolicy, RETRY_EXCEPTIONS
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.httpapi import \
+    HttpApiClient, httpapi_enabled
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import CACHE_PATH
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import \
+    parallel_map, profile_count
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler import \
+    exit_bug, ModuleSoftError, ModuleFailure
 
 DEFAULT_TIMEOUT = 20.0
+CONNECT_TIMEOUT = 2.0
 HTTPX_EXCEPTIONS = (
     httpx.ConnectTimeout, httpx.ConnectError, httpx.ReadTimeout, httpx.WriteTimeout,
     httpx.TimeoutException, httpx.PoolTimeout,
 )
+HTTP2_SUPPORT = find_spec('h2') is not None  # optional dependency of httpx
+POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0)
+SEND_EXCEPTIONS = HTTPX_EXCEPTIONS + RETRY_EXCEPTIONS
+SNAPSHOT_COMMANDS = ('get', 'search')  # read-only commands; their responses are re-used for the whole run
+CACHE_POST_COMMANDS = ('search',)  # read-only POST commands; their responses may be cached on the controller
+
+# clients are shared by all sessions that target the same firewall using the same settings
+#   so the tcp/tls connections can be re-used for the whole process
+_CLIENT_POOL = {}
+_CLIENT_POOL_LOCK = Lock()
+
+
+def _client_pool_key(module: AnsibleModule) -> tuple:
+    return (
+        module.params['firewall'],
+        module.params['api_port'],
+        module.params['api_key'],
+        module.params['api_secret'],
+        module.params['ssl_verify'],
+        module.params['ssl_ca_file'],
+        module.params['api_retries'],
+    )
+
+
+def _client_args(module: AnsibleModule) -> dict:
+    fw = module.params['firewall']
+    if is_ip6(fw, strip_enclosure=False):
+        fw = f"[{fw}]"
+
+    return dict(
+        base_url=f"https://{fw}:{module.params['api_port']}/api",
+        auth=(module.params['api_key'], module.params['api_secret']),
+        timeout=httpx.Timeout(timeout=DEFAULT_TIMEOUT, connect=CONNECT_TIMEOUT),
+    )
+
+
+def _transport_args(module: AnsibleModule) -> dict:
+    return dict(
+        verify=ssl_verification(module=module),
+        retries=module.params['api_retries'],
+        http2=HTTP2_SUPPORT,
+        limits=POOL_LIMITS,
+    )
+
+
+def _create_client(module: AnsibleModule) -> httpx.Client:
+    return httpx.Client(
+        **_client_args(module),
+        transport=httpx.HTTPTransport(**_transport_args(module)),
+    )
+
+
+def get_pooled_client(module: AnsibleModule) -> httpx.Client:
+    key = _client_pool_key(module)
+
+    with _CLIENT_POOL_LOCK:
+        if key not in _CLIENT_POOL or _CLIENT_POOL[key].is_closed:
+            _CLIENT_POOL[key] = _create_client(module)
+
+        return _CLIENT_POOL[key]
+
+
+def set_pooled_client(module: AnsibleModule, client: httpx.Client) -> None:
+    # replaces the pooled client of the firewall; per example to inject a mocked transport
+    key = _client_pool_key(module)
+
+    with _CLIENT_POOL_LOCK:
+        replaced = _CLIENT_POOL.get(key)
+        _CLIENT_POOL[key] = client
+
+    if replaced is not None and replaced is not client:
+        replaced.close()
+
+
+def close_client_pool(module: AnsibleModule = None) -> None:
+    # closes the pooled clients; only the one of the firewall if a module is provided
+    with _CLIENT_POOL_LOCK:
+        if module is None:
+            clients = list(_CLIENT_POOL.values())
+            _CLIENT_POOL.clear()
+
+        else:
+            clients = [_CLIENT_POOL.pop(_client_pool_key(module), None)]
+
+    for client in clients:
+        if client is not None:
+            client.close()
+
+
+atexit_register(close_client_pool)
+
+
+def _start_session(module: AnsibleModule, timeout: float) -> httpx.Timeout:
+    if not httpapi_enabled(module):
+        # the httpapi connection connects & authenticates itself; 'firewall' only identifies the target
+        check_host(module=module)
+        check_or_load_credentials(module=module)
+
+    if 'api_timeout' in module.params and module.params['api_timeout'] is not None:
+        timeout = module.params['api_timeout']
+
+    setdefaulttimeout(timeout)
+    # the timeout is passed per request as the client might be shared with other sessions
+    return httpx.Timeout(timeout=timeout, connect=CONNECT_TIMEOUT)
+
+
+def _response_cache(module: AnsibleModule) -> (ResponseCache, None):
+    cache_path = module.params.get('cache_path', CACHE_PATH)
+
+    if module.params.get('cache_ttl'):
+        # opt-in for read-only modules
+        return ResponseCache(module=module, path=cache_path, ttl=module.params['cache_ttl'])
+
+    if cache_path is not None and Path(cache_path).is_dir():
+        # modules without the cache still need to invalidate the responses they change
+        return ResponseCache(module=module, path=cache_path, ttl=0)
+
+    return None
+
+
+def _trace(
+        module: AnsibleModule, method: str, cnf: dict, start: float,
+        response: httpx.Response = None, error: Exception = None, retries: int = 0,
+) -> None:
+    if not trace_enabled(module):
+        return
+
+    if response is None:
+        trace_api(
+            module=module, method=method, cnf=cnf, status=None, size=0,
+            took=perf_counter() - start, retries=retries, error=type(error).__name__,
+        )
+
+    else:
+        trace_api(
+            module=module, method=method, cnf=cnf, status=response.status_code, size=len(response.content),
+            took=perf_counter() - start, retries=retries,
+        )
+
+
+def _post_args(cnf: dict, headers: (dict, None)) -> (dict, dict):
+    if headers is None:
+        headers = {}
+
+    data = None
+
+    if 'data' in cnf and cnf['data'] is not None and len(cnf['data']) > 0:
+        headers['Content-Type'] = 'application/json'
+        data = cnf['data']
+
+    return data, headers
 
 
 class Session:
-    def __init__(self, module: AnsibleModule, timeout: float = DEFAULT_TIMEOUT):
+    def __init__(
+            self, module: AnsibleModule, timeout: float = DEFAULT_TIMEOUT, pooled: bool = True,
+            snapshots: bool = True,
+    ):
         self.m = module
+        self.pooled = pooled
+        self.timeout = None
         self.s = self._start(timeout)
+        # responses of read-only calls; dependent lookups of the same run are served from it
+        #   they are dropped once something is written to the same API-module (any of its controllers);
+        #   writes through other controllers (p.e. 'service') may change what they return
+        self.snapshots = {} if snapshots else None
+        self._snapshots_lock = Lock()
+        self.cache = _response_cache(module=self.m)
+        self.retry = RetryPolicy.from_module(module=self.m)
 
-    def _start(self, timeout: float) -> httpx.Client:
-        check_host(module=self.m)
-        check_or_load_credentials(module=self.m)
-
-        if 'api_timeout' in self.m.params and self.m.params['api_timeout'] is not None:
-            timeout = self.m.params['api_timeout']
+    def _start(self, timeout: float) -> (httpx.Client, HttpApiClient):
+        self.timeout = _start_session(module=self.m, timeout=timeout)
 
-        setdefaulttimeout(timeout)
+        if httpapi_enabled(self.m):
+            return HttpApiClient(module=self.m)
 
-        fw = self.m.params['firewall']
-        if is_ip6(fw, strip_enclosure=False):
-            fw = f"[{fw}]"
+        if self.pooled:
+            return get_pooled_client(module=self.m)
 
-        return httpx.Client(
-            base_url=f"https://{fw}:{self.m.params['api_port']}/api",
-            auth=(self.m.params['api_key'], self.m.params['api_secret']),
-            timeout=httpx.Timeout(timeout=timeout, connect=2.0),
-            transport=httpx.HTTPTransport(
-                verify=ssl_verification(module=self.m),
-                retries=self.m.params['api_retries'],
-            ),
-        )
+        return _create_client(module=self.m)
 
     def get(self, cnf: dict) -> dict:
         params_path = get_params_path(cnf=cnf)
         call_url = f"{cnf['module']}/{cnf['controller']}/{cnf['command']}{params_path}"
+        snapshot_key = None
+
+        if self.snapshots is not None and cnf['command'].startswith(SNAPSHOT_COMMANDS):
+            snapshot_key = (cnf['module'], cnf['controller'], cnf['command'], params_path)
+
+            if snapshot_key in self.snapshots:
+                profile_count('api_snapshot_hit')
+                # parsed again so the callers can not modify the snapshot
+                return check_response(module=self.m, cnf=cnf, response=self.snapshots[snapshot_key])
 
         debug_api(
             module=self.m,
@@ -55,10 +232,11 @@ class Session:
         )
 
         try:
+            raw_response = self._fetch(cnf=cnf, call_url=call_url)
             response = check_response(
                 module=self.m,
                 cnf=cnf,
-                response=self.s.get(url=call_url)
+                response=raw_response,
             )
 
         except HTTPX_EXCEPTIONS as error:
@@ -68,21 +246,84 @@ class Session:
             )
             raise
 
+        if snapshot_key is not None:
+            with self._snapshots_lock:
+                self.snapshots[snapshot_key] = raw_response
+
         return response
 
-    def post(self, cnf: dict, headers: dict = None) -> dict:
-        if headers is None:
-            headers = {}
+    def _fetch(self, cnf: dict, call_url: str, method: str = 'GET', **kwargs) -> httpx.Response:
+        cacheable = method == 'GET' or cnf['command'].startswith(CACHE_POST_COMMANDS)
+
+        if self.cache is None or self.cache.ttl <= 0 or not cacheable:
+            return self._send(method=method, cnf=cnf, call_url=call_url, **kwargs)
+
+        cache_url = call_url
+        if method == 'POST':
+            # the body of read-only searches holds the filters & page
+            cache_url = f"{call_url}#{json_dumps(kwargs.get('json'), sort_keys=True)}"
+
+        cache_key = dict(module=cnf['module'], controller=cnf['controller'], url=cache_url)
+        cached = self.cache.load(**cache_key)
+
+        if self.cache.fresh(cached):
+            profile_count('api_cache_hit')
+            return self.cache.response(cached)
+
+        if method == 'GET':
+            kwargs['headers'] = self.cache.validators(cached)
+
+        response = self._send(method=method, cnf=cnf, call_url=call_url, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            self.cache.refresh(**cache_key, entry=cached)
+            return self.cache.response(cached)
+
+        self.cache.store(**cache_key, response=response)
+        return response
+
+    def _send(self, method: str, cnf: dict, call_url: str, **kwargs) -> httpx.Response:
+        retry = self.retry.applies(method=method, cnf=cnf)
+        attempt = 0
 
-        data = None
+        while True:
+            start = perf_counter()
+            response, error = None, None
 
-        if 'data' in cnf and cnf['data'] is not None and len(cnf['data']) > 0:
-            headers['Content-Type'] = 'application/json'
-            data = cnf['data']
+            try:
+                response = self.s.request(method=method, url=call_url, timeout=self.timeout, **kwargs)
 
+            except SEND_EXCEPTIONS as err:
+                error = err
+
+            _trace(module=self.m, method=method, cnf=cnf, start=start, response=response, error=error, retries=attempt)
+
+            if not retry or not self.retry.should_retry(attempt=attempt, response=response, error=error):
+                if error is not None:
+                    raise error
+
+                return response
+
+            sleep(self.retry.delay(attempt=attempt, response=response))
+            attempt += 1
+
+    def invalidate(self, module: str, controller: str) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(module=module, controller=controller)
+
+        if self.snapshots is not None:
+            with self._snapshots_lock:
+                for key in [k for k in self.snapshots if k[0] == module]:
+                    self.snapshots.pop(key)
+
+    def post(self, cnf: dict, headers: dict = None) -> dict:
+        data, headers = _post_args(cnf=cnf, headers=headers)
         params_path = get_params_path(cnf=cnf)
         call_url = f"{cnf['module']}/{cnf['controller']}/{cnf['command']}{params_path}"
 
+        if not cnf['command'].startswith(SNAPSHOT_COMMANDS):
+            self.invalidate(module=cnf['module'], controller=cnf['controller'])
+
         debug_api(
             module=self.m,
             method='POST',
@@ -95,8 +336,8 @@ class Session:
             response = check_response(
                 module=self.m,
                 cnf=cnf,
-                response=self.s.post(
-                    url=call_url, json=data, headers=headers
+                response=self._fetch(
+                    method='POST', cnf=cnf, call_url=call_url, json=data, headers=headers,
                 )
             )
 
@@ -110,7 +351,77 @@ class Session:
         return response
 
     def close(self) -> None:
-        self.s.close()
+        # pooled clients are kept open to be re-used; they get closed once the process exits
+        if not self.pooled:
+            self.s.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class BatchedResponse(dict):
+    # placeholder for the response of a queued call; the call is only sent on 'flush'
+
+    def _unavailable(self, *args, **kwargs):
+        del args, kwargs
+        exit_bug(
+            'The response of a batched call is not available - '
+            'only calls whose response is not used may be batched!'
+        )
+
+    __getitem__ = __contains__ = __iter__ = __len__ = get = keys = values = items = _unavailable
+
+
+class BatchSession:
+    # collects the mutating calls, so they can be sent as one burst once all entries were checked
+    #   read-only calls are passed through as their responses are needed for the checks
+    #   only fire-and-forget calls may be batched - reading the response of a queued call fails
+    #   the queued calls are tagged with the current 'owner' (p.e. the entry-key), so their errors can be mapped back
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.m = session.m
+        self.s = session.s
+        self.calls = []
+        self.owner = None
+
+    def get(self, cnf: dict) -> dict:
+        return self.session.get(cnf=cnf)
+
+    def post(self, cnf: dict, headers: dict = None) -> dict:
+        self.calls.append((self.owner, cnf, headers))
+        return BatchedResponse()
+
+    def flush(self, max_parallel: int = 1) -> dict:
+        # sends all queued calls; returns the errors per owner
+        calls, self.calls = self.calls, []
+
+        def _send(call: tuple) -> (str, None):
+            _, cnf, headers = call
+
+            try:
+                self.session.post(cnf=cnf, headers=headers)
+                return None
+
+            except (ModuleFailure, ModuleSoftError) as error:
+                return str(error)
+
+        errors = {}
+        for (owner, _, _), error in zip(
+                calls,
+                parallel_map(func=_send, items=calls, max_parallel=max_parallel, module=self.m),
+        ):
+            if error is not None:
+                errors.setdefault(owner, []).append(error)
+
+        return errors
+
+    def close(self) -> None:
+        # the wrapped session is closed by its owner
+        pass
 
     def __enter__(self):
         return self
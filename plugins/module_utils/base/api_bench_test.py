@@ -0,0 +1,531 @@
+# pylint: disable=C0415,W0621,W0212,R0914
+# offline benchmarks using the mocked api
+#   by default only the smallest dataset without latency is processed
+#   TEST_BENCH_SIZES: comma-separated dataset sizes, per example: '100,1000,10000'
+#   TEST_BENCH_LATENCY: simulated latency per request in milliseconds
+
+from os import environ
+from time import perf_counter
+
+import pytest
+
+BENCH_SIZES = [int(size) for size in environ.get('TEST_BENCH_SIZES', '100').split(',')]
+BENCH_LATENCY = float(environ.get('TEST_BENCH_LATENCY', '0')) / 1000
+BENCH_CHANGED = 10  # percent of entries that get changed by a task
+
+
+class AnsibleError(Exception):
+    pass
+
+
+class MockModule:
+    mutually_exclusive = None
+    required_together = None
+    required_one_of = None
+    required_if = None
+    required_by = None
+
+    def __init__(self, port: int, params: dict):
+        from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import OPN_MOD_ARGS
+
+        self.params = {
+            **{k: v['default'] if 'default' in v else None for k, v in OPN_MOD_ARGS.items()},
+            'firewall': '127.0.0.1',
+            'api_port': port,
+            'api_key': 'key',
+            'api_secret': 'secret',
+            'ssl_verify': False,
+            'output_info': False,
+            **params,
+        }
+        self.check_mode = False
+
+    def fail_json(self, msg: str, **kwargs):
+        del kwargs
+        raise AnsibleError(msg)
+
+    def warn(self, msg: str):
+        pass
+
+
+def _result() -> dict:
+    return {'changed': False, 'diff': {'before': {}, 'after': {}}}
+
+
+def _run(api, port: int, params: dict, func) -> dict:
+    m = MockModule(port=port, params=params)
+    api.install(m)
+    api.reset()
+
+    try:
+        start = perf_counter()
+        func(m)
+        took = perf_counter() - start
+
+    finally:
+        api.uninstall(m)
+
+    return {'requests': api.total, 'writes': api.writes, 'seconds': round(took, 3)}
+
+
+@pytest.fixture(scope='module', params=BENCH_SIZES)
+def bench(request):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api_mock import build_mock_api
+
+    # a fresh dataset per task so the changes of one task do not influence the next
+    return request.param, lambda: build_mock_api(size=request.param, latency=BENCH_LATENCY)
+
+
+def _report(record_property, task: str, size: int, stats: dict) -> None:
+    record_property(task, stats)
+    print(
+        f"\n{task} | entries: {size} | requests: {stats['requests']} | "
+        f"writes: {stats['writes']} | seconds: {stats['seconds']}"
+    )
+
+
+def _changed(size: int) -> int:
+    return size * BENCH_CHANGED // 100
+
+
+@pytest.mark.parametrize('port', [51400])
+def test_bench_alias_multi(bench, record_property, port: int):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.alias_multi import process
+
+    size, build = bench
+    api = build()
+    existing = api.controllers[('firewall', 'alias')].entries.values()
+    aliases = {
+        entry['name']: {'content': entry['content'], 'description': entry['description']}
+        for entry in existing
+    }
+    for i, name in enumerate(list(aliases)[:_changed(size)]):
+        aliases[name]['content'] = [f'192.168.0.{i % 254 + 1}']
+
+    params = {
+        'aliases': aliases, 'state': None, 'enabled': None, 'fail_verification': False,
+        'fail_processing': True, 'reload': True,
+    }
+    r = _result()
+    stats = _run(api=api, port=port, params=params, func=lambda m: process(m=m, p=m.params, r=r))
+    _report(record_property, 'alias_multi', size, stats)
+
+    assert r['changed']
+    assert api.count(command='setItem') == _changed(size)
+    assert stats['requests'] <= _changed(size) + 2
+
+
+@pytest.mark.parametrize('port', [51405])
+def test_bench_alias_multi_fleet(bench, record_property, port: int):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.alias_multi import process
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.fleet import fleet_process
+
+    size, build = bench
+    firewalls = ['127.0.0.2', '127.0.0.3', '127.0.0.4']
+    apis = {fw: build() for fw in firewalls}
+    aliases = {
+        entry['name']: {'content': ['192.168.0.1'], 'description': entry['description']}
+        for entry in list(apis[firewalls[0]].controllers[('firewall', 'alias')].entries.values())[:_changed(size)]
+    }
+    params = {
+        'aliases': aliases, 'state': None, 'enabled': None, 'fail_verification': False,
+        'fail_processing': True, 'reload': True, 'api_request_retries': 0, 'fleet_max_parallel': 10,
+        # the last firewall is not reachable
+        'firewalls': [{'firewall': fw} for fw in firewalls] + [{'firewall': '127.0.0.9', 'api_port': port + 1}],
+    }
+    for fw, api in apis.items():
+        api.install(MockModule(port=port, params={'firewall': fw}))
+
+    m = MockModule(port=port, params=params)
+    r = _result()
+
+    try:
+        start = perf_counter()
+        with pytest.raises(AnsibleError, match='127.0.0.9'):
+            fleet_process(process)(m=m, p=m.params, r=r)
+
+        took = perf_counter() - start
+
+    finally:
+        for fw, api in apis.items():
+            api.uninstall(MockModule(port=port, params={'firewall': fw}))
+
+    stats = {
+        'requests': sum(api.total for api in apis.values()), 'writes': sum(api.writes for api in apis.values()),
+        'seconds': round(took, 3),
+    }
+    _report(record_property, f'alias_multi fleet of {len(firewalls)}', size, stats)
+
+    assert r['changed']
+    assert set(r['firewalls']) == set(firewalls + ['127.0.0.9'])
+    assert 'error' in r['firewalls']['127.0.0.9']
+
+    for fw, api in apis.items():
+        assert r['firewalls'][fw]['changed']
+        assert 'error' not in r['firewalls'][fw]
+        assert len(r['diff']['after'][fw]) > 0
+        assert api.count(command='setItem') == _changed(size)
+
+
+@pytest.mark.parametrize('port', [51403])
+def test_bench_alias_multi_content(bench, record_property, port: int):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.alias_multi import process
+
+    # one big blocklist-like alias of which some entries change
+    size, build = bench
+    api = build()
+    uuid, entry = list(api.controllers[('firewall', 'alias')].entries.items())[0]
+    entry['content'] = [f'10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}' for i in range(size * 10)]
+    content = entry['content'][_changed(size):] + [f'172.16.{i // 256 % 256}.{i % 256}' for i in range(_changed(size))]
+
+    params = {
+        'aliases': {entry['name']: {'content': content, 'description': entry['description']}},
+        'state': None, 'enabled': None, 'fail_verification': False, 'fail_processing': True, 'reload': True,
+    }
+    r = _result()
+    stats = _run(api=api, port=port, params=params, func=lambda m: process(m=m, p=m.params, r=r))
+    _report(record_property, 'alias_multi content', size, stats)
+
+    assert r['changed']
+    assert sorted(api.controllers[('firewall', 'alias')].entries[uuid]['content']) == sorted(content)
+    assert api.count(command='setItem') == 1
+    assert api.count(command='reconfigure') == 1
+
+
+@pytest.mark.parametrize('port, batch', [(51401, False), (51402, True)])
+def test_bench_rule_multi(bench, record_property, port: int, batch: bool):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.rule_multi import process
+
+    size, build = bench
+    api = build()
+    rules = {}
+    for entry in api.controllers[('firewall', 'filter')].entries.values():
+        rules[entry['description']] = {
+            'sequence': int(entry['sequence']), 'protocol': entry['protocol'],
+            'destination_net': entry['destination_net'], 'destination_port': entry['destination_port'],
+        }
+
+    for name in list(rules)[:_changed(size)]:
+        rules[name]['action'] = 'block'
+
+    params = {
+        'rules': rules, 'key_field': 'description', 'match_fields': ['description'], 'override': {},
+        'defaults': {}, 'state': 'present', 'enabled': None, 'fail_verification': True,
+        'fail_processing': True, 'reload': True, 'batch': batch,
+    }
+    r = _result()
+    stats = _run(api=api, port=port, params=params, func=lambda m: process(m=m, p=m.params, r=r))
+    _report(record_property, f"rule_multi{' (batch)' if batch else ''}", size, stats)
+
+    assert r['changed']
+    assert api.count(command='setRule') == _changed(size)
+    assert stats['requests'] <= _changed(size) + 2
+
+
+@pytest.mark.parametrize('port, fail_processing', [(51422, True), (51423, False)])
+def test_rule_multi_batch_failed(bench, port: int, fail_processing: bool):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.rule_multi import process
+
+    _, build = bench
+    api = build()
+    rules = {}
+    for entry in api.controllers[('firewall', 'filter')].entries.values():
+        rules[entry['description']] = {
+            'sequence': int(entry['sequence']), 'protocol': entry['protocol'],
+            'destination_net': entry['destination_net'], 'destination_port': entry['destination_port'],
+        }
+
+    changed = list(rules)[:3]
+    for name in changed:
+        rules[name]['action'] = 'block'
+
+    rule_filter = api.controllers[('firewall', 'filter')]
+    failing = [uuid for uuid, entry in rule_filter.entries.items() if entry['description'] == changed[1]][0]
+    filter_handle = rule_filter.handle
+
+    def _handle(command: str, params: list, data: dict) -> (int, dict):
+        if command == 'setRule' and params[0] == failing:
+            return 200, {'result': 'failed'}
+
+        return filter_handle(command=command, params=params, data=data)
+
+    rule_filter.handle = _handle
+
+    params = {
+        'rules': rules, 'key_field': 'description', 'match_fields': ['description'], 'override': {},
+        'defaults': {}, 'state': 'present', 'enabled': None, 'fail_verification': True,
+        'fail_processing': fail_processing, 'reload': True, 'batch': True,
+    }
+    r = _result()
+
+    if fail_processing:
+        with pytest.raises(AnsibleError, match=f"rules.*{changed[1]}"):
+            _run(api=api, port=port, params=params, func=lambda m: process(m=m, p=m.params, r=r))
+
+    else:
+        _run(api=api, port=port, params=params, func=lambda m: process(m=m, p=m.params, r=r))
+
+    # the other rules are still applied & activated; the failed one is not reported as changed
+    assert r['changed']
+    assert set(r['diff']['after']) == {changed[0], changed[2]}
+    assert api.count(command='setRule') == 3
+    assert api.count(command='apply') == 1
+
+
+@pytest.mark.parametrize('port, count', [(51406, 5), (51407, None)])
+def test_bench_ids_rule_multi(bench, record_property, port: int, count: int):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.ids_rule_multi import process
+
+    size, build = bench
+    api = build()
+    sids = sorted(api.controllers[('ids', 'settings')].rules)[:count]
+    changed = sids[:_changed(len(sids)) or 1]
+    rules = {sid: None for sid in sids}
+    for sid in changed:
+        rules[sid] = {'action': 'drop', 'enabled': False}
+
+    params = {
+        'rules': rules, 'action': None, 'enabled': None, 'fail_verification': True, 'fail_processing': True,
+        'reload': True,
+    }
+    r = _result()
+    stats = _run(api=api, port=port, params=params, func=lambda m: process(m=m, p=m.params, r=r))
+    _report(record_property, f'ids_rule_multi {len(sids)} rules', size, stats)
+
+    assert r['changed']
+    assert set(r['diff']['after']) == set(changed)
+    assert api.count(command='setRule') == len(changed)
+    assert api.count(command='toggleRule') == 1
+    assert api.count(command='reloadRules') == 1
+    assert api.controllers[('ids', 'settings')].rules[changed[0]]['status'] == 'disabled'
+
+    if count is None:
+        # all rules are pulled once
+        assert api.count(command='searchinstalledrules') == 1
+
+    else:
+        # the rules are looked-up server-side
+        assert api.count(command='searchinstalledrules') == len(sids)
+
+
+@pytest.mark.parametrize('port', [51409])
+def test_ids_rule_multi_unsorted_fail(bench, port: int):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.ids_rule_multi import process, \
+        IDS_RULE_FILTER_MAX
+
+    _, build = bench
+    api = build()
+    ids = api.controllers[('ids', 'settings')]
+    sids = sorted(ids.rules)[:IDS_RULE_FILTER_MAX + 1]
+    failing = sids[0]
+    ids_search, ids_handle = ids._search, ids.handle
+
+    def _search(data: dict) -> dict:
+        # the server-side sort is not relied upon
+        response = ids_search(data=data)
+        response['rows'].reverse()
+        return response
+
+    def _handle(command: str, params: list, data: dict) -> (int, dict):
+        if command == 'setRule' and int(params[0]) == failing:
+            return 400, {}
+
+        return ids_handle(command=command, params=params, data=data)
+
+    ids._search, ids.handle = _search, _handle
+
+    params = {
+        'rules': {sid: 'drop' for sid in sids}, 'action': None, 'enabled': None, 'fail_verification': True,
+        'fail_processing': True, 'reload': True, 'api_request_retries': 0,
+    }
+    r = _result()
+
+    # the other rules are still changed; the module is failed once afterwards
+    with pytest.raises(AnsibleError, match=f'Failed to set the action of rules.*{failing}'):
+        _run(api=api, port=port, params=params, func=lambda m: process(m=m, p=m.params, r=r))
+
+    assert set(r['diff']['after']) == set(sids)
+    assert api.count(command='setRule') == len(sids)
+    assert all(ids.rules[sid]['action'] == 'drop' for sid in sids if sid != failing)
+
+
+@pytest.mark.parametrize('port', [51425])
+def test_ids_rule_multi_toggle_fail(bench, port: int):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.ids_rule_multi import process
+
+    _, build = bench
+    api = build()
+    ids = api.controllers[('ids', 'settings')]
+    sids = sorted(ids.rules)[:4]
+    ids_handle = ids.handle
+
+    def _handle(command: str, params: list, data: dict) -> (int, dict):
+        if command == 'toggleRule' and params[1] == '1':
+            return 400, {}
+
+        return ids_handle(command=command, params=params, data=data)
+
+    ids.handle = _handle
+
+    # the per-rule state is converted like the module arguments
+    params = {
+        'rules': {
+            sids[0]: {'enabled': 'false'}, sids[1]: {'enabled': 'no', 'action': 'drop'},
+            sids[2]: {'enabled': 'yes'}, sids[3]: {'enabled': 'invalid'},
+        },
+        'action': None, 'enabled': None, 'fail_verification': False, 'fail_processing': True, 'reload': True,
+        'api_request_retries': 0,
+    }
+    ids.rules[sids[2]]['status'] = 'disabled'
+    r = _result()
+
+    # the other changes are still applied; the module is failed once afterwards
+    with pytest.raises(AnsibleError, match=f'Failed to set the state of rules.*{sids[2]}'):
+        _run(api=api, port=port, params=params, func=lambda m: process(m=m, p=m.params, r=r))
+
+    assert set(r['diff']['after']) == set(sids[:3])
+    assert r['diff']['after'][sids[0]]['enabled'] is False
+    assert ids.rules[sids[0]]['status'] == 'disabled'
+    assert ids.rules[sids[1]]['status'] == 'disabled'
+    assert ids.rules[sids[1]]['action'] == 'drop'
+    assert ids.rules[sids[2]]['status'] == 'disabled'
+
+
+@pytest.mark.parametrize('port, target', [
+    (51410, 'alias'),
+    (51411, 'rule'),
+    (51412, 'bind_record'),
+    (51413, 'wireguard_peer'),
+    (51414, 'ids_general'),
+])
+def test_bench_list(bench, record_property, port: int, target: str):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.alias import Alias
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.rule import Rule
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.bind_record import Record
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.wireguard_peer import Peer
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.ids_general import General
+
+    targets = {'alias': Alias, 'rule': Rule, 'bind_record': Record, 'wireguard_peer': Peer, 'ids_general': General}
+    size, build = bench
+    api = build()
+    data = {}
+
+    def _list(m: MockModule) -> None:
+        # same logic as the 'list' module uses
+        target_inst = targets[target](module=m, result={})
+
+        if hasattr(target_inst, 'get_existing'):
+            data['entries'] = target_inst.get_existing()
+
+        elif hasattr(target_inst, '_search_call'):
+            data['entries'] = target_inst._search_call()
+
+        else:
+            data['entries'] = target_inst.b.get_existing()
+
+    stats = _run(api=api, port=port, params={}, func=_list)
+    _report(record_property, f'list {target}', size, stats)
+
+    if target == 'ids_general':
+        assert data['entries']['profile'] == 'medium'
+
+    else:
+        assert len(data['entries']) == size
+
+    assert stats['writes'] == 0
+
+
+@pytest.mark.parametrize('port', [51415])
+def test_bench_list_multi(bench, record_property, port: int):
+    from ansible_collections.ansibleguy.opnsense.plugins.modules.list import _list_targets
+
+    targets = ['alias', 'rule', 'bind_record', 'wireguard_peer', 'ids_general', 'cron']
+    size, build = bench
+    api = build()
+    data = {}
+
+    def _list(m: MockModule) -> None:
+        data['entries'], data['timing'], data['errors'] = _list_targets(module=m, targets=targets)
+
+    stats = _run(api=api, port=port, params={}, func=_list)
+    _report(record_property, 'list multi', size, stats)
+
+    assert set(data['timing']) == set(targets)
+    assert list(data['errors']) == ['cron']  # endpoint not mocked
+    assert len(data['entries']['alias']) == size
+    assert data['entries']['ids_general']['profile'] == 'medium'
+
+
+@pytest.mark.parametrize('port', [51424])
+def test_list_multi_shared(bench, port: int, monkeypatch):
+    from ansible_collections.ansibleguy.opnsense.plugins.modules import list as list_module
+
+    _, build = bench
+    api = build()
+    sessions, limits = [], []
+    list_target, session_cls = list_module._list_target, list_module.Session
+
+    def _session(*args, **kwargs):
+        sessions.append(session_cls(*args, **kwargs))
+        return sessions[-1]
+
+    def _list_target(module, target: str, session):
+        limits.append(module.params['api_max_parallel'])
+        return list_target(module=module, target=target, session=session)
+
+    monkeypatch.setattr(list_module, 'Session', _session)
+    monkeypatch.setattr(list_module, '_list_target', _list_target)
+
+    targets = ['alias', 'rule', 'bind_record', 'wireguard_peer']
+    _run(api=api, port=port, params={'api_max_parallel': 4}, func=lambda m: list_module._list_targets(m, targets))
+
+    # one session for all targets; the request-limit is shared by the targets & their detail-fetching
+    assert len(sessions) == 1
+    assert limits == [1] * len(targets)
+
+
+@pytest.mark.parametrize('port', [51420])
+def test_bench_alias_purge(bench, record_property, port: int):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.alias_purge import process
+
+    size, build = bench
+    api = build()
+    aliases = {
+        entry['name']: {}
+        for entry in list(api.controllers[('firewall', 'alias')].entries.values())[_changed(size):]
+    }
+    params = {
+        'aliases': aliases, 'fail_all': False, 'reload': True, 'action': 'delete', 'filters': {},
+        'filter_invert': False, 'filter_partial': False, 'force_all': False,
+    }
+    r = _result()
+    stats = _run(api=api, port=port, params=params, func=lambda m: process(m=m, p=m.params, r=r))
+    _report(record_property, 'alias_purge', size, stats)
+
+    assert api.count(command='delItem') == _changed(size)
+    assert len(api.controllers[('firewall', 'alias')].entries) == size - _changed(size)
+    assert api.count(command='reconfigure') == 1
+
+
+@pytest.mark.parametrize('port', [51421])
+def test_bench_rule_purge(bench, record_property, port: int):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.rule_purge import process
+
+    size, build = bench
+    api = build()
+    rules = {
+        entry['description']: {}
+        for entry in list(api.controllers[('firewall', 'filter')].entries.values())[_changed(size):]
+    }
+    params = {
+        'rules': rules, 'key_field': 'description', 'match_fields': ['description'], 'fail_all': False,
+        'action': 'delete', 'filters': {}, 'filter_invert': False, 'filter_partial': False, 'force_all': False,
+        'reload': True,
+    }
+    r = _result()
+    stats = _run(api=api, port=port, params=params, func=lambda m: process(m=m, p=m.params, r=r))
+    _report(record_property, 'rule_purge', size, stats)
+
+    assert api.count(command='delRule') == _changed(size)
+    assert len(api.controllers[('firewall', 'filter')].entries) == size - _changed(size)
+    assert api.count(command='apply') == 1
@@ -0,0 +1,464 @@
+# in-process fake of the OPNsense API - used to test & benchmark the modules without a firewall
+#   test-only helper; excluded from the collection build (see 'build_ignore' in galaxy.yml)
+#   requests are answered by a httpx.MockTransport, so the whole Session/client code-path is used
+
+from collections import Counter
+from hashlib import sha256
+from json import loads as json_loads
+from json import dumps as json_dumps
+from random import Random
+from threading import Lock
+from time import sleep
+
+import httpx
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import \
+    set_pooled_client, close_client_pool
+
+FIELD_TEXT = 'text'
+FIELD_BOOL = 'bool'
+FIELD_SELECT = 'select'
+FIELD_LIST = 'list'
+
+RELOAD_COMMANDS = ['reconfigure', 'apply', 'reload', 'reloadRules', 'restart', 'start', 'stop', 'status']
+WRITE_COMMANDS = ('add', 'set', 'del', 'toggle')
+
+
+# pylint: disable=R0911
+class MockController:
+    # entries of one api-controller; they are stored flat and rendered the way the OPNsense API returns them
+    #   supported commands are matched by their prefix (get, search, add, set, del, toggle) like the real API names them
+
+    def __init__(self, key_path: str, fields: dict, options: dict = None):
+        self.key_path = key_path.split('.')
+        self.fields = fields  # api-field => field-type
+        self.options = {} if options is None else options  # select/list-field => available options
+        self.entries = {}
+        self._lock = Lock()
+        self._uuid_rng = Random(len(self.key_path))
+
+    def _uuid(self) -> str:
+        uuid = f'{self._uuid_rng.getrandbits(128):032x}'
+        return f'{uuid[:8]}-{uuid[8:12]}-{uuid[12:16]}-{uuid[16:20]}-{uuid[20:]}'
+
+    def add(self, entry: dict) -> str:
+        with self._lock:
+            uuid = self._uuid()
+            self.entries[uuid] = self._parse(fields=self.fields, data=entry, current={})
+            return uuid
+
+    def _parse(self, fields: dict, data: dict, current: dict) -> dict:
+        entry = current.copy()
+
+        for field, field_type in fields.items():
+            if field not in data:
+                entry.setdefault(field, {} if isinstance(field_type, dict) else '')
+
+            elif isinstance(field_type, dict):
+                entry[field] = self._parse(fields=field_type, data=data[field], current=entry.get(field, {}))
+
+            elif field_type == FIELD_LIST:
+                value = data[field]
+                if isinstance(value, str):
+                    value = [v for v in value.replace('\n', ',').split(',') if v != '']
+
+                entry[field] = list(value)
+
+            elif field_type == FIELD_BOOL:
+                entry[field] = str(data[field]) in ['1', 'True', 'true']
+
+            else:
+                entry[field] = str(data[field])
+
+        return entry
+
+    def _render(self, fields: dict, entry: dict) -> dict:
+        rendered = {}
+
+        for field, field_type in fields.items():
+            value = entry[field]
+
+            if isinstance(field_type, dict):
+                rendered[field] = self._render(fields=field_type, entry=value)
+
+            elif field_type == FIELD_BOOL:
+                rendered[field] = '1' if value else '0'
+
+            elif field_type in [FIELD_SELECT, FIELD_LIST]:
+                selected = value if field_type == FIELD_LIST else [value]
+                options = list(self.options.get(field, []))
+                options.extend(v for v in selected if v not in options)
+                rendered[field] = {
+                    opt: {'value': opt, 'selected': 1 if opt in selected else 0}
+                    for opt in options
+                }
+
+            else:
+                rendered[field] = value
+
+        return rendered
+
+    def _row(self, uuid: str, entry: dict) -> dict:
+        row = {'uuid': uuid}
+
+        for field, field_type in self.fields.items():
+            value = entry[field]
+
+            if field_type == FIELD_BOOL:
+                row[field] = '1' if value else '0'
+
+            elif field_type == FIELD_LIST:
+                row[field] = ','.join(value)
+
+            elif not isinstance(field_type, dict):
+                row[field] = value
+
+        return row
+
+    def _wrap(self, data: dict) -> dict:
+        for k in reversed(self.key_path):
+            data = {k: data}
+
+        return data
+
+    def _search(self, data: dict) -> dict:
+        rows = [self._row(uuid=uuid, entry=entry) for uuid, entry in self.entries.items()]
+        row_count = int(data.get('rowCount', -1))
+        current = int(data.get('current', 1))
+
+        if row_count > 0:
+            rows = rows[(current - 1) * row_count:current * row_count]
+
+        return {'rows': rows, 'rowCount': len(rows), 'total': len(self.entries), 'current': current}
+
+    def handle(self, command: str, params: list, data: dict) -> (int, dict):
+        uuid = params[0] if len(params) > 0 else None
+
+        if command == 'get':
+            return 200, self._wrap({
+                uuid: self._render(fields=self.fields, entry=entry)
+                for uuid, entry in self.entries.items()
+            })
+
+        if command.startswith('search'):
+            return 200, self._search(data)
+
+        if command.startswith('add'):
+            return 200, {'result': 'saved', 'uuid': self.add(data[self.key_path[-1]])}
+
+        if command.startswith(('reconfigure', 'apply', 'reload')):
+            return 200, {'status': 'ok'}
+
+        if uuid not in self.entries:
+            return 200, {'result': 'failed'} if command.startswith(('set', 'del', 'toggle')) else {}
+
+        if command.startswith('get'):
+            return 200, {self.key_path[-1]: self._render(fields=self.fields, entry=self.entries[uuid])}
+
+        with self._lock:
+            if command.startswith('set'):
+                self.entries[uuid] = self._parse(
+                    fields=self.fields, data=data[self.key_path[-1]], current=self.entries[uuid],
+                )
+                return 200, {'result': 'saved'}
+
+            if command.startswith('del'):
+                self.entries.pop(uuid)
+                return 200, {'result': 'deleted'}
+
+            if command.startswith('toggle'):
+                entry = self.entries[uuid]
+                entry['enabled'] = not entry['enabled'] if len(params) < 2 else params[1] == '1'
+                return 200, {'result': 'Enabled' if entry['enabled'] else 'Disabled', 'changed': True}
+
+        return 404, {}
+
+
+class MockSettings(MockController):
+    # settings-controllers hold a single entry without uuid
+
+    def __init__(self, key_path: str, fields: dict, options: dict = None, values: dict = None):
+        MockController.__init__(self=self, key_path=key_path, fields=fields, options=options)
+        self.values = self._parse(fields=self.fields, data={} if values is None else values, current={})
+
+    def handle(self, command: str, params: list, data: dict) -> (int, dict):
+        if command == 'get':
+            return 200, self._wrap(self._render(fields=self.fields, entry=self.values))
+
+        if command == 'set':
+            settings = data
+            for k in self.key_path:
+                settings = settings.get(k, {})
+
+            with self._lock:
+                self.values = self._parse(fields=self.fields, data=settings, current=self.values)
+
+            return 200, {'result': 'saved'}
+
+        return 200, {'status': 'ok'}
+
+
+class MockIdsRules:
+    # ids/settings: the installed rules are managed by their sid; other commands go to the settings-controller
+
+    def __init__(self, settings: MockSettings):
+        self.settings = settings
+        self.rules = {}  # sid => rule
+        self._lock = Lock()
+
+    def add(self, sid: int, msg: str, action: str = 'alert', enabled: bool = True) -> None:
+        self.rules[sid] = {
+            'sid': str(sid), 'msg': msg, 'action': action, 'status': 'enabled' if enabled else 'disabled',
+        }
+
+    def _search(self, data: dict) -> dict:
+        phrase = str(data.get('searchPhrase', ''))
+        rows = [
+            rule for sid, rule in sorted(self.rules.items())
+            if phrase == '' or phrase in rule['sid'] or phrase in rule['msg']
+        ]
+        row_count = int(data.get('rowCount', len(rows)))
+        start = (int(data.get('current', 1)) - 1) * row_count
+
+        return {
+            'rows': [rule.copy() for rule in rows[start:start + row_count]],
+            'rowCount': row_count, 'current': int(data.get('current', 1)), 'total': len(rows),
+        }
+
+    def handle(self, command: str, params: list, data: dict) -> (int, dict):
+        if command == 'searchinstalledrules':
+            return 200, self._search(data=data)
+
+        if command == 'setRule':
+            with self._lock:
+                rule = self.rules.get(int(params[0]))
+                if rule is None or data.get('action') not in ['alert', 'drop']:
+                    return 200, {'result': 'failed'}
+
+                rule['action'] = data['action']
+
+            return 200, {'result': 'saved'}
+
+        if command == 'toggleRule':
+            status = 'enabled' if len(params) > 1 and params[1] == '1' else 'disabled'
+
+            with self._lock:
+                for sid in params[0].split(','):
+                    if int(sid) in self.rules:
+                        self.rules[int(sid)]['status'] = status
+
+            return 200, {'status': 'ok'}
+
+        return self.settings.handle(command=command, params=params, data=data)
+
+
+class MockApi:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency  # seconds per request
+        self.controllers = {}
+        self.requests = Counter()
+        self._lock = Lock()
+
+    def register(self, module: str, controller: str, target: MockController) -> MockController:
+        self.controllers[(module, controller)] = target
+        return target
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if self.latency > 0:
+            sleep(self.latency)
+
+        path = request.url.path.split('/api/', 1)[1].strip('/').split('/')
+        module, controller, command, params = path[0], path[1], path[2], path[3:]
+        data = json_loads(request.content) if len(request.content) > 0 else {}
+
+        with self._lock:
+            self.requests[f'{request.method} {module}/{controller}/{command}'] += 1
+
+        if (module, controller) in self.controllers:
+            status, response = self.controllers[(module, controller)].handle(
+                command=command, params=params, data=data,
+            )
+
+        elif command in RELOAD_COMMANDS:
+            status, response = 200, {'status': 'ok'}
+
+        else:
+            status, response = 404, {'errorMessage': 'Endpoint not found'}
+
+        if request.method == 'GET' and status == 200:
+            # allow conditional requests
+            etag = f'"{sha256(json_dumps(response, sort_keys=True).encode("utf-8")).hexdigest()[:16]}"'
+            if request.headers.get('If-None-Match') == etag:
+                return httpx.Response(status_code=304, headers={'ETag': etag})
+
+            return httpx.Response(status_code=status, json=response, headers={'ETag': etag})
+
+        return httpx.Response(status_code=status, json=response)
+
+    @property
+    def total(self) -> int:
+        return sum(self.requests.values())
+
+    @property
+    def writes(self) -> int:
+        return sum(cnt for req, cnt in self.requests.items() if req.rsplit('/', 1)[1].startswith(WRITE_COMMANDS))
+
+    def count(self, method: str = None, command: str = None) -> int:
+        return sum(
+            cnt for req, cnt in self.requests.items()
+            if (method is None or req.startswith(f'{method} ')) and (command is None or req.endswith(f'/{command}'))
+        )
+
+    def reset(self) -> None:
+        self.requests.clear()
+
+    def install(self, module: AnsibleModule) -> None:
+        # sessions of this module will pick up the mocked client from the pool
+        set_pooled_client(module=module, client=httpx.Client(
+            base_url=f"https://{module.params['firewall']}:{module.params['api_port']}/api",
+            transport=httpx.MockTransport(self.handle),
+        ))
+
+    @staticmethod
+    def uninstall(module: AnsibleModule) -> None:
+        close_client_pool(module=module)
+
+
+def _seed_aliases(api: MockApi, rng: Random, count: int) -> None:
+    aliases = api.register('firewall', 'alias', MockController(
+        key_path='alias.aliases.alias',
+        fields={
+            'enabled': FIELD_BOOL, 'name': FIELD_TEXT, 'type': FIELD_SELECT, 'content': FIELD_LIST,
+            'description': FIELD_TEXT, 'updatefreq': FIELD_TEXT, 'interface': FIELD_SELECT,
+        },
+        options={
+            'type': ['host', 'network', 'port', 'url', 'urltable', 'geoip', 'networkgroup', 'mac', 'dynipv6host'],
+            'interface': ['', 'lan', 'wan'],
+        },
+    ))
+
+    for i in range(count):
+        aliases.add({
+            'enabled': True, 'name': f'alias_{i}', 'type': 'host', 'description': f'Alias {i}',
+            'content': [f'10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}'],
+        })
+
+
+def _seed_rules(api: MockApi, rng: Random, count: int) -> None:
+    rules = api.register('firewall', 'filter', MockController(
+        key_path='filter.rules.rule',
+        fields={
+            'enabled': FIELD_BOOL, 'sequence': FIELD_TEXT, 'action': FIELD_SELECT, 'quick': FIELD_BOOL,
+            'interface': FIELD_LIST, 'direction': FIELD_SELECT, 'ipprotocol': FIELD_SELECT,
+            'protocol': FIELD_SELECT, 'source_not': FIELD_BOOL, 'source_net': FIELD_TEXT,
+            'source_port': FIELD_TEXT, 'destination_not': FIELD_BOOL, 'destination_net': FIELD_TEXT,
+            'destination_port': FIELD_TEXT, 'log': FIELD_BOOL, 'description': FIELD_TEXT, 'gateway': FIELD_SELECT,
+        },
+        options={
+            'action': ['pass', 'block', 'reject'],
+            'interface': ['lan', 'wan', 'opt1'],
+            'direction': ['in', 'out'],
+            'ipprotocol': ['inet', 'inet6', 'inet46'],
+            'protocol': ['any', 'TCP', 'UDP', 'ICMP'],
+            'gateway': ['', 'WAN_GW'],
+        },
+    ))
+
+    for i in range(count):
+        rules.add({
+            'enabled': True, 'sequence': str(i + 1), 'action': 'pass', 'quick': True, 'interface': ['lan'],
+            'direction': 'in', 'ipprotocol': 'inet', 'protocol': 'TCP', 'source_not': False,
+            'source_net': 'any', 'source_port': '', 'destination_not': False,
+            'destination_net': f'10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}',
+            'destination_port': str(rng.randint(1, 65535)), 'log': True, 'description': f'rule_{i}', 'gateway': '',
+        })
+
+
+def _seed_bind(api: MockApi, count: int) -> None:
+    domains = api.register('bind', 'domain', MockController(
+        key_path='domain.domains.domain',
+        fields={'enabled': FIELD_BOOL, 'domainname': FIELD_TEXT, 'type': FIELD_SELECT},
+        options={'type': ['primary', 'secondary']},
+    ))
+    domain = domains.add({'enabled': True, 'domainname': 'opnsense.test', 'type': 'primary'})
+
+    records = api.register('bind', 'record', MockController(
+        key_path='record.records.record',
+        fields={
+            'enabled': FIELD_BOOL, 'domain': FIELD_SELECT, 'name': FIELD_TEXT, 'type': FIELD_SELECT,
+            'value': FIELD_TEXT,
+        },
+        options={'type': ['A', 'AAAA', 'CNAME', 'MX', 'TXT']},
+    ))
+    records.options['domain'] = [domain]
+
+    for i in range(count):
+        records.add({
+            'enabled': True, 'domain': domain, 'name': f'host{i}', 'type': 'A',
+            'value': f'10.0.{i // 254 % 256}.{i % 254 + 1}',
+        })
+
+
+def _seed_wireguard(api: MockApi, rng: Random, count: int) -> None:
+    clients = api.register('wireguard', 'client', MockController(
+        key_path='client',
+        fields={
+            'enabled': FIELD_BOOL, 'name': FIELD_TEXT, 'pubkey': FIELD_TEXT, 'psk': FIELD_TEXT,
+            'tunneladdress': FIELD_LIST, 'serveraddress': FIELD_TEXT, 'serverport': FIELD_TEXT,
+            'keepalive': FIELD_TEXT,
+        },
+    ))
+
+    for i in range(count):
+        clients.add({
+            'enabled': True, 'name': f'peer_{i}', 'pubkey': f'{rng.getrandbits(256):064x}', 'psk': '',
+            'tunneladdress': [f'10.200.{i // 254 % 256}.{i % 254 + 1}/32'], 'serveraddress': '',
+            'serverport': '', 'keepalive': '',
+        })
+
+
+def _seed_ids(api: MockApi, count: int) -> None:
+    settings = MockSettings(
+        key_path='ids.general',
+        fields={
+            'enabled': FIELD_BOOL, 'ips': FIELD_BOOL, 'promisc': FIELD_BOOL, 'interfaces': FIELD_LIST,
+            'homenet': FIELD_LIST, 'defaultPacketSize': FIELD_TEXT, 'syslog': FIELD_BOOL, 'syslog_eve': FIELD_BOOL,
+            'MPMAlgo': FIELD_SELECT, 'verbosity': FIELD_SELECT, 'AlertLogrotate': FIELD_SELECT,
+            'AlertSaveLogs': FIELD_TEXT, 'LogPayload': FIELD_BOOL, 'UpdateCron': FIELD_SELECT,
+            'detect': {'Profile': FIELD_SELECT, 'toclient_groups': FIELD_TEXT, 'toserver_groups': FIELD_TEXT},
+        },
+        options={
+            'interfaces': ['lan', 'wan'],
+            'MPMAlgo': ['', 'ac', 'hs'],
+            'verbosity': ['', 'v', 'vv', 'vvv', 'vvvv'],
+            'AlertLogrotate': ['W0D23', 'D0'],
+            'UpdateCron': [''],
+            'Profile': ['', 'low', 'medium', 'high', 'custom'],
+        },
+        values={
+            'enabled': False, 'ips': False, 'promisc': False, 'interfaces': ['wan'], 'homenet': ['10.0.0.0/8'],
+            'defaultPacketSize': '', 'syslog': False, 'syslog_eve': False, 'MPMAlgo': '', 'verbosity': '',
+            'AlertLogrotate': 'W0D23', 'AlertSaveLogs': '4', 'LogPayload': False, 'UpdateCron': '',
+            'detect': {'Profile': 'medium', 'toclient_groups': '', 'toserver_groups': ''},
+        },
+    )
+    rules = api.register('ids', 'settings', MockIdsRules(settings=settings))
+
+    for i in range(count):
+        rules.add(sid=2000000 + i, msg=f'ET POLICY Rule {i}')
+
+
+def build_mock_api(size: int = 100, latency: float = 0.0, seed: int = 0) -> MockApi:
+    # seeds every endpoint with the given number of entries
+    rng = Random(seed)
+    api = MockApi(latency=latency)
+
+    _seed_aliases(api=api, rng=rng, count=size)
+    _seed_rules(api=api, rng=rng, count=size)
+    _seed_bind(api=api, count=size)
+    _seed_wireguard(api=api, rng=rng, count=size)
+    _seed_ids(api=api, count=size)
+
+    return api
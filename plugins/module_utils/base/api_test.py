@@ -1,4 +1,5 @@
 # pylint: disable=C0415
+import pytest
 
 
 class AnsibleError(Exception):
@@ -24,6 +25,9 @@ class DummyModule:
     def fail_json(self, msg: str):
         raise AnsibleError(msg)
 
+    def warn(self, msg: str):
+        pass
+
 
 DUMMY_MODULE = DummyModule()
 DUMMY_REQ = dict(
@@ -45,6 +49,24 @@ def test_session_contextmanager():
         pass
 
 
+def test_session_pool():
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import Session
+    with Session(module=DUMMY_MODULE) as s1, Session(module=DUMMY_MODULE) as s2:
+        assert s1.s is s2.s
+
+    assert not s1.s.is_closed
+
+    other_module = DummyModule()
+    other_module.params['api_port'] = 51338
+    with Session(module=other_module) as s3:
+        assert s3.s is not s1.s
+
+    with Session(module=DUMMY_MODULE, pooled=False) as s4:
+        assert s4.s is not s1.s
+
+    assert s4.s.is_closed
+
+
 # todo: to test this we need to create a http-server that's able to abort connections before they are established
 # @pytest.mark.parametrize('retries', [
 #     0,
@@ -77,3 +99,318 @@ def test_session_contextmanager():
 #         Session(module=DUMMY_MODULE).s.get(
 #             url=f"http://{DUMMY_MODULE.params['firewall']}:{DUMMY_MODULE.params['api_port']}",
 #         )
+
+
+def test_batch_session():
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import BatchSession
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler import AnsibleModuleError
+
+    class DummySession:
+        m = None
+        s = None
+
+        def __init__(self):
+            self.sent = []
+
+        def get(self, cnf: dict) -> dict:
+            return {'command': cnf['command']}
+
+        def post(self, cnf: dict, headers: dict = None) -> dict:
+            from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler import ModuleSoftError
+
+            del headers
+            self.sent.append(cnf['command'])
+            if cnf['command'] == 'set_3':
+                raise ModuleSoftError('in use')
+
+            return {'result': 'saved'}
+
+    session = DummySession()
+    batch = BatchSession(session=session)
+
+    assert batch.get({'command': 'get'}) == {'command': 'get'}
+    for i in range(5):
+        # the errors of the queued calls are mapped back to their owner
+        batch.owner = f"entry_{i // 2}"
+        response = batch.post({'command': f"set_{i}"})
+
+    # the response of a queued call is not known yet
+    with pytest.raises(AnsibleModuleError, match='batched'):
+        _ = response['uuid']
+
+    with pytest.raises(AnsibleModuleError, match='batched'):
+        _ = 'in_use' in response
+
+    assert len(session.sent) == 0
+    assert batch.flush(max_parallel=3) == {'entry_1': ['in use']}
+    assert sorted(session.sent) == [f"set_{i}" for i in range(5)]
+    assert len(batch.calls) == 0
+
+
+def test_session_snapshots():
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import Session
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api_mock import build_mock_api
+
+    module = DummyModule()
+    module.params['api_port'] = 51339
+    api = build_mock_api(size=3)
+    api.install(module)
+    get_aliases = {'module': 'firewall', 'controller': 'alias', 'command': 'get'}
+    get_rules = {'module': 'firewall', 'controller': 'filter', 'command': 'get'}
+
+    try:
+        with Session(module=module) as s:
+            aliases = s.get(get_aliases)['alias']['aliases']['alias']
+            aliases.clear()  # callers may not modify the snapshot
+            assert len(s.get(get_aliases)['alias']['aliases']['alias']) == 3
+            s.get(get_rules)
+            assert api.count(command='get') == 2
+
+            uuid = list(api.controllers[('firewall', 'alias')].entries)[0]
+            s.post({**get_aliases, 'command': 'delItem', 'params': [uuid]})
+            assert len(s.get(get_aliases)['alias']['aliases']['alias']) == 2
+            assert api.count(command='get') == 3
+
+            # writes through any controller of the API-module drop its snapshots
+            uuid = list(api.controllers[('firewall', 'filter')].entries)[0]
+            s.post({**get_rules, 'command': 'delRule', 'params': [uuid]})
+            s.get(get_aliases)
+            s.get(get_rules)
+            assert api.count(command='get') == 5
+
+        with Session(module=module, snapshots=False) as s:
+            s.get(get_rules)
+            s.get(get_rules)
+            assert api.count(command='get') == 7
+
+    finally:
+        api.uninstall(module)
+
+
+def test_session_cache(tmp_path):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import Session
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api_mock import build_mock_api
+
+    module = DummyModule()
+    module.params['api_port'] = 51340
+    module.params['cache_ttl'] = 60
+    module.params['cache_path'] = str(tmp_path)
+    api = build_mock_api(size=3)
+    api.install(module)
+    get_aliases = {'module': 'firewall', 'controller': 'alias', 'command': 'get'}
+
+    try:
+        for _ in range(2):
+            # separate sessions - like multiple module-runs
+            with Session(module=module) as s:
+                assert len(s.get(get_aliases)['alias']['aliases']['alias']) == 3
+
+        assert api.count(command='get') == 1
+
+        # expired entries are revalidated
+        with Session(module=module) as s:
+            s.cache.ttl = 0
+            assert len(s.get(get_aliases)['alias']['aliases']['alias']) == 3
+
+        assert api.count(command='get') == 2
+        assert len(list(tmp_path.glob('*.json'))) == 1
+
+        # writes invalidate the cached responses of the controller - also if the writing module does not use the cache
+        module.params['cache_ttl'] = 0
+        with Session(module=module) as s:
+            uuid = list(api.controllers[('firewall', 'alias')].entries)[0]
+            s.post({**get_aliases, 'command': 'delItem', 'params': [uuid]})
+
+        assert len(list(tmp_path.glob('*.json'))) == 0
+
+        module.params['cache_ttl'] = 60
+        with Session(module=module) as s:
+            assert len(s.get(get_aliases)['alias']['aliases']['alias']) == 2
+
+    finally:
+        api.uninstall(module)
+
+
+def test_session_cache_search(tmp_path):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import Session
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api_mock import build_mock_api
+    from ansible_collections.ansibleguy.opnsense.plugins.modules.list import _list_targets
+
+    module = DummyModule()
+    module.params['api_port'] = 51344
+    module.params['api_max_parallel'] = 5
+    module.params['cache_ttl'] = 60
+    module.params['cache_path'] = str(tmp_path)
+    api = build_mock_api(size=3)
+    api.install(module)
+
+    try:
+        # the peers are listed using the 'searchClient' (POST) & 'getClient' calls
+        for _ in range(2):
+            data, _, errors = _list_targets(module=module, targets=['wireguard_peer'])
+            assert not errors
+            assert len(data['wireguard_peer']) == 3
+
+        assert api.count(method='POST', command='searchClient') == 1
+        assert api.count(method='GET', command='getClient') == 3
+
+        # other filters/pages are cached separately
+        with Session(module=module) as s:
+            s.post({'module': 'wireguard', 'controller': 'client', 'command': 'searchClient', 'data': {'current': 2}})
+
+        assert api.count(method='POST', command='searchClient') == 2
+
+    finally:
+        api.uninstall(module)
+
+
+def test_session_trace(tmp_path, monkeypatch):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import Session
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api_mock import build_mock_api
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import DEBUG_CONFIG
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.trace import load_trace, trace_file
+
+    monkeypatch.setitem(DEBUG_CONFIG, 'path_log', str(tmp_path))
+    module = DummyModule()
+    module.params['api_port'] = 51341
+    module.params['api_trace'] = True
+    api = build_mock_api(size=3)
+    api.install(module)
+
+    try:
+        with Session(module=module) as s:
+            s.get({'module': 'firewall', 'controller': 'alias', 'command': 'get'})
+            s.post({'module': 'firewall', 'controller': 'alias', 'command': 'reconfigure'})
+
+    finally:
+        api.uninstall(module)
+
+    entries = load_trace(trace_file())
+    assert [(e['method'], e['endpoint'], e['status']) for e in entries] == [
+        ('GET', 'firewall/alias/get', 200),
+        ('POST', 'firewall/alias/reconfigure', 200),
+    ]
+    assert entries[0]['bytes'] > 0
+    assert entries[0]['ms'] >= 0
+
+
+@pytest.mark.parametrize('status, body, expected', [
+    (200, b'{"a": 1}', {'a': 1}),
+    (200, b'', {}),
+    (200, b'<html>no json</html>', {}),
+    (200, b'[{"a": 1}]', [{'a': 1}]),
+    (200, b'{"result": "failed", "message": "Item in use by: test"}', {
+        'result': 'failed', 'message': 'Item in use by: test', 'in_use': True,
+    }),
+])
+def test_check_response(status: int, body: bytes, expected):
+    import httpx
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.api import check_response
+
+    cnf = dict(DUMMY_REQ)
+    assert check_response(module=DUMMY_MODULE, cnf=cnf, response=httpx.Response(status, content=body)) == expected
+    assert cnf == DUMMY_REQ
+
+
+@pytest.mark.parametrize('status, body, error', [
+    (404, b'{"errorMessage": "Controller not found"}', 'Needed plugin not installed'),
+    (200, b'{"result": "failed", "validations": {"alias.name": "invalid"}}', "{'alias.name': 'invalid'}"),
+    (500, b'{}', 'API call failed | Response'),
+])
+def test_check_response_error(status: int, body: bytes, error: str):
+    import httpx
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.api import check_response
+
+    with pytest.raises(AnsibleError, match=error):
+        check_response(module=DUMMY_MODULE, cnf=dict(DUMMY_REQ), response=httpx.Response(status, content=body))
+
+
+@pytest.mark.parametrize('command, mutating, failures, expected_calls', [
+    ('search', False, 2, 3),
+    ('search', False, 5, 3),
+    ('set', False, 1, 1),
+    ('set', True, 1, 2),
+])
+def test_session_retry(command: str, mutating: bool, failures: int, expected_calls: int):
+    import httpx
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import \
+        Session, set_pooled_client, close_client_pool
+
+    module = DummyModule()
+    module.params['api_port'] = 51342
+    module.params['api_request_retries'] = 2
+    module.params['api_retry_backoff'] = 0.0
+    module.params['api_retry_mutating'] = mutating
+    calls = []
+
+    def _handle(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if len(calls) <= failures:
+            return httpx.Response(503, json={})
+
+        return httpx.Response(200, json={'result': 'ok'})
+
+    set_pooled_client(module=module, client=httpx.Client(
+        base_url='https://127.0.0.1:51342/api', transport=httpx.MockTransport(_handle),
+    ))
+
+    try:
+        with Session(module=module) as s:
+            if expected_calls > failures:
+                assert s.post({'module': 'dummy', 'controller': 'dummy', 'command': command}) == {'result': 'ok'}
+
+            else:
+                with pytest.raises(AnsibleError):
+                    s.post({'module': 'dummy', 'controller': 'dummy', 'command': command})
+
+    finally:
+        close_client_pool(module=module)
+
+    assert len(calls) == expected_calls
+
+
+class DummyConnection:
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.requests = []
+
+    def send_request(self, data: str, path: str, method: str, headers: dict) -> tuple:
+        del headers
+        self.requests.append((method, path, data))
+        if path.endswith('/fail'):
+            return 400, '{"status": "failed", "message": "invalid"}', {'content-type': 'application/json'}
+
+        return 200, '{"result": "saved", "rows": []}', {'content-type': 'application/json'}
+
+
+def test_session_httpapi(monkeypatch):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import Session
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper import httpapi
+
+    module = DummyModule()
+    # set by ansible for tasks using 'connection: httpapi'; the credentials are handled by the connection
+    module._socket_path = '/tmp/dummy.socket'  # pylint: disable=W0212,W0201
+    module.params['api_key'], module.params['api_secret'] = None, None
+    # only identifies the firewall; the connection settings are used to reach it
+    module.params['firewall'] = 'opnsense_1'
+    connections = []
+
+    def _connection(socket_path: str) -> DummyConnection:
+        connections.append(DummyConnection(socket_path))
+        return connections[-1]
+
+    monkeypatch.setattr(httpapi, 'Connection', _connection)
+
+    with Session(module=module) as s:
+        assert s.get(cnf={**DUMMY_REQ, 'command': 'search'})['rows'] == []
+        assert s.post(cnf={**DUMMY_REQ, 'data': {'a': 1}})['result'] == 'saved'
+
+        with pytest.raises(AnsibleError):
+            s.post(cnf={**DUMMY_REQ, 'command': 'fail'})
+
+    assert len(connections) == 1
+    assert connections[0].socket_path == '/tmp/dummy.socket'
+    assert connections[0].requests[:2] == [
+        ('GET', '/api/dummy/dummy/search', None),
+        ('POST', '/api/dummy/dummy/test', '{"a": 1}'),
+    ]
@@ -1,17 +1,23 @@
 # could be implemented using inheritance in the future..
 
 # NOTE: pylint is basically right, but I really do not want to take the time to refactor this..
-# pylint: disable=W0212,R0912,R0915
+# pylint: disable=W0212,R0912,R0915,R0904
 
-from typing import Callable
+from typing import Callable, Iterator
 
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import \
     single_get, single_post
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import \
-    get_simple_existing, to_digit, get_matching, simplify_translate, is_unset, \
-    sort_param_lists
+    get_simple_existing, get_matching, is_unset, \
+    sort_param_lists, chunk_iter
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler import \
     exit_bug, ModuleSoftError
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.plan import FieldPlan
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import \
+    profile_count, parallel_map
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.reload import \
+    reload_deferred, defer_reload
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.index import link_index
 
 
 class Base:
@@ -42,7 +48,10 @@ class Base:
     ATTR_FIELD_ID = 'FIELD_ID'  # field we use for matching
     ATTR_FIELD_PK = 'FIELD_PK'  # field opnsense uses as primary key
     PARAM_MATCH_FIELDS = 'match_fields'
-    QUERY_MAX_ENTRIES = 1000
+    PARAM_MAX_PARALLEL = 'api_max_parallel'
+    ATTR_PAGE_SIZE = 'QUERY_PAGE_SIZE'
+    ATTR_FIELD_PLAN = '_FIELD_PLAN'
+    QUERY_PAGE_SIZE = 500
     VALUE_NO_LOG = 'VALUE_SPECIFIED_IN_NO_LOG_PARAMETER'
 
     REQUIRED_ATTRS = [
@@ -58,12 +67,14 @@ class Base:
         self.i = instance  # module-specific object
         self.e = {}  # existing entry
         self.raw = None  # save first raw existing entry - to resolve user input per selection
+        self.simple_cache = {}  # simplified existing entries
+        self._plan = None  # compiled field-mapping
 
         for attr in self.REQUIRED_ATTRS:
             if not hasattr(self.i, attr):
                 exit_bug(f"Module has no '{attr}' attribute set!")
 
-    def search(self, match_fields: list = None) -> (dict, list):
+    def _set_search_target(self) -> None:
         # workaround if 'get' needs to be performed using other api module/controller
         cont_get, mod_get = self.i.API_CONT, self.i.API_MOD
 
@@ -76,55 +87,16 @@ class Base:
         self.i.call_cnf['controller'] = cont_get
         self.i.call_cnf['module'] = mod_get
 
-        if self.i.CMDS['search'].startswith('search'):
-            # case for api-refactoring: https://github.com/ansibleguy/collection_opnsense/issues/51
-            if 'detail' not in self.i.CMDS:
-                exit_bug("To use the 'search' commands you need to also define the related 'detail' (get) command!")
-
-            data = []
-            # if we can - we only perform the 'detail' call for the already matched entry to save on needed requests
-            base_match_fields = False
-            base_match_fields_checked = False
-            force_details = False if not hasattr(self.i, self.ATTR_GET_DETAIL_ALL) else \
-                getattr(self.i, self.ATTR_GET_DETAIL_ALL)
-
-            for base_entry in self._api_post({
-                **self.i.call_cnf,
-                'command': self.i.CMDS['search'],
-                'data': {'current': 1, 'rowCount': self.QUERY_MAX_ENTRIES},
-            })['rows']:
-                if not force_details and match_fields is not None and not base_match_fields_checked:
-                    base_match_fields_checked = True
-                    base_match_fields = all(field in base_entry for field in match_fields)
-
-                # todo: perform async calls for parallel data fetching
-                detail_entry = {}
-                if force_details or not base_match_fields or \
-                        all(base_entry[field] == self.i.p[field] for field in match_fields):
-                    detail_entry = self._search_path_handling(
-                        self._api_get({
-                            **self.i.call_cnf,
-                            'command': self.i.CMDS['detail'],
-                            'params': [base_entry[self.field_pk]]
-                        })
-                    )
-
-                data.append({
-                    **detail_entry,
-                    **base_entry,
-                })
-                if self.raw is None:
-                    self.raw = data[0]
+    @property
+    def search_paged(self) -> bool:
+        # case for api-refactoring: https://github.com/ansibleguy/collection_opnsense/issues/51
+        return self.i.CMDS['search'].startswith('search')
 
-            if self.raw is None:
-                self.raw = self._search_path_handling(
-                    self._api_get({
-                        **self.i.call_cnf,
-                        'command': self.i.CMDS['detail'],
-                    })
-                )
+    def search(self, match_fields: list = None) -> (dict, list):
+        if self.search_paged:
+            return list(self.search_iter(match_fields=match_fields))
 
-            return data
+        self._set_search_target()
 
         # legacy api handling (fewer requests needed; much simpler client-side handling)
         data = self._api_get({
@@ -142,6 +114,104 @@ class Base:
 
         return self._search_path_handling(data)
 
+    def search_iter(self, match_fields: list = None, chunk_size: int = None) -> Iterator[dict]:
+        # yields the merged search- & detail-entries; pages & details are only pulled once they are consumed
+        if 'detail' not in self.i.CMDS:
+            exit_bug("To use the 'search' commands you need to also define the related 'detail' (get) command!")
+
+        self._set_search_target()
+
+        # if we can - we only perform the 'detail' call for the already matched entry to save on needed requests
+        base_match_fields = None
+        force_details = False if not hasattr(self.i, self.ATTR_GET_DETAIL_ALL) else \
+            getattr(self.i, self.ATTR_GET_DETAIL_ALL)
+
+        rows = self.search_rows({
+            **self.i.call_cnf,
+            'command': self.i.CMDS['search'],
+        })
+
+        for base_entries in chunk_iter(rows, size=chunk_size):
+            if not force_details and match_fields is not None and base_match_fields is None:
+                base_match_fields = all(field in base_entries[0] for field in match_fields)
+
+            detail_idx = [
+                idx for idx, base_entry in enumerate(base_entries)
+                if force_details or not base_match_fields or
+                all(base_entry[field] == self.i.p[field] for field in match_fields)
+            ]
+            details = dict(zip(
+                detail_idx,
+                self._search_details([base_entries[idx][self.field_pk] for idx in detail_idx]),
+            ))
+
+            for idx, base_entry in enumerate(base_entries):
+                entry = {
+                    **details.get(idx, {}),
+                    **base_entry,
+                }
+
+                if self.raw is None and idx in details:
+                    self.raw = entry
+
+                yield entry
+
+        if self.raw is None:
+            self.raw = self._search_path_handling(
+                self._api_get({
+                    **self.i.call_cnf,
+                    'command': self.i.CMDS['detail'],
+                })
+            )
+
+    def search_rows(self, cnf: dict, page_size: int = None) -> Iterator[dict]:
+        # walk over the pages of a 'search*' endpoint until all of its rows were received
+        if page_size is None:
+            page_size = self.page_size
+
+        data = {}
+        if 'data' in cnf and cnf['data'] is not None:
+            data = cnf['data']
+
+        current = 1
+        received = 0
+
+        while True:
+            response = self._api_post({
+                **cnf,
+                'data': {**data, 'current': current, 'rowCount': page_size},
+            })
+            rows = response['rows']
+            received += len(rows)
+
+            yield from rows
+
+            if len(rows) == 0:
+                break
+
+            if 'total' in response:
+                # some endpoints ignore the 'rowCount' and return all rows at once
+                if received >= int(response['total']):
+                    break
+
+            elif len(rows) < page_size:
+                break
+
+            current += 1
+
+    def _search_details(self, pks: list) -> list:
+        # pull the 'detail' data of multiple entries; the result keeps the order of the provided primary-keys
+        def _get_detail(pk: str) -> dict:
+            return self._search_path_handling(
+                self._api_get({
+                    **self.i.call_cnf,
+                    'command': self.i.CMDS['detail'],
+                    'params': [pk]
+                })
+            )
+
+        return parallel_map(func=_get_detail, items=pks, max_parallel=self.max_parallel, module=self.i.m)
+
     def _search_path_handling(self, data: dict, ak_path: str = None) -> dict:
         # resolving API_KEY_PATH's so data from nested dicts gets extracted as configured
         if ak_path is None:
@@ -176,14 +246,29 @@ class Base:
         )
 
     def find(self, match_fields: list) -> None:
-        if self.i.existing_entries is None:
-            self.i.existing_entries = self._call_search(match_fields)
+        if hasattr(self.i, 'existing_index') and self.i.existing_index is not None:
+            # index shared by the multi-modules
+            match = self.i.existing_index.get(
+                module=self.i.m, compare_item=self.i.p, match_fields=match_fields,
+            )
 
-        match = get_matching(
-            module=self.i.m, existing_items=self.i.existing_entries,
-            compare_item=self.i.p, match_fields=match_fields,
-            simplify_func=self._call_simple(),
-        )
+        else:
+            existing = self.i.existing_entries
+
+            if existing is None:
+                if hasattr(self.i, '_search_lazy') and self.i._search_lazy():
+                    # stop pulling entries once the match was found
+                    existing = self.search_iter(match_fields=match_fields, chunk_size=self.max_parallel)
+
+                else:
+                    self.i.existing_entries = self._call_search(match_fields)
+                    existing = self.i.existing_entries
+
+            match = get_matching(
+                module=self.i.m, existing_items=existing,
+                compare_item=self.i.p, match_fields=match_fields,
+                simplify_func=self._call_simple(),
+            )
 
         if match is not None:
             setattr(self.i, self.i.EXIST_ATTR, match)
@@ -292,14 +377,10 @@ class Base:
 
         if 'enabled' in existing:
             if existing['enabled'] != self.i.p['enabled']:
-                _bool_invert_fields = []
                 enable = self.i.p['enabled']
                 invert = False
 
-                if hasattr(self.i, self.ATTR_BOOL_INVERT):
-                    _bool_invert_fields = getattr(self.i, self.ATTR_BOOL_INVERT)
-
-                if 'enabled' in _bool_invert_fields:
+                if 'enabled' in self.plan.bool_invert:
                     invert = True
                     enable = not enable
 
@@ -343,13 +424,23 @@ class Base:
         if hasattr(self.i, self.ATTR_REL_CONT):
             cont_rel = getattr(self.i, self.ATTR_REL_CONT)
 
+        cnf = {
+            'module': self.i.API_MOD,
+            'controller': cont_rel,
+            'command': self.i.API_CMD_REL,
+            'params': []
+        }
+
+        if reload_deferred(self.i.m):
+            # executed once per service by the 'reload' module (target 'pending')
+            self.i.r['reload_pending'] = True
+            if not self.i.m.check_mode:
+                defer_reload(module=self.i.m, cnf=cnf)
+
+            return None
+
         if not self.i.m.check_mode:
-            return self._api_post({
-                'module': self.i.API_MOD,
-                'controller': cont_rel,
-                'command': self.i.API_CMD_REL,
-                'params': []
-            })
+            return self._api_post(cnf)
 
     def _get_request_data(self) -> dict:
         if hasattr(self.i, '_build_request'):
@@ -404,26 +495,14 @@ class Base:
         if not isinstance(data, dict):
             exit_bug('The diff-source object must be of type dict!')
 
-        _exclude_fields = []
-        _no_log_fields = []
-
-        if hasattr(self.i, self.ATTR_DIFF_EXCL):
-            _exclude_fields = getattr(self.i, self.ATTR_DIFF_EXCL)
-
-        if hasattr(self.i, self.ATTR_DIFF_NO_LOG):
-            _no_log_fields = getattr(self.i, self.ATTR_DIFF_NO_LOG)
-
         self._set_existing()
 
         diff = {
             self.field_pk: self.e[self.field_pk] if self.field_pk in self.e else None
         }
 
-        for field in self.i.FIELDS_ALL:
-            if field in _exclude_fields:
-                continue
-
-            if field in _no_log_fields:
+        for field, no_log in self.plan.diff_fields:
+            if no_log:
                 diff[field] = self.VALUE_NO_LOG
                 continue
 
@@ -476,117 +555,55 @@ class Base:
         return diff
 
     def build_request(self, ignore_fields: list = None) -> dict:
-        request = {}
-        _translate_fields = {}
-        _translate_values = {}
-        _bool_invert_fields = []
-
-        if ignore_fields is None:
-            ignore_fields = []
-
         if is_unset(self.e):
             self.e = getattr(self.i, self.i.EXIST_ATTR)
 
-        if hasattr(self.i, self.ATTR_TRANSLATE):
-            _translate_fields = getattr(self.i, self.ATTR_TRANSLATE)
-
-        if hasattr(self.i, self.ATTR_VALUE_MAP):
-            _translate_values = getattr(self.i, self.ATTR_VALUE_MAP)
-
-        if hasattr(self.i, self.ATTR_BOOL_INVERT):
-            _bool_invert_fields = getattr(self.i, self.ATTR_BOOL_INVERT)
-
-        for field in self.i.FIELDS_ALL:
-            if field in ignore_fields:
-                continue
-
-            opn_field = field
-            if field in _translate_fields:
-                opn_field = _translate_fields[field]
+        return self.plan.build_request(params=self.i.p, existing=self.e, ignore_fields=ignore_fields)
 
-            if field in self.i.p:
-                opn_data = self.i.p[field]
-
-            elif field in self.e:
-                opn_data = self.e[field]
-
-            else:
-                opn_data = ''
+    def _link_uuids(self, field: str, value, existing: dict, existing_field_id: str, unique: bool) -> list:
+        if existing is None or len(existing) == 0:
+            return []
 
-            if field in _translate_values:
-                try:
-                    opn_data = _translate_values[field][opn_data]
-
-                except KeyError:
-                    pass
+        uuids = link_index(existing=existing, existing_field_id=existing_field_id).get(value, [])
 
-            if isinstance(opn_data, bool):
-                if field in _bool_invert_fields:
-                    opn_data = not opn_data
-
-                request[opn_field] = to_digit(opn_data)
-
-            elif isinstance(opn_data, list):
-                join_char = self.RESP_JOIN_CHAR
-
-                if hasattr(self.i, self.ATTR_JOIN_CHAR):
-                    join_char = getattr(self.i, self.ATTR_JOIN_CHAR)
-
-                request[opn_field] = join_char.join(opn_data)
-
-            elif opn_data is None:
-                request[opn_field] = ''
-
-            else:
-                request[opn_field] = opn_data
+        if unique or len(uuids) <= 1:
+            # duplicates fail the lookup
+            return uuids
 
-        payload = request
-
-        if hasattr(self.i, self.ATTR_AK_PATH_REQ):
-            ak_path = getattr(self.i, self.ATTR_AK_PATH_REQ).split(self.ATTR_AK_PATH_SPLIT_CHAR)
-            ak_path.reverse()
-
-            for k in ak_path:
-                payload = {k: payload}
-
-        elif hasattr(self.i, self.ATTR_AK_PATH):
-            # request only needs the last key
-            ak_path = getattr(self.i, self.ATTR_AK_PATH)
-            attr_ak = ak_path
-
-            if ak_path.find('.') != -1:
-                attr_ak = ak_path.rsplit(self.ATTR_AK_PATH_SPLIT_CHAR, 1)[1]
-
-            payload = {attr_ak: payload}
-
-        return payload
+        # entries that may share their name (per example prefix-lists) - the last one is linked
+        self.i.m.warn(
+            f"Provided {field} '{value}' matches multiple existing entries: {uuids} - "
+            f"linking the last one '{uuids[-1]}'; you should make the names unique"
+        )
+        return uuids[-1:]
 
     def find_single_link(
             self, field: str, existing: dict, set_field: str = None, existing_field_id: str = 'name',
-            fail: bool = True
+            fail: bool = True, unique: bool = True,
     ) -> bool:
         entry = None
 
         if not is_unset(self.i.p[field]):
-            found = False
             if set_field is None:
                 set_field = field
 
-            if len(existing) > 0:
-                for uuid, item in existing.items():
-                    if item[existing_field_id] == self.i.p[field]:
-                        self.i.p[set_field] = uuid
-                        entry = item[existing_field_id]
-                        found = True
+            uuids = self._link_uuids(
+                field=field, value=self.i.p[field], existing=existing, existing_field_id=existing_field_id,
+                unique=unique,
+            )
 
-            if not found:
+            if len(uuids) != 1:
                 if fail:
-                    self.i.m.fail_json(
-                        f"Provided {field} '{self.i.p[field]}' was not found!"
-                    )
+                    if len(uuids) == 0:
+                        self.i.m.fail_json(f"Provided {field} '{self.i.p[field]}' was not found!")
+
+                    self.i.m.fail_json(f"Provided {field} '{self.i.p[field]}' is not unique!")
 
                 return False
 
+            entry = self.i.p[field]
+            self.i.p[set_field] = uuids[0]
+
         if 'before' in self.i.r['diff'] and set_field in self.i.r['diff']['before']:
             self.i.r['diff']['before'][set_field] = entry
 
@@ -594,27 +611,33 @@ class Base:
 
     def find_multiple_links(
             self, field: str, existing: dict, set_field: str = None, existing_field_id: str = 'name',
-            fail: bool = True, fail_soft: bool = False
+            fail: bool = True, fail_soft: bool = False, unique: bool = True,
     ) -> bool:
         provided = len(self.i.p[field]) > 0
         uuids = []
         entries = []
+        msg = None
 
         if not provided:
             return True
 
-        if existing is not None and len(existing) > 0:
-            for uuid, item in existing.items():
-                if item[existing_field_id] in self.i.p[field]:
-                    uuids.append(uuid)
-                    entries.append(item[existing_field_id])
+        for value in self.i.p[field]:
+            matches = self._link_uuids(
+                field=field, value=value, existing=existing, existing_field_id=existing_field_id, unique=unique,
+            )
 
-                if len(uuids) == len(self.i.p[field]):
-                    break
+            if len(matches) == 0:
+                msg = f"At least one of the provided {field} entries was not found!"
+                break
+
+            if len(matches) > 1:
+                msg = f"Provided {field} entry '{value}' is not unique!"
+                break
 
-        if len(uuids) != len(self.i.p[field]):
-            msg = f"At least one of the provided {field} entries was not found!"
+            uuids.append(matches[0])
+            entries.append(value)
 
+        if msg is not None:
             if fail:
                 self.i.m.fail_json(msg)
 
@@ -644,30 +667,37 @@ class Base:
                 self.e = _existing
 
     def simplify_existing(self, existing: dict) -> dict:
-        translate, typing, bool_invert, value_map = {}, {}, [], {}
+        return self.plan.simplify(existing)
 
-        if hasattr(self.i, self.ATTR_TRANSLATE):
-            translate = getattr(self.i, self.ATTR_TRANSLATE)
+    @property
+    def plan(self) -> FieldPlan:
+        # compiled once per module-class; instances that override field-attributes get their own plan
+        if self._plan is None:
+            if any(attr in vars(self.i) for attr in FieldPlan.ATTRS):
+                self._plan = FieldPlan(self.i)
 
-        if hasattr(self.i, self.ATTR_TYPING):
-            typing = getattr(self.i, self.ATTR_TYPING)
+            else:
+                cls = type(self.i)
+                if self.ATTR_FIELD_PLAN not in vars(cls):
+                    setattr(cls, self.ATTR_FIELD_PLAN, FieldPlan(cls))
 
-        if hasattr(self.i, self.ATTR_BOOL_INVERT):
-            bool_invert = getattr(self.i, self.ATTR_BOOL_INVERT)
+                self._plan = getattr(cls, self.ATTR_FIELD_PLAN)
 
-        if hasattr(self.i, self.ATTR_VALUE_MAP_RCV):
-            value_map = getattr(self.i, self.ATTR_VALUE_MAP_RCV)
+        return self._plan
 
-        elif hasattr(self.i, self.ATTR_VALUE_MAP):
-            value_map = getattr(self.i, self.ATTR_VALUE_MAP)
+    @property
+    def page_size(self) -> int:
+        if hasattr(self.i, self.ATTR_PAGE_SIZE):
+            return getattr(self.i, self.ATTR_PAGE_SIZE)
 
-        return simplify_translate(
-            existing=existing,
-            typing=typing,
-            translate=translate,
-            bool_invert=bool_invert,
-            value_map=value_map,
-        )
+        return self.QUERY_PAGE_SIZE
+
+    @property
+    def max_parallel(self) -> int:
+        if self.PARAM_MAX_PARALLEL in self.i.m.params and self.i.m.params[self.PARAM_MAX_PARALLEL] is not None:
+            return max(1, int(self.i.m.params[self.PARAM_MAX_PARALLEL]))
+
+        return 1
 
     @property
     def field_pk(self) -> str:
@@ -676,7 +706,24 @@ class Base:
 
         return 'uuid'
 
-    def _call_simple(self) -> Callable:
+    def simplify_cached(self, existing: dict) -> dict:
+        # every raw entry only gets translated once - even if it is re-used by get_existing/find/matching
+        #   cached by primary-key and object; the entry is referenced by the cache - so its id can not be re-used
+        cache_key = (existing.get(self.field_pk, None), id(existing))
+        cached = self.simple_cache.get(cache_key)
+
+        if cached is not None and cached[0] is existing:
+            profile_count('simplify_cached')
+
+        else:
+            cached = (existing, self._simplify_func()(existing))
+            self.simple_cache[cache_key] = cached
+            profile_count('simplify_translated')
+
+        # callers might modify the entry
+        return cached[1].copy()
+
+    def _simplify_func(self) -> Callable:
         if hasattr(self.i, 'simplify_existing'):
             return self.i.simplify_existing
 
@@ -685,6 +732,9 @@ class Base:
 
         return self.simplify_existing
 
+    def _call_simple(self) -> Callable:
+        return self.simplify_cached
+
     def _call_search(self, match_fields: list = None) -> (list, dict):
         if hasattr(self.i, '_search_call'):
             return self.i._search_call()
@@ -0,0 +1,249 @@
+# pylint: disable=C0415
+from time import sleep
+from random import random
+from threading import Lock
+
+import pytest
+
+
+class AnsibleError(Exception):
+    pass
+
+
+class DummyModule:
+    def __init__(self, max_parallel: int = 5):
+        self.params = dict(
+            debug=False,
+            api_max_parallel=max_parallel,
+        )
+        self.check_mode = False
+        self.warnings = []
+
+    def fail_json(self, msg: str):
+        raise AnsibleError(msg)
+
+    def warn(self, msg: str):
+        self.warnings.append(msg)
+
+
+class DummySession:
+    def __init__(self, rows: list):
+        self.rows = rows
+        self.calls = []
+        self._lock = Lock()
+
+    def post(self, cnf: dict, headers: dict = None) -> dict:
+        del headers
+        with self._lock:
+            self.calls.append(cnf['command'])
+
+        start = (cnf['data']['current'] - 1) * cnf['data']['rowCount']
+        rows = self.rows[start:start + cnf['data']['rowCount']]
+        return {
+            'rows': [row.copy() for row in rows],
+            'rowCount': len(rows),
+            'total': len(self.rows),
+            'current': cnf['data']['current'],
+        }
+
+    def get(self, cnf: dict) -> dict:
+        sleep(random() / 100)  # shuffle the order in which the responses are received
+        with self._lock:
+            self.calls.append(cnf['command'])
+
+        if 'params' not in cnf:
+            return {'item': {'name': '', 'detail': ''}}
+
+        return {'item': {'name': 'detail', 'detail': f"detail_{cnf['params'][0]}"}}
+
+
+class DummyObj:
+    API_KEY_PATH = 'item'
+    API_MOD = 'dummy'
+    API_CONT = 'dummy'
+    FIELDS_ALL = ['name', 'detail']
+    FIELDS_CHANGE = ['detail']
+    FIELDS_TYPING = {}
+    CMDS = {
+        'search': 'searchItem',
+        'detail': 'getItem',
+    }
+    EXIST_ATTR = 'item'
+
+    def __init__(self, rows: list, max_parallel: int = 5, params: dict = None):
+        from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.base import Base
+        self.m = DummyModule(max_parallel=max_parallel)
+        self.p = {} if params is None else params
+        self.r = {'changed': False, 'diff': {'before': {}, 'after': {}}}
+        self.s = DummySession(rows=rows)
+        self.call_cnf = {'module': self.API_MOD, 'controller': self.API_CONT}
+        self.item = {}
+        self.exists = False
+        self.existing_entries = None
+        self.b = Base(instance=self)
+
+
+def _rows(count: int) -> list:
+    return [{'uuid': str(i), 'name': f"entry_{i}"} for i in range(count)]
+
+
+@pytest.mark.parametrize('max_parallel', [1, 3, 20])
+def test_search_details_order(max_parallel: int):
+    rows = _rows(25)
+    obj = DummyObj(rows=rows, max_parallel=max_parallel)
+    data = obj.b.search()
+
+    assert [entry['uuid'] for entry in data] == [row['uuid'] for row in rows]
+    for entry in data:
+        # base-entry fields take precedence over detail-fields
+        assert entry['name'] == f"entry_{entry['uuid']}"
+        assert entry['detail'] == f"detail_{entry['uuid']}"
+
+    assert obj.s.calls.count('getItem') == len(rows)
+    assert obj.b.raw == data[0]
+
+
+def test_search_details_matched_only():
+    rows = _rows(10)
+    obj = DummyObj(rows=rows, params={'name': 'entry_4'})
+    data = obj.b.search(match_fields=['name'])
+
+    assert len(data) == len(rows)
+    assert obj.s.calls.count('getItem') == 1
+    assert data[4]['detail'] == 'detail_4'
+    assert 'detail' not in data[3]
+
+
+def test_search_details_empty():
+    obj = DummyObj(rows=[])
+    assert obj.b.search() == []
+    assert obj.b.raw == {'name': '', 'detail': ''}
+
+
+@pytest.mark.parametrize('count, page_size, pages', [
+    (0, 10, 1),
+    (9, 10, 1),
+    (10, 10, 1),
+    (11, 10, 2),
+    (95, 10, 10),
+])
+def test_search_rows_paging(count: int, page_size: int, pages: int):
+    rows = _rows(count)
+    obj = DummyObj(rows=rows)
+    received = list(obj.b.search_rows(
+        cnf={**obj.call_cnf, 'command': obj.CMDS['search']},
+        page_size=page_size,
+    ))
+
+    assert received == rows
+    assert obj.s.calls.count('searchItem') == pages
+
+
+def test_search_iter_stops_early():
+    class PagedDummyObj(DummyObj):
+        QUERY_PAGE_SIZE = 10
+
+    rows = _rows(100)
+    obj = PagedDummyObj(rows=rows, max_parallel=4)
+
+    for entry in obj.b.search_iter(chunk_size=obj.b.max_parallel):
+        if entry['name'] == 'entry_13':
+            break
+
+    assert obj.s.calls.count('searchItem') == 2
+    assert obj.s.calls.count('getItem') == 16
+
+
+@pytest.mark.parametrize('name, details', [
+    ('entry_40', 1),
+    # only the empty template of the detail-endpoint is pulled
+    ('entry_missing', 1),
+])
+def test_find_lazy_details(name: str, details: int):
+    class LazyDummyObj(DummyObj):
+        QUERY_PAGE_SIZE = 10
+
+        def _search_lazy(self) -> bool:
+            return True
+
+    obj = LazyDummyObj(rows=_rows(50), params={'name': name})
+    obj.b.find(match_fields=['name'])
+
+    assert obj.exists == (name != 'entry_missing')
+    assert obj.s.calls.count('getItem') == details
+
+    if obj.exists:
+        assert obj.item['detail'] == 'detail_40'
+        # no need to pull the pages after the match
+        assert obj.s.calls.count('searchItem') == 5
+
+
+def test_simplify_cached():
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import PROFILE_COUNTERS
+
+    rows = _rows(10)
+    obj = DummyObj(rows=rows, params={'name': 'entry_7'})
+    translated = PROFILE_COUNTERS.get('simplify_translated', 0)
+
+    existing = obj.b.search()
+    obj.existing_entries = existing
+    obj.b.find(match_fields=['name'])
+    obj.b.find(match_fields=['name'])
+
+    assert obj.exists
+    assert obj.item['name'] == 'entry_7'
+    # the entries up to the match were only translated by the first lookup
+    assert PROFILE_COUNTERS['simplify_translated'] - translated == 8
+
+    # re-pulled entries need to be translated again
+    pulled = {**existing[0], 'detail': 'changed'}
+    assert obj.b.simplify_cached(pulled)['detail'] == 'changed'
+    assert obj.b.simplify_cached(existing[0])['detail'] == 'detail_0'
+    assert PROFILE_COUNTERS['simplify_translated'] - translated == 9
+
+
+def test_find_links():
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.index import link_index
+
+    existing = {f'uuid_{i}': {'name': f'acl_{i}'} for i in range(1000)}
+    obj = DummyObj(rows=[], params={'acl': 'acl_7', 'acls': ['acl_9', 'acl_3']})
+    obj.r['diff']['before'] = {'acls': []}
+
+    assert obj.b.find_single_link(field='acl', existing=existing)
+    assert obj.p['acl'] == 'uuid_7'
+    assert obj.b.find_multiple_links(field='acls', existing=existing)
+    assert obj.p['acls'] == ['uuid_9', 'uuid_3']
+    assert obj.r['diff']['before']['acls'] == ['acl_3', 'acl_9']
+
+    # the index of the table is re-used by the following lookups
+    assert link_index(existing) is link_index(existing)
+
+    obj.p['acl'] = 'acl_missing'
+    with pytest.raises(AnsibleError, match='not found'):
+        obj.b.find_single_link(field='acl', existing=existing)
+
+    assert not obj.b.find_single_link(field='acl', existing=existing, fail=False)
+
+
+def test_find_links_duplicate():
+    existing = {'uuid_1': {'name': 'acl_1'}, 'uuid_2': {'name': 'acl_1'}, 'uuid_3': {'name': 'acl_3'}}
+    obj = DummyObj(rows=[], params={'acl': 'acl_1', 'acls': ['acl_3', 'acl_1']})
+
+    with pytest.raises(AnsibleError, match='not unique'):
+        obj.b.find_single_link(field='acl', existing=existing)
+
+    with pytest.raises(AnsibleError, match='not unique'):
+        obj.b.find_multiple_links(field='acls', existing=existing)
+
+    assert len(obj.m.warnings) == 0
+
+    # entries that may share their name
+    assert obj.b.find_multiple_links(field='acls', existing=existing, unique=False)
+    assert obj.p['acls'] == ['uuid_3', 'uuid_2']
+    assert len(obj.m.warnings) == 1 and 'uuid_2' in obj.m.warnings[0]
+
+    # new entries need to be picked up
+    existing['uuid_4'] = {'name': 'acl_4'}
+    obj.p['acl'] = 'acl_4'
+    assert obj.b.find_single_link(field='acl', existing=existing)
+    assert obj.p['acl'] == 'uuid_4'
@@ -24,6 +24,7 @@ class BaseModule:
         self.b = Base(instance=self)
         self.exists = False
         self.existing_entries = None
+        self.existing_index = None
         self.call_cnf = {
             'module': self.b.i.API_MOD,
             'controller': self.b.i.API_CONT,
@@ -32,6 +33,11 @@ class BaseModule:
     def _search_call(self) -> list:
         return self.b.search()
 
+    def _search_lazy(self) -> bool:
+        # entries can only be pulled lazily if the module does not customize its search-call
+        return self.b.search_paged and not hasattr(self, 'search_call') and \
+            type(self)._search_call is BaseModule._search_call
+
     def _base_check(self, match_fields: list = None):
         if match_fields is None:
             if 'match_fields' in self.p:
@@ -12,6 +12,14 @@ class ModuleSoftError(Exception):
     pass
 
 
+class ModuleFailure(Exception):
+    # 'fail_json' called by a worker-thread; the module is failed by the calling thread
+    def __init__(self, msg: str, kwargs: dict = None):
+        Exception.__init__(self, msg)
+        self.msg = msg
+        self.kwargs = {} if kwargs is None else kwargs
+
+
 def exit_bug(msg: str):
     raise AnsibleModuleError(f"THIS MIGHT BE A MODULE-BUG: {msg}")
 
@@ -0,0 +1,173 @@
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import \
+    is_true, format_int, get_selected, get_selected_list, get_selected_opt_list, get_selected_opt_list_idx, \
+    to_digit
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler import \
+    exit_bug
+
+TYPING_CONVERTERS = {
+    'bool': is_true,
+    'int': format_int,
+    'list': lambda value: get_selected_list(data=value, remove_empty=True),
+    'select': get_selected,
+    'select_opt_list': get_selected_opt_list,
+    'select_opt_list_idx': get_selected_opt_list_idx,
+}
+
+
+class FieldPlan:
+    # field-mapping of a module-class compiled into flat lookups
+    #   is built once per class (see 'Base.plan') so the per-entry work of
+    #   diffing, request-building and translating does not need to resolve the class-attributes again
+    ATTR_FIELD_ALL = 'FIELDS_ALL'
+    ATTR_TRANSLATE = 'FIELDS_TRANSLATE'
+    ATTR_TYPING = 'FIELDS_TYPING'
+    ATTR_BOOL_INVERT = 'FIELDS_BOOL_INVERT'
+    ATTR_VALUE_MAP = 'FIELDS_VALUE_MAPPING'
+    ATTR_VALUE_MAP_RCV = 'FIELDS_VALUE_MAPPING_RCV'
+    ATTR_DIFF_EXCL = 'FIELDS_DIFF_EXCLUDE'
+    ATTR_DIFF_NO_LOG = 'FIELDS_DIFF_NO_LOG'
+    ATTR_JOIN_CHAR = 'JOIN_CHAR'
+    ATTR_AK_PATH = 'API_KEY_PATH'
+    ATTR_AK_PATH_REQ = 'API_KEY_PATH_REQ'
+    ATTR_AK_PATH_SPLIT_CHAR = '.'
+    JOIN_CHAR = ','
+
+    ATTRS = [
+        ATTR_FIELD_ALL, ATTR_TRANSLATE, ATTR_TYPING, ATTR_BOOL_INVERT, ATTR_VALUE_MAP, ATTR_VALUE_MAP_RCV,
+        ATTR_DIFF_EXCL, ATTR_DIFF_NO_LOG, ATTR_JOIN_CHAR, ATTR_AK_PATH, ATTR_AK_PATH_REQ,
+    ]
+
+    def __init__(self, source):
+        # source can be the module-class or an instance that overrides some of its attributes
+        translate = getattr(source, self.ATTR_TRANSLATE, {})
+        typing = getattr(source, self.ATTR_TYPING, {})
+        value_map = getattr(source, self.ATTR_VALUE_MAP, {})
+        value_map_rcv = getattr(source, self.ATTR_VALUE_MAP_RCV, value_map)
+        exclude = set(getattr(source, self.ATTR_DIFF_EXCL, []))
+        no_log = set(getattr(source, self.ATTR_DIFF_NO_LOG, []))
+
+        self.fields = tuple(getattr(source, self.ATTR_FIELD_ALL))
+        self.bool_invert = frozenset(getattr(source, self.ATTR_BOOL_INVERT, []))
+        self.join_char = getattr(source, self.ATTR_JOIN_CHAR, self.JOIN_CHAR)
+
+        # diff: (field, value is hidden)
+        self.diff_fields = tuple(
+            (field, field in no_log) for field in self.fields if field not in exclude
+        )
+
+        # request: (field, api-field, value-mapping, bool is inverted)
+        self.request_fields = tuple(
+            (field, translate.get(field, field), value_map.get(field), field in self.bool_invert)
+            for field in self.fields
+        )
+        self.request_path = self._request_path(source)
+
+        # simplify: api-field => ansible-field & type-converters in the order they need to be applied
+        self.translate = tuple(translate.items())
+        self.translate_api_fields = frozenset(translate.values())
+        self.converters = tuple(
+            (field, TYPING_CONVERTERS[field_type])
+            for field_type, fields in typing.items() if field_type in TYPING_CONVERTERS
+            for field in fields
+        )
+        self.value_map_rcv = tuple(
+            (field, tuple(vmap.items())) for field, vmap in value_map_rcv.items()
+        )
+
+    def _request_path(self, source) -> tuple:
+        if hasattr(source, self.ATTR_AK_PATH_REQ):
+            return tuple(getattr(source, self.ATTR_AK_PATH_REQ).split(self.ATTR_AK_PATH_SPLIT_CHAR))
+
+        if hasattr(source, self.ATTR_AK_PATH):
+            # request only needs the last key
+            return (getattr(source, self.ATTR_AK_PATH).rsplit(self.ATTR_AK_PATH_SPLIT_CHAR, 1)[-1],)
+
+        return ()
+
+    def wrap_request(self, request: dict) -> dict:
+        payload = request
+
+        for k in reversed(self.request_path):
+            payload = {k: payload}
+
+        return payload
+
+    def build_request(self, params: dict, existing: dict, ignore_fields: list = None) -> dict:
+        request = {}
+
+        for field, opn_field, value_map, bool_invert in self.request_fields:
+            if ignore_fields and field in ignore_fields:
+                continue
+
+            if field in params:
+                opn_data = params[field]
+
+            elif field in existing:
+                opn_data = existing[field]
+
+            else:
+                opn_data = ''
+
+            if value_map is not None:
+                try:
+                    opn_data = value_map[opn_data]
+
+                except (KeyError, TypeError):
+                    pass
+
+            if isinstance(opn_data, bool):
+                request[opn_field] = to_digit(not opn_data if bool_invert else opn_data)
+
+            elif isinstance(opn_data, list):
+                request[opn_field] = self.join_char.join(opn_data)
+
+            elif opn_data is None:
+                request[opn_field] = ''
+
+            else:
+                request[opn_field] = opn_data
+
+        return self.wrap_request(request)
+
+    def simplify(self, existing: dict) -> dict:
+        # same result as 'helper.main.simplify_translate' with the module-attributes as arguments
+        simple = {}
+
+        try:
+            # translate api-fields to ansible-fields
+            for k, v in self.translate:
+                if v in existing:
+                    simple[k] = existing[v]
+
+            for k, v in existing.items():
+                if k not in self.translate_api_fields:
+                    simple[k] = v
+
+            # correct value types to match (for diff-checks)
+            for f, convert in self.converters:
+                simple[f] = convert(simple[f])
+
+            for f, vmap in self.value_map_rcv:
+                if f not in simple:
+                    continue
+
+                for pretty_value, opn_value in vmap:
+                    if simple[f] == opn_value:
+                        simple[f] = pretty_value
+                        break
+
+            for k, v in simple.items():
+                if isinstance(v, str) and v.isnumeric():
+                    simple[k] = int(v)
+
+                elif isinstance(v, bool) and k in self.bool_invert:
+                    simple[k] = not v
+
+        except KeyError as err:
+            exit_bug(
+                f"Failed to translate API entry to Ansible entry! Maybe the API changed lately? "
+                f"Failed field: {err} | "
+                f"API entry: '{existing}' '{simple}'"
+            )
+
+        return simple
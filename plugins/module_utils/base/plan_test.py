@@ -0,0 +1,68 @@
+# pylint: disable=C0415
+import pytest
+
+
+class DummyObj:
+    FIELDS_ALL = ['name', 'enabled', 'action', 'targets', 'description', 'secret']
+    FIELDS_TRANSLATE = {'targets': 'content', 'description': 'descr'}
+    FIELDS_TYPING = {
+        'bool': ['enabled'],
+        'list': ['targets'],
+        'select': ['action'],
+    }
+    FIELDS_BOOL_INVERT = ['enabled']
+    FIELDS_VALUE_MAPPING = {'action': {'allow': 'pass', 'deny': 'block'}}
+    FIELDS_DIFF_EXCLUDE = ['description']
+    FIELDS_DIFF_NO_LOG = ['secret']
+    JOIN_CHAR = '\n'
+    API_KEY_PATH = 'filter.rules.rule'
+
+
+EXISTING = {
+    'uuid': '1',
+    'name': 'test',
+    'enabled': '0',
+    'action': {'pass': {'value': 'Pass', 'selected': 1}, 'block': {'value': 'Block', 'selected': 0}},
+    'content': {'a': {'value': 'a', 'selected': 1}, 'b': {'value': 'b', 'selected': 1}},
+    'descr': '123',
+    'secret': 'x',
+}
+
+
+def _plan():
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.plan import FieldPlan
+    return FieldPlan(DummyObj)
+
+
+def test_simplify_equivalent():
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import simplify_translate
+
+    expected = simplify_translate(
+        existing=EXISTING,
+        translate=DummyObj.FIELDS_TRANSLATE,
+        typing=DummyObj.FIELDS_TYPING,
+        bool_invert=DummyObj.FIELDS_BOOL_INVERT,
+        value_map=DummyObj.FIELDS_VALUE_MAPPING,
+    )
+    assert _plan().simplify(EXISTING) == expected
+    assert expected['action'] == 'allow'
+    assert expected['enabled'] is True
+
+
+@pytest.mark.parametrize('ignore_fields, expected', [
+    (None, {'rule': {
+        'name': 'test', 'enabled': 0, 'action': 'block', 'content': 'a\nb', 'descr': '', 'secret': 'x',
+    }}),
+    (['secret', 'description'], {'rule': {
+        'name': 'test', 'enabled': 0, 'action': 'block', 'content': 'a\nb',
+    }}),
+])
+def test_build_request(ignore_fields: list, expected: dict):
+    params = {'name': 'test', 'enabled': True, 'action': 'deny', 'targets': ['a', 'b'], 'description': None}
+    assert _plan().build_request(params=params, existing={'secret': 'x'}, ignore_fields=ignore_fields) == expected
+
+
+def test_diff_fields():
+    assert _plan().diff_fields == (
+        ('name', False), ('enabled', False), ('action', False), ('targets', False), ('secret', True),
+    )
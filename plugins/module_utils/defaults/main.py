@@ -42,6 +42,11 @@ OPN_MOD_ARGS = dict(
         description="Used to en-/disable the profiling mode. "
                     "Time consumption of the module will be logged to '/tmp/ansibleguy.opnsense'"
     ),
+    api_trace=dict(
+        type='bool', required=False, default=False,
+        description="Used to en-/disable the tracing of API requests. Method, endpoint, status, size and duration "
+                    "of each request will be logged as JSON-lines to '/tmp/ansibleguy.opnsense/api_trace.jsonl'"
+    ),
     api_timeout=dict(
         type='float', required=False, aliases=['timeout'],
         description='Manually override the modules default API-request timeout'
@@ -51,6 +56,27 @@ OPN_MOD_ARGS = dict(
         description='Number of retries on API requests, in case there is an error when establishing the connection. '
                     'This does not handle errors returned by the OPNSense system'
     ),
+    api_request_retries=dict(
+        type='int', required=False, default=2,
+        description='Number of retries on API requests that failed with a server-error (5xx), a rate-limit (429) '
+                    'or a timeout. Read-only requests are retried by default. Exponential backoff with jitter '
+                    'is applied between the retries'
+    ),
+    api_retry_backoff=dict(
+        type='float', required=False, default=0.5,
+        description='Base delay in seconds between the retries of API requests. It is doubled on each retry'
+    ),
+    api_retry_mutating=dict(
+        type='bool', required=False, default=False,
+        description='If requests that change the configuration should also be retried. Use with caution, '
+                    'as the change might already have been applied on the firewall if the response got lost'
+    ),
+    api_max_parallel=dict(
+        type='int', required=False, default=5,
+        description='Maximum number of API requests that may be executed in parallel. '
+                    'Used to speed-up the data-fetching of modules that need to pull details per entry. '
+                    "Set to '1' to disable parallel requests"
+    ),
 )
 
 BUILTIN_ALIASES = [
@@ -104,12 +130,22 @@ STATE_MOD_ARG_MULTI = dict(
     enabled=dict(type='bool', required=False, default=None),  # override only if set
 )
 
+RELOAD_DEFER_MOD_ARG = dict(
+    reload_defer=dict(
+        type='bool', required=False, default=False, aliases=['apply_defer'],
+        description='Do not reload the running config right away but register the reload as pending. '
+                    "Pending reloads are executed once per service by the 'reload' module using "
+                    "target 'pending' - use it as handler or at the end of the play"
+    )
+)
+
 RELOAD_MOD_ARG = dict(
     reload=dict(
         type='bool', required=False, default=True, aliases=['apply'],
         description='If the running config should be reloaded/applied on change - '
                     'will take some time'
-    )
+    ),
+    **RELOAD_DEFER_MOD_ARG,
 )
 
 RELOAD_MOD_ARG_DEF_FALSE = dict(
@@ -117,7 +153,8 @@ RELOAD_MOD_ARG_DEF_FALSE = dict(
         type='bool', required=False, default=False, aliases=['apply'],
         description='If the running config should be reloaded on change - '
                     'will take some time'
-    )
+    ),
+    **RELOAD_DEFER_MOD_ARG,
 )
 
 FAIL_MOD_ARG_MULTI = dict(
@@ -134,6 +171,53 @@ FAIL_MOD_ARG_MULTI = dict(
 DEBUG_CONFIG = dict(
     path_log='/tmp/ansibleguy.opnsense',
     log_api_calls='api_calls.log',
+    log_api_trace='api_trace.jsonl',
+)
+
+CACHE_PATH = f"{DEBUG_CONFIG['path_log']}/cache"
+RELOAD_STATE_PATH = f"{DEBUG_CONFIG['path_log']}/reload"
+CACHE_MOD_ARGS = dict(
+    cache_ttl=dict(
+        type='int', required=False, default=0,
+        description='Seconds the responses of the firewall are cached on the controller. '
+                    'Hosts that query the same firewall will share the cached responses. '
+                    "Set to '0' to disable the cache"
+    ),
+    cache_path=dict(
+        type='path', required=False, default=CACHE_PATH,
+        description='Directory the cached responses are stored in'
+    ),
+)
+
+# connection settings that can be overridden per firewall in fleet mode
+FLEET_FIELDS = [
+    'firewall', 'api_port', 'api_key', 'api_secret', 'api_credential_file', 'ssl_verify', 'ssl_ca_file',
+]
+FLEET_MOD_ARGS = dict(
+    firewalls=dict(
+        type='list', elements='dict', required=False,
+        description="Fleet mode: list of firewalls that are processed in parallel. Each entry needs the 'firewall' "
+                    "and can override its connection settings: 'api_port', 'api_key', 'api_secret', "
+                    "'api_credential_file', 'ssl_verify', 'ssl_ca_file'. Takes precedence over the 'firewall' "
+                    "argument",
+        # no defaults - unset settings are inherited from the module arguments
+        options={
+            k: {
+                **{sk: sv for sk, sv in OPN_MOD_ARGS[k].items() if sk not in ['default', 'aliases']},
+                'required': k == 'firewall',
+            } for k in FLEET_FIELDS
+        },
+    ),
+    fleet_max_parallel=dict(
+        type='int', required=False, default=10,
+        description='Maximum number of firewalls that are processed in parallel in fleet mode'
+    ),
+)
+# 'firewall' is optional if the 'firewalls' of fleet mode are used
+OPN_MOD_ARGS_FLEET = dict(
+    **{k: v for k, v in OPN_MOD_ARGS.items() if k != 'firewall'},
+    firewall={**OPN_MOD_ARGS['firewall'], 'required': False},
 )
+FLEET_REQUIRED_ONE_OF = [('firewall', 'firewalls')]
 
 CONNECTION_TEST_TIMEOUT = 1.5
@@ -99,16 +99,11 @@ def compare_aliases(existing: dict, configured: dict) -> tuple:
     return before != after, before, after
 
 
-def check_purge_configured(module: AnsibleModule, existing_alias: dict) -> bool:
-    to_purge = True
-    existing_name = existing_alias['name']
-
-    for alias_name in module.params['aliases'].keys():
-        if existing_name == alias_name:
-            to_purge = False
-            break
+def check_purge_configured(module: AnsibleModule, existing_alias: dict, configured: set = None) -> bool:
+    if configured is None:
+        configured = set(module.params['aliases'].keys())
 
-    return to_purge
+    return existing_alias['name'] not in configured
 
 
 def builtin_alias(name: str) -> bool:
@@ -2,6 +2,7 @@ import ssl
 from pathlib import Path
 from json import JSONDecodeError
 from json import dumps as json_dumps
+from json import loads as json_loads
 from datetime import datetime
 
 from ansible.module_utils.basic import AnsibleModule
@@ -13,6 +14,9 @@ from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main im
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.validate import \
     is_valid_domain
 
+API_ALLOWED_HTTP_STATI = (200,)
+_CREDENTIAL_CACHE = {}  # module-runs inside the same process (in-process execution) only parse the file once
+
 
 def _load_credential_file(module: AnsibleModule) -> None:
     cred_file_info = Path(module.params['api_credential_file'])
@@ -27,6 +31,11 @@ def _load_credential_file(module: AnsibleModule) -> None:
                 f"(mode {cred_file_mode})!"
             )
 
+        cache_key = (str(cred_file_info), cred_file_info.stat().st_mtime_ns)
+        if cache_key in _CREDENTIAL_CACHE:
+            module.params['api_key'], module.params['api_secret'] = _CREDENTIAL_CACHE[cache_key]
+            return
+
         with open(module.params['api_credential_file'], 'r', encoding='utf-8') as file:
             config = {}
             vaulted = False
@@ -55,6 +64,7 @@ def _load_credential_file(module: AnsibleModule) -> None:
 
             module.params['api_key'] = config['key']
             module.params['api_secret'] = config['secret']
+            _CREDENTIAL_CACHE[cache_key] = (config['key'], config['secret'])
 
     else:
         module.fail_json(
@@ -127,7 +137,7 @@ def debug_api(
 ) -> None:
     if 'debug' in module.params and module.params['debug']:
         if response is not None:
-            msg = f"RESPONSE: '{_clean_response(response.__dict__)}'"
+            msg = f"RESPONSE: '{_response_repr(response)}'"
 
         else:
             msg = f'REQUEST: {method} | URL: {url}'
@@ -151,39 +161,51 @@ def debug_api(
         module.warn(msg)
 
 
+def _parse_response(response) -> (dict, list):
+    # the raw body is parsed directly - skips the encoding detection and text-decoding of httpx
+    if len(response.content) == 0:
+        return {}
+
+    try:
+        return json_loads(response.content)
+
+    except (JSONDecodeError, UnicodeDecodeError):
+        return {}
+
+
+def _response_repr(response) -> str:
+    # expensive; only built if the response gets shown
+    return f'{_clean_response(response.__dict__)}'
+
+
 def check_response(module: AnsibleModule, cnf: dict, response) -> dict:
-    debug_api(module=module, response=response)
+    if module.params.get('debug', False):
+        debug_api(module=module, response=response)
 
-    if 'allowed_http_stati' not in cnf:
-        cnf['allowed_http_stati'] = [200]
+    json = _parse_response(response)
 
-    try:
-        json = response.json()
-
-    except JSONDecodeError:
-        json = {}
-
-    if response.status_code not in cnf['allowed_http_stati'] or \
-            ('result' in json and json['result'] == 'failed'):
-        # sometimes an error 'hides' behind a 200-code
-        if f"{response.__dict__}".find('Controller not found') != -1:
-            module.fail_json(
-                f"API call failed | Needed plugin not installed! | "
-                f"Response: {response.__dict__}"
-            )
+    if response.status_code in cnf.get('allowed_http_stati', API_ALLOWED_HTTP_STATI) and \
+            not (isinstance(json, dict) and json.get('result') == 'failed'):
+        return json
 
-        elif f"{response.__dict__}".find(' in use') != -1:
-            json['in_use'] = True
+    # sometimes an error 'hides' behind a 200-code
+    if response.content.find(b'Controller not found') != -1:
+        module.fail_json(
+            f"API call failed | Needed plugin not installed! | "
+            f"Response: {_response_repr(response)}"
+        )
 
-        else:
-            if 'validations' in json:
-                module.fail_json(
-                    f"API call failed | Error: {json['validations']} | "
-                    f"Response: {response.__dict__}"
-                )
+    elif response.content.find(b' in use') != -1:
+        json['in_use'] = True
 
-            else:
-                module.fail_json(f"API call failed | Response: {response.__dict__}")
+    elif isinstance(json, dict) and 'validations' in json:
+        module.fail_json(
+            f"API call failed | Error: {json['validations']} | "
+            f"Response: {_response_repr(response)}"
+        )
+
+    else:
+        module.fail_json(f"API call failed | Response: {_response_repr(response)}")
 
     return json
 
@@ -0,0 +1,112 @@
+from hashlib import sha256
+from json import dumps as json_dumps
+from json import loads as json_loads
+from json import JSONDecodeError
+from os import replace as os_replace
+from os import remove as os_remove
+from os import fdopen
+from pathlib import Path
+from tempfile import mkstemp
+from time import time
+
+import httpx
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import profile_count
+
+VALIDATOR_HEADERS = {
+    # response-header => request-header
+    'etag': 'If-None-Match',
+    'last-modified': 'If-Modified-Since',
+}
+
+
+class ResponseCache:
+    # on-disk cache of read-only responses; shared by all module-runs (forks) on the controller
+    #   entries are written atomically - readers will never see a partial file
+    #   expired entries are revalidated using the validators the firewall sent (if any)
+
+    def __init__(self, module: AnsibleModule, path: str, ttl: int):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.prefix = sha256(
+            f"{module.params['firewall']}:{module.params['api_port']}:{module.params['api_key']}".encode('utf-8')
+        ).hexdigest()[:16]
+        self.path.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    def _file(self, module: str, controller: str, url: str) -> Path:
+        url_hash = sha256(url.encode('utf-8')).hexdigest()[:32]
+        return self.path / f'{self.prefix}_{module}_{controller}_{url_hash}.json'
+
+    def load(self, module: str, controller: str, url: str) -> (dict, None):
+        try:
+            with open(self._file(module=module, controller=controller, url=url), 'r', encoding='utf-8') as f:
+                return json_loads(f.read())
+
+        except (OSError, JSONDecodeError):
+            return None
+
+    def fresh(self, entry: (dict, None)) -> bool:
+        return entry is not None and time() - entry['stored'] < self.ttl
+
+    @staticmethod
+    def validators(entry: (dict, None)) -> dict:
+        if entry is None:
+            return {}
+
+        return {VALIDATOR_HEADERS[k]: v for k, v in entry['validators'].items()}
+
+    @staticmethod
+    def response(entry: dict) -> httpx.Response:
+        return httpx.Response(
+            status_code=entry['status'],
+            content=entry['body'].encode('utf-8'),
+            headers={'content-type': 'application/json'},
+        )
+
+    def store(self, module: str, controller: str, url: str, response: httpx.Response) -> None:
+        if response.status_code != 200:
+            return
+
+        self._write(
+            target=self._file(module=module, controller=controller, url=url),
+            entry={
+                'stored': time(),
+                'status': response.status_code,
+                'validators': {k: response.headers[k] for k in VALIDATOR_HEADERS if k in response.headers},
+                'body': response.text,
+            },
+        )
+
+    def refresh(self, module: str, controller: str, url: str, entry: dict) -> None:
+        # firewall confirmed that the cached response is still valid
+        profile_count('api_cache_revalidated')
+        self._write(
+            target=self._file(module=module, controller=controller, url=url),
+            entry={**entry, 'stored': time()},
+        )
+
+    def _write(self, target: Path, entry: dict) -> None:
+        fd, tmp = mkstemp(dir=self.path, prefix='.tmp_')
+
+        try:
+            with fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(json_dumps(entry))
+
+            os_replace(tmp, target)
+
+        except OSError:
+            try:
+                os_remove(tmp)
+
+            except OSError:
+                pass
+
+    def invalidate(self, module: str, controller: str) -> None:
+        for file in self.path.glob(f'{self.prefix}_{module}_{controller}_*.json'):
+            try:
+                file.unlink()
+
+            except OSError:
+                pass
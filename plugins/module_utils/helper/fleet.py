@@ -0,0 +1,100 @@
+from copy import deepcopy
+from time import perf_counter
+from typing import Callable
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler import \
+    ModuleSoftError, AnsibleModuleError
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import FLEET_FIELDS
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import diff_remove_empty
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import parallel_map
+
+
+class FleetModule:
+    # wraps the module for a single firewall of the fleet; errors only fail the processing of this firewall
+
+    def __init__(self, module: AnsibleModule, params: dict):
+        self._module = module
+        self.params = params
+
+    def __getattr__(self, name: str):
+        return getattr(self._module, name)
+
+    def warn(self, msg: str) -> None:
+        self._module.warn(f"{self.params['firewall']}: {msg}")
+
+    def fail_json(self, msg: str, **kwargs) -> None:
+        del kwargs
+        raise ModuleSoftError(msg)
+
+
+def fleet_params(module: AnsibleModule) -> list:
+    fleet = []
+    names = set()
+
+    if module.params.get('firewall') is not None:
+        module.warn(f"Ignoring 'firewall' ({module.params['firewall']}) as the 'firewalls' of fleet mode were provided")
+
+    for entry in module.params['firewalls']:
+        if not isinstance(entry, dict) or entry.get('firewall') is None:
+            module.fail_json(f"Got invalid entry in 'firewalls': '{entry}' - need a dict with 'firewall'")
+
+        if entry['firewall'] in names:
+            module.fail_json(f"Firewall '{entry['firewall']}' was provided multiple times!")
+
+        names.add(entry['firewall'])
+        # unset settings are inherited; every firewall gets its own copy as the processing may modify the parameters
+        overrides = {k: v for k, v in entry.items() if k in FLEET_FIELDS and v is not None}
+        fleet.append({**deepcopy(module.params), 'firewalls': None, **overrides})
+
+    return fleet
+
+
+def process_fleet(m: AnsibleModule, p: dict, r: dict, process: Callable) -> None:
+    del p
+
+    def _process(params: dict) -> dict:
+        fw_result = dict(
+            changed=False,
+            diff={
+                'before': {},
+                'after': {},
+            }
+        )
+        start = perf_counter()
+
+        try:
+            # one session per firewall
+            process(m=FleetModule(module=m, params=params), p=params, r=fw_result)
+
+        except (ModuleSoftError, AnsibleModuleError) as error:
+            fw_result['error'] = str(error)
+
+        fw_result['diff'] = diff_remove_empty(fw_result['diff'])
+        fw_result['seconds'] = round(perf_counter() - start, 3)
+        return fw_result
+
+    fleet = fleet_params(m)
+    results = parallel_map(func=_process, items=fleet, max_parallel=m.params['fleet_max_parallel'], module=m)
+    r['firewalls'] = {params['firewall']: fw_result for params, fw_result in zip(fleet, results)}
+
+    for fw, fw_result in r['firewalls'].items():
+        if fw_result['changed']:
+            r['changed'] = True
+
+        for k in ['before', 'after']:
+            if k in fw_result['diff']:
+                r['diff'][k][fw] = fw_result['diff'][k]
+
+    errors = {fw: fw_result['error'] for fw, fw_result in r['firewalls'].items() if 'error' in fw_result}
+    if len(errors) > 0:
+        m.fail_json(f"Failed to process firewalls: {errors}", **r)
+
+
+def fleet_process(process: Callable) -> Callable:
+    # process all firewalls of the fleet in parallel - each one the same way the single-firewall mode would
+    def _process_fleet(m: AnsibleModule, p: dict, r: dict) -> None:
+        process_fleet(m=m, p=p, r=r, process=process)
+
+    return _process_fleet
@@ -0,0 +1,58 @@
+# pylint: disable=C0415
+import pytest
+
+
+class ModuleFailed(Exception):
+    pass
+
+
+class DummyModule:
+    def __init__(self, params: dict):
+        self.params = params
+        self.warnings = []
+
+    def warn(self, msg: str):
+        self.warnings.append(msg)
+
+    def fail_json(self, msg: str, **kwargs):
+        del kwargs
+        raise ModuleFailed(msg)
+
+
+def _params(**kwargs) -> dict:
+    return {'firewall': None, 'api_port': 443, 'api_key': 'key', 'api_secret': 'secret', **kwargs}
+
+
+def test_fleet_params():
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.fleet import fleet_params
+
+    # the unset suboptions are inherited from the module arguments
+    m = DummyModule(_params(firewalls=[
+        {'firewall': 'fw1', 'api_port': None, 'api_key': None},
+        {'firewall': 'fw2', 'api_port': 8443, 'api_key': 'key2'},
+    ]))
+    fleet = fleet_params(m)
+
+    assert [(p['firewall'], p['api_port'], p['api_key']) for p in fleet] == [('fw1', 443, 'key'), ('fw2', 8443, 'key2')]
+    assert all(p['firewalls'] is None and p['api_secret'] == 'secret' for p in fleet)
+    assert len(m.warnings) == 0
+
+
+def test_fleet_params_precedence():
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.fleet import fleet_params
+
+    m = DummyModule(_params(firewall='fw0', firewalls=[{'firewall': 'fw1'}]))
+    assert [p['firewall'] for p in fleet_params(m)] == ['fw1']
+    assert len(m.warnings) == 1
+
+
+@pytest.mark.parametrize('firewalls, error', [
+    ([{'firewall': 'fw1'}, {'firewall': 'fw1'}], 'multiple times'),
+    ([{'api_port': 8443}], 'invalid entry'),
+    (['fw1'], 'invalid entry'),
+])
+def test_fleet_params_invalid(firewalls: list, error: str):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.fleet import fleet_params
+
+    with pytest.raises(ModuleFailed, match=error):
+        fleet_params(DummyModule(_params(firewalls=firewalls)))
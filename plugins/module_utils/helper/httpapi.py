@@ -0,0 +1,55 @@
+from json import dumps as json_dumps
+
+import httpx
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.connection import Connection, ConnectionError as AnsibleConnectionError
+
+HTTPAPI_BASE_URL = '/api/'
+
+
+def httpapi_enabled(module: AnsibleModule) -> bool:
+    # set by ansible if the task uses 'connection: httpapi'
+    return getattr(module, '_socket_path', None) is not None
+
+
+class HttpApiClient:
+    # sends the requests through the persistent connection of the 'httpapi' plugin (see plugins/httpapi/opnsense.py)
+    #   provides the parts of httpx.Client the Session uses; so retries, tracing & response-checks stay the same
+    #   the connection process is kept alive between tasks - no per-task connection setup & TLS handshake
+
+    def __init__(self, module: AnsibleModule, connection: Connection = None):
+        if connection is None:
+            connection = Connection(module._socket_path)  # pylint: disable=W0212
+
+        self.connection = connection
+        self.base_url = HTTPAPI_BASE_URL
+        self.is_closed = False
+
+    def request(self, method: str, url: str, timeout: httpx.Timeout = None, **kwargs) -> httpx.Response:
+        # timeouts are handled by the connection ('persistent_command_timeout')
+        del timeout
+        data = None if kwargs.get('json') is None else json_dumps(kwargs['json'])
+
+        try:
+            status, body, headers = self.connection.send_request(
+                data=data,
+                path=f'{self.base_url}{url}',
+                method=method,
+                headers=kwargs.get('headers') or {},
+            )
+
+        except AnsibleConnectionError as error:
+            # handled like the connection errors of the direct client (retries, error message)
+            raise httpx.ConnectError(str(error)) from error
+
+        return httpx.Response(
+            status_code=status,
+            content=body.encode('utf-8'),
+            headers=headers,
+            request=httpx.Request(method=method, url=f'https://httpapi{self.base_url}{url}'),
+        )
+
+    def close(self) -> None:
+        # the persistent connection is managed by ansible
+        self.is_closed = True
@@ -0,0 +1,118 @@
+from typing import Callable
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler import \
+    exit_bug
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import \
+    sanitize_module_args
+
+
+class MatchingIndex:
+    # hash-index over the simplified existing entries
+    #   is built once per module-run and replaces the linear scans of 'get_matching' for the multi-modules
+    #   entries are matched by their stringified values - the same way 'get_matching' does it
+
+    def __init__(self, existing_items: (dict, list), simplify_func: Callable = None):
+        self.existing_items = existing_items
+        self.simplify_func = simplify_func
+        self._simple = None
+        self._indexes = {}
+
+    @staticmethod
+    def _key(item: dict, match_fields: list) -> tuple:
+        return tuple(str(item[field]) for field in match_fields)
+
+    def _simplified(self) -> list:
+        if self._simple is None:
+            existing_items = self.existing_items
+
+            if isinstance(existing_items, dict):
+                _existing_items_list = []
+                for uuid, existing in existing_items.items():
+                    existing['uuid'] = uuid
+                    _existing_items_list.append(existing)
+
+                existing_items = _existing_items_list
+
+            if self.simplify_func is None:
+                self._simple = list(existing_items)
+
+            else:
+                self._simple = [self.simplify_func(existing) for existing in existing_items]
+
+        return self._simple
+
+    def _index(self, match_fields: list) -> dict:
+        index_key = tuple(match_fields)
+
+        if index_key not in self._indexes:
+            index = {}
+
+            for existing in self._simplified():
+                try:
+                    key = self._key(item=existing, match_fields=match_fields)
+
+                except KeyError:
+                    # entry can never be matched using these fields
+                    continue
+
+                # keep the order of the existing entries - the first one is the 'get_matching' result
+                index.setdefault(key, []).append(existing)
+
+            self._indexes[index_key] = index
+
+        return self._indexes[index_key]
+
+    def get_multiple(self, module: AnsibleModule, compare_item: dict, match_fields: list) -> list:
+        try:
+            key = self._key(item=compare_item, match_fields=match_fields)
+
+        except KeyError as error:
+            exit_bug(
+                "Failed to match existing entries with provided one: "
+                f"{sanitize_module_args(compare_item)}; "
+                f"Error while comparing: {error}"
+            )
+
+        matching = self._index(match_fields).get(key, [])
+
+        if module.params['debug'] and len(matching) == 0:
+            module.warn(f"NOT MATCHING: no existing entry has the values {dict(zip(match_fields, key))}")
+
+        return [existing.copy() for existing in matching]
+
+    def get(self, module: AnsibleModule, compare_item: dict, match_fields: list) -> (dict, None):
+        matching = self.get_multiple(module=module, compare_item=compare_item, match_fields=match_fields)
+
+        if len(matching) == 0:
+            return None
+
+        return matching[0]
+
+
+_LINK_INDEXES = {}
+
+
+def link_index(existing: dict, existing_field_id: str = 'name') -> dict:
+    # reverse index 'existing_field_id' => uuids of an existing table
+    #   built once per table & field; the link-resolution of all entries of a run share it
+    #   the table is referenced by the index - so its id can not be re-used while cached
+    key = (id(existing), existing_field_id)
+    cached = _LINK_INDEXES.get(key)
+
+    if cached is None or cached[0] is not existing or cached[1] != len(existing):
+        index = {}
+
+        for uuid, item in existing.items():
+            try:
+                index.setdefault(item[existing_field_id], []).append(uuid)
+
+            except TypeError:
+                # unhashable values can not be linked by name
+                continue
+
+        cached = (existing, len(existing), index)
+        _LINK_INDEXES[key] = cached
+
+    return cached[2]
@@ -0,0 +1,64 @@
+# pylint: disable=C0415
+import pytest
+
+
+class DummyModule:
+    def __init__(self):
+        self.params = dict(debug=False)
+
+    def warn(self, msg: str):
+        pass
+
+
+DUMMY_MODULE = DummyModule()
+EXISTING = [
+    {'uuid': '1', 'name': 'a', 'port': 80, 'enabled': True},
+    {'uuid': '2', 'name': 'b', 'port': '443', 'enabled': False},
+    {'uuid': '3', 'name': 'b', 'port': 443, 'enabled': True},
+    {'uuid': '4', 'name': 'c'},
+]
+
+
+@pytest.mark.parametrize('compare_item, match_fields', [
+    ({'name': 'a'}, ['name']),
+    ({'name': 'b'}, ['name']),
+    ({'name': 'b', 'port': 443}, ['name', 'port']),
+    ({'name': 'b', 'port': '443'}, ['name', 'port']),
+    ({'name': 'a', 'port': '80', 'enabled': True}, ['name', 'port', 'enabled']),
+    ({'name': 'c', 'port': 80}, ['name', 'port']),
+    ({'name': 'x'}, ['name']),
+])
+def test_matching_index_like_get_matching(compare_item: dict, match_fields: list):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import \
+        get_matching, get_multiple_matching
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.index import MatchingIndex
+
+    existing = [entry for entry in EXISTING if all(field in entry for field in match_fields)]
+    index = MatchingIndex(existing_items=EXISTING)
+
+    assert index.get(module=DUMMY_MODULE, compare_item=compare_item, match_fields=match_fields) == \
+        get_matching(
+            module=DUMMY_MODULE, existing_items=existing, compare_item=compare_item, match_fields=match_fields,
+        )
+    assert index.get_multiple(module=DUMMY_MODULE, compare_item=compare_item, match_fields=match_fields) == \
+        get_multiple_matching(
+            module=DUMMY_MODULE, existing_items=existing, compare_item=compare_item, match_fields=match_fields,
+        )
+
+
+def test_matching_index_simplifies_once():
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.index import MatchingIndex
+
+    calls = []
+
+    def _simplify(entry: dict) -> dict:
+        calls.append(entry['uuid'])
+        return {**entry, 'name': entry['name'].upper()}
+
+    index = MatchingIndex(existing_items={e['uuid']: e.copy() for e in EXISTING}, simplify_func=_simplify)
+
+    for _ in range(3):
+        assert index.get(module=DUMMY_MODULE, compare_item={'name': 'B'}, match_fields=['name'])['uuid'] == '2'
+        assert index.get(module=DUMMY_MODULE, compare_item={'name': 'b'}, match_fields=['name']) is None
+
+    assert len(calls) == len(EXISTING)
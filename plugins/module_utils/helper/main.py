@@ -1,4 +1,4 @@
-from typing import Callable
+from typing import Callable, Iterable, Iterator
 from ipaddress import ip_address, ip_network, IPv4Address, IPv6Address, IPv6Network, AddressValueError, \
     NetmaskValueError
 from re import match as regex_match
@@ -106,48 +106,63 @@ def valid_hostname(name: str) -> bool:
     return all([_valid_domain, _valid_hostname])
 
 
+def chunk_iter(items: Iterable, size: int = None) -> Iterator[list]:
+    # split an iterable into lists of the provided size; if no size is provided a single chunk is returned
+    chunk = []
+
+    for item in items:
+        chunk.append(item)
+
+        if size is not None and len(chunk) >= size:
+            yield chunk
+            chunk = []
+
+    if len(chunk) > 0:
+        yield chunk
+
+
 def get_matching(
-        module: AnsibleModule, existing_items: (dict, list), compare_item: dict,
+        module: AnsibleModule, existing_items: (dict, list, Iterator), compare_item: dict,
         match_fields: list, simplify_func: Callable = None,
 ) -> (dict, None):
+    # NOTE: existing items may also be provided as iterator - it will only be consumed until the match is found
     matching = None
 
-    if len(existing_items) > 0:
-        if isinstance(existing_items, dict):
-            _existing_items_list = []
-            for uuid, existing in existing_items.items():
-                existing['uuid'] = uuid
-                _existing_items_list.append(existing)
+    if isinstance(existing_items, dict):
+        _existing_items_list = []
+        for uuid, existing in existing_items.items():
+            existing['uuid'] = uuid
+            _existing_items_list.append(existing)
 
-            existing_items = _existing_items_list
+        existing_items = _existing_items_list
 
-        for existing in existing_items:
-            _matching = []
+    for existing in existing_items:
+        _matching = []
 
-            if simplify_func is not None:
-                existing = simplify_func(existing)
+        if simplify_func is not None:
+            existing = simplify_func(existing)
 
-            try:
-                for field in match_fields:
-                    _matching.append(str(existing[field]) == str(compare_item[field]))
-
-                    if module.params['debug']:
-                        if existing[field] != compare_item[field]:
-                            module.warn(
-                                f"NOT MATCHING: "
-                                f"'{existing[field]}' != '{compare_item[field]}'"
-                            )
-
-            except KeyError as error:
-                exit_bug(
-                    "Failed to match existing entry with provided one: "
-                    f"{existing} <=> {sanitize_module_args(compare_item)}; "
-                    f"Error while comparing: {error}"
-                )
+        try:
+            for field in match_fields:
+                _matching.append(str(existing[field]) == str(compare_item[field]))
+
+                if module.params['debug']:
+                    if existing[field] != compare_item[field]:
+                        module.warn(
+                            f"NOT MATCHING: "
+                            f"'{existing[field]}' != '{compare_item[field]}'"
+                        )
+
+        except KeyError as error:
+            exit_bug(
+                "Failed to match existing entry with provided one: "
+                f"{existing} <=> {sanitize_module_args(compare_item)}; "
+                f"Error while comparing: {error}"
+            )
 
-            if all(_matching):
-                matching = existing
-                break
+        if all(_matching):
+            matching = existing
+            break
 
     return matching
 
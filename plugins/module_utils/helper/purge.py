@@ -1,28 +1,88 @@
 from ansible.module_utils.basic import AnsibleModule
 
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler import \
+    ModuleSoftError, ModuleFailure
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import parallel_map
 
-def purge(
+
+def _purge_item(module: AnsibleModule, item_to_purge: dict, obj_func) -> bool:
+    # returns if an enabled item got disabled
+    _obj = obj_func(item_to_purge)
+    _obj.exists = True
+
+    if module.params['action'] == 'delete':
+        _obj.delete()
+        return False
+
+    if _obj.b.is_enabled():
+        _obj.b.disable()
+        return True
+
+    return False
+
+
+def purge_items(
         module: AnsibleModule, result: dict,
-        item_to_purge: dict, diff_param: str, obj_func
-) -> None:
+        items_to_purge: list, diff_param: str, obj_func, max_parallel: int = 1,
+) -> list:
+    # all targets are collected first; the delete/disable calls are sent in parallel over the session of 'obj_func'
+    #   items that fail softly (per example 'in use') are skipped and returned
+    if len(items_to_purge) == 0:
+        return []
+
     result['changed'] = True
 
     if module.params['action'] == 'delete':
-        result['diff']['before'][item_to_purge[diff_param]] = item_to_purge
-        result['diff']['after'][item_to_purge[diff_param]] = None
+        for item in items_to_purge:
+            result['diff']['before'][item[diff_param]] = item
+            result['diff']['after'][item[diff_param]] = None
 
-    if not module.check_mode:
-        _obj = obj_func(item_to_purge)
-        _obj.exists = True
+    if module.check_mode:
+        return []
 
-        if module.params['action'] == 'delete':
-            _obj.delete()
+    def _purge(item: dict) -> tuple:
+        # returns if the item got disabled and the error of hard failures
+        try:
+            return _purge_item(module=module, item_to_purge=item, obj_func=obj_func), None
 
-        else:
-            if _obj.b.is_enabled():
-                result['diff']['before'][item_to_purge[diff_param]] = {'enabled': True}
-                result['diff']['after'][item_to_purge[diff_param]] = {'enabled': False}
-                _obj.b.disable()
+        except ModuleSoftError:
+            return None, None
+
+        except ModuleFailure as error:
+            return None, error.msg
+
+    failed = []
+    errors = {}
+
+    for item, (disabled, error) in zip(
+            items_to_purge,
+            parallel_map(func=_purge, items=items_to_purge, max_parallel=max_parallel, module=module),
+    ):
+        if disabled is None:
+            if error is None:
+                failed.append(item[diff_param])
+
+            else:
+                errors[item[diff_param]] = error
+
+            result['diff']['before'].pop(item[diff_param], None)
+            result['diff']['after'].pop(item[diff_param], None)
+
+        elif disabled:
+            result['diff']['before'][item[diff_param]] = {'enabled': True}
+            result['diff']['after'][item[diff_param]] = {'enabled': False}
+
+    if len(failed) + len(errors) == len(items_to_purge):
+        result['changed'] = False
+
+    if len(failed) > 0:
+        module.warn(f"Failed to purge {len(failed)} of {len(items_to_purge)} entries: {failed}")
+
+    if len(errors) > 0:
+        # all other items were processed; the module is failed once by the calling thread
+        module.fail_json(f"Failed to purge {len(errors)} of {len(items_to_purge)} entries: {errors}", **result)
+
+    return failed
 
 
 def check_purge_filter(module: AnsibleModule, item: dict) -> bool:
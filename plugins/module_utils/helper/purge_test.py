@@ -0,0 +1,114 @@
+# pylint: disable=C0415
+import pytest
+
+
+class ModuleFailed(Exception):
+    pass
+
+
+class DummyModule:
+    def __init__(self, action: str):
+        self.params = {'action': action}
+        self.check_mode = False
+        self.warnings = []
+
+    def warn(self, msg: str):
+        self.warnings.append(msg)
+
+    def fail_json(self, msg: str, **kwargs):
+        del kwargs
+        raise ModuleFailed(msg)
+
+
+class DummyBase:
+    def __init__(self, item: dict):
+        self.item = item
+
+    def is_enabled(self) -> bool:
+        return self.item['enabled']
+
+    def disable(self) -> None:
+        self.item['enabled'] = False
+
+
+class DummyObj:
+    def __init__(self, item: dict, module: DummyModule = None):
+        self.item = item
+        self.m = module
+        self.exists = False
+        self.b = DummyBase(item)
+
+    def delete(self) -> None:
+        from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler import ModuleSoftError
+
+        if self.item['in_use']:
+            raise ModuleSoftError
+
+        if self.item.get('broken', False):
+            self.m.fail_json(f"Unable to delete '{self.item['name']}'")
+
+        self.item['deleted'] = True
+
+
+def _items() -> list:
+    return [{'name': f'a{i}', 'enabled': i % 2 == 0, 'in_use': i == 3} for i in range(6)]
+
+
+@pytest.mark.parametrize('action', ['delete', 'disable'])
+def test_purge_items(action: str):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.purge import purge_items
+
+    module = DummyModule(action=action)
+    result = {'changed': False, 'diff': {'before': {}, 'after': {}}}
+    items = _items()
+    failed = purge_items(
+        module=module, result=result, items_to_purge=items, diff_param='name', obj_func=DummyObj, max_parallel=3,
+    )
+
+    assert result['changed']
+
+    if action == 'delete':
+        assert failed == ['a3']
+        assert len(module.warnings) == 1
+        assert [item['name'] for item in items if item.get('deleted')] == ['a0', 'a1', 'a2', 'a4', 'a5']
+        assert set(result['diff']['before']) == {'a0', 'a1', 'a2', 'a4', 'a5'}
+
+    else:
+        assert failed == []
+        assert not any(item['enabled'] for item in items)
+        assert result['diff']['after'] == {name: {'enabled': False} for name in ['a0', 'a2', 'a4']}
+
+
+def test_purge_items_all_failed():
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.purge import purge_items
+
+    result = {'changed': False, 'diff': {'before': {}, 'after': {}}}
+    items = [{'name': 'a', 'enabled': True, 'in_use': True}]
+    purge_items(
+        module=DummyModule(action='delete'), result=result, items_to_purge=items, diff_param='name',
+        obj_func=DummyObj,
+    )
+
+    assert not result['changed']
+    assert result['diff'] == {'before': {}, 'after': {}}
+
+
+@pytest.mark.parametrize('max_parallel', [1, 3])
+def test_purge_items_fail(max_parallel: int):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.purge import purge_items
+
+    module = DummyModule(action='delete')
+    result = {'changed': False, 'diff': {'before': {}, 'after': {}}}
+    items = _items()
+    items[1]['broken'] = True
+
+    # the hard failure does not stop the other deletions; the module is failed once afterwards
+    with pytest.raises(ModuleFailed, match="1 of 6 entries.*Unable to delete 'a1'"):
+        purge_items(
+            module=module, result=result, items_to_purge=items, diff_param='name',
+            obj_func=lambda item: DummyObj(item=item, module=module), max_parallel=max_parallel,
+        )
+
+    assert [item['name'] for item in items if item.get('deleted')] == ['a0', 'a2', 'a4', 'a5']
+    assert len(module.warnings) == 1
+    assert set(result['diff']['before']) == {'a0', 'a2', 'a4', 'a5'}
@@ -0,0 +1,110 @@
+from fcntl import flock, LOCK_EX, LOCK_UN
+from hashlib import sha256
+from json import dumps as json_dumps
+from json import loads as json_loads
+from json import JSONDecodeError
+from pathlib import Path
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import RELOAD_STATE_PATH
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import profile_count
+
+RELOAD_FIELDS = ('module', 'controller', 'command')
+
+
+def reload_deferred(module: AnsibleModule) -> bool:
+    return module.params.get('reload_defer', False) is True
+
+
+class ReloadState:
+    # pending reloads of a firewall; shared by all module-runs (forks) on the controller
+    #   every distinct reload (module/controller/command) is only registered once
+
+    def __init__(self, module: AnsibleModule, path: str = RELOAD_STATE_PATH):
+        self.path = Path(path)
+        self.path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        prefix = sha256(
+            f"{module.params['firewall']}:{module.params['api_port']}".encode('utf-8')
+        ).hexdigest()[:16]
+        self.file = self.path / f'{prefix}.json'
+        self._lock_file = self.path / f'{prefix}.lock'
+
+    def _locked(self, func, *args):
+        with open(self._lock_file, 'a', encoding='utf-8') as lock:
+            flock(lock, LOCK_EX)
+
+            try:
+                return func(*args)
+
+            finally:
+                flock(lock, LOCK_UN)
+
+    def _read(self) -> list:
+        try:
+            with open(self.file, 'r', encoding='utf-8') as f:
+                return json_loads(f.read())
+
+        except (OSError, JSONDecodeError):
+            return []
+
+    def _write(self, pending: list) -> None:
+        with open(self.file, 'w', encoding='utf-8') as f:
+            f.write(json_dumps(pending))
+
+    def _add(self, reloads: list) -> None:
+        pending = self._read()
+
+        for cnf in reloads:
+            entry = {k: cnf[k] for k in RELOAD_FIELDS}
+            if entry not in pending:
+                pending.append(entry)
+
+            else:
+                profile_count('reload_coalesced')
+
+        self._write(pending)
+
+    def _pop(self) -> list:
+        pending = self._read()
+        self._write([])
+        return pending
+
+    def add(self, cnf: dict) -> None:
+        self._locked(self._add, [cnf])
+
+    def pending(self) -> list:
+        return self._locked(self._read)
+
+    def pop(self) -> list:
+        # reloads registered while flushing will be kept for the next flush
+        return self._locked(self._pop)
+
+    def restore(self, reloads: list) -> None:
+        self._locked(self._add, reloads)
+
+
+def defer_reload(module: AnsibleModule, cnf: dict) -> None:
+    ReloadState(module=module).add(cnf)
+
+
+def flush_reloads(module: AnsibleModule, session, path: str = RELOAD_STATE_PATH) -> list:
+    state = ReloadState(module=module, path=path)
+
+    if module.check_mode:
+        return state.pending()
+
+    reloads = state.pop()
+    done = 0
+
+    try:
+        for cnf in reloads:
+            session.post({**cnf, 'params': []})
+            done += 1
+
+    finally:
+        if done < len(reloads):
+            # keep the ones that were not executed so a later flush can retry them
+            state.restore(reloads[done:])
+
+    return reloads
@@ -0,0 +1,71 @@
+# pylint: disable=C0415
+from pathlib import Path
+
+import pytest
+
+
+class DummyModule:
+    def __init__(self, firewall: str, check_mode: bool = False):
+        self.params = {'firewall': firewall, 'api_port': 443, 'reload_defer': True}
+        self.check_mode = check_mode
+
+
+class DummySession:
+    def __init__(self, fail_on: str = None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    def post(self, cnf: dict) -> dict:
+        if cnf['command'] == self.fail_on:
+            raise ConnectionError
+
+        self.calls.append(f"{cnf['module']}/{cnf['controller']}/{cnf['command']}")
+        return {}
+
+
+def _reload(module: str, command: str = 'reconfigure') -> dict:
+    return {'module': module, 'controller': 'service', 'command': command, 'params': []}
+
+
+def test_reload_coalesce(tmp_path: Path):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.reload import \
+        ReloadState, flush_reloads
+
+    module = DummyModule(firewall='fw1')
+    state = ReloadState(module=module, path=tmp_path)
+
+    for _ in range(30):
+        state.add(_reload('unbound'))
+
+    state.add(_reload('trafficshaper', 'flushreload'))
+    ReloadState(module=DummyModule(firewall='fw2'), path=tmp_path).add(_reload('unbound'))
+    assert len(state.pending()) == 2
+
+    check = flush_reloads(module=DummyModule(firewall='fw1', check_mode=True), session=DummySession(), path=tmp_path)
+    assert len(check) == 2
+
+    session = DummySession()
+    flush_reloads(module=module, session=session, path=tmp_path)
+    assert session.calls == ['unbound/service/reconfigure', 'trafficshaper/service/flushreload']
+    assert len(state.pending()) == 0
+
+    # other firewalls are not affected
+    session = DummySession()
+    flush_reloads(module=DummyModule(firewall='fw2'), session=session, path=tmp_path)
+    assert session.calls == ['unbound/service/reconfigure']
+
+
+def test_reload_flush_failure(tmp_path: Path):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.reload import \
+        ReloadState, flush_reloads
+
+    module = DummyModule(firewall='fw1')
+    state = ReloadState(module=module, path=tmp_path)
+    state.add(_reload('unbound'))
+    state.add(_reload('ids', 'reloadRules'))
+    state.add(_reload('bind'))
+
+    with pytest.raises(ConnectionError):
+        flush_reloads(module=module, session=DummySession(fail_on='reloadRules'), path=tmp_path)
+
+    assert [r['module'] for r in state.pending()] == ['ids', 'bind']
@@ -0,0 +1,84 @@
+from random import uniform
+from threading import Lock
+
+import httpx
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import profile_count
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+RETRY_EXCEPTIONS = (
+    httpx.ConnectTimeout, httpx.ConnectError, httpx.ReadTimeout, httpx.WriteTimeout, httpx.PoolTimeout,
+    httpx.RemoteProtocolError,
+)
+RETRY_READ_COMMANDS = ('get', 'search')
+RETRY_BACKOFF_MAX = 10.0  # seconds
+RETRY_BUDGET = 10  # retries per session; a firewall that keeps failing should not stall the whole run
+
+
+class RetryPolicy:
+    # exponential backoff with full jitter
+    #   read-only calls are retried by default; mutating calls only if enabled as they might have been applied
+    #   although the response got lost
+
+    def __init__(
+            self, retries: int = 0, backoff: float = 0.5, mutating: bool = False,
+            budget: int = RETRY_BUDGET, backoff_max: float = RETRY_BACKOFF_MAX,
+    ):
+        self.retries = max(0, retries)
+        self.backoff = max(0.0, backoff)
+        self.backoff_max = backoff_max
+        self.mutating = mutating
+        self.budget = budget
+        self._lock = Lock()
+
+    @classmethod
+    def from_module(cls, module: AnsibleModule):
+        return cls(
+            retries=module.params.get('api_request_retries', 0) or 0,
+            backoff=module.params.get('api_retry_backoff', 0.5) or 0.0,
+            mutating=module.params.get('api_retry_mutating', False) is True,
+        )
+
+    def applies(self, method: str, cnf: dict) -> bool:
+        if self.retries == 0:
+            return False
+
+        if method == 'GET' or cnf['command'].startswith(RETRY_READ_COMMANDS):
+            return True
+
+        return self.mutating
+
+    def should_retry(self, attempt: int, response: httpx.Response = None, error: Exception = None) -> bool:
+        if attempt >= self.retries:
+            return False
+
+        if error is not None:
+            retry = isinstance(error, RETRY_EXCEPTIONS)
+
+        else:
+            retry = response.status_code in RETRY_STATUS
+
+        if not retry:
+            return False
+
+        with self._lock:
+            if self.budget <= 0:
+                profile_count('api_retry_budget_exhausted')
+                return False
+
+            self.budget -= 1
+
+        profile_count('api_retry')
+        return True
+
+    def delay(self, attempt: int, response: httpx.Response = None) -> float:
+        if response is not None and 'retry-after' in response.headers:
+            try:
+                return min(float(response.headers['retry-after']), self.backoff_max)
+
+            except ValueError:
+                pass
+
+        return uniform(0, min(self.backoff_max, self.backoff * (2 ** attempt)))
@@ -0,0 +1,41 @@
+# pylint: disable=C0415
+import pytest
+
+
+def _policy(**kwargs):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.retry import RetryPolicy
+    return RetryPolicy(**kwargs)
+
+
+@pytest.mark.parametrize('method, command, mutating, expected', [
+    ('GET', 'get', False, True),
+    ('POST', 'searchItem', False, True),
+    ('POST', 'setItem', False, False),
+    ('POST', 'reconfigure', True, True),
+])
+def test_applies(method: str, command: str, mutating: bool, expected: bool):
+    assert _policy(retries=2, mutating=mutating).applies(method=method, cnf={'command': command}) == expected
+    assert not _policy(retries=0, mutating=mutating).applies(method=method, cnf={'command': command})
+
+
+def test_should_retry():
+    import httpx
+
+    policy = _policy(retries=2, budget=3)
+    assert policy.should_retry(attempt=0, response=httpx.Response(503))
+    assert policy.should_retry(attempt=1, response=httpx.Response(429))
+    assert not policy.should_retry(attempt=2, response=httpx.Response(503))
+    assert not policy.should_retry(attempt=0, response=httpx.Response(400))
+    assert not policy.should_retry(attempt=0, error=ValueError())
+    assert policy.should_retry(attempt=0, error=httpx.ReadTimeout('timeout'))
+    # budget is used up
+    assert not policy.should_retry(attempt=0, response=httpx.Response(503))
+
+
+def test_delay():
+    import httpx
+
+    policy = _policy(retries=5, backoff=1.0, backoff_max=4.0)
+    assert all(0 <= policy.delay(attempt=a) <= min(4.0, 2 ** a) for a in range(5) for _ in range(20))
+    assert policy.delay(attempt=0, response=httpx.Response(429, headers={'Retry-After': '2'})) == 2.0
+    assert policy.delay(attempt=0, response=httpx.Response(429, headers={'Retry-After': '60'})) == 4.0
@@ -1,7 +1,6 @@
 from ansible.module_utils.basic import AnsibleModule
 
-from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import \
-    get_matching
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.index import MatchingIndex
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.rule import \
      RULE_DEFAULTS
 
@@ -40,7 +39,8 @@ def validate_values(error_func, module: AnsibleModule, cnf: dict) -> None:
             )
 
 
-def check_purge_configured(module: AnsibleModule, existing_rule: dict) -> bool:
+def configured_rules_index(module: AnsibleModule) -> MatchingIndex:
+    # built once per purge-run; the existing rules are looked-up in it
     configured_rules = []
 
     for rule_key, rule_config in module.params['rules'].items():
@@ -55,7 +55,13 @@ def check_purge_configured(module: AnsibleModule, existing_rule: dict) -> bool:
         rule_config[module.params['key_field']] = rule_key
         configured_rules.append(rule_config)
 
-    return get_matching(
-        module=module, existing_items=configured_rules,
-        compare_item=existing_rule, match_fields=module.params['match_fields'],
+    return MatchingIndex(existing_items=configured_rules)
+
+
+def check_purge_configured(module: AnsibleModule, existing_rule: dict, configured: MatchingIndex = None) -> bool:
+    if configured is None:
+        configured = configured_rules_index(module)
+
+    return configured.get(
+        module=module, compare_item=existing_rule, match_fields=module.params['match_fields'],
     ) is None
@@ -0,0 +1,132 @@
+from json import dumps as json_dumps
+from json import loads as json_loads
+from json import JSONDecodeError
+from pathlib import Path
+from threading import Lock
+from time import time
+from inspect import currentframe
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import \
+    DEBUG_CONFIG
+
+TRACE_PERCENTILES = (50, 95, 99)
+TRACE_SKIP_PATHS = ('/module_utils/base/', '/module_utils/helper/')  # generic code; not the caller we look for
+_TRACE_LOCK = Lock()
+
+
+def trace_enabled(module: AnsibleModule) -> bool:
+    return module.params.get('api_trace', False) is True
+
+
+def trace_file() -> Path:
+    return Path(DEBUG_CONFIG['path_log']) / DEBUG_CONFIG['log_api_trace']
+
+
+def _trace_caller() -> (str, None):
+    # class of the first object outside the generic api/base code that issued the request
+    frame = currentframe()
+
+    while frame is not None:
+        if 'self' in frame.f_locals and \
+                not any(p in frame.f_code.co_filename.replace('\\', '/') for p in TRACE_SKIP_PATHS):
+            return type(frame.f_locals['self']).__name__
+
+        frame = frame.f_back
+
+    return None
+
+
+def trace_api(
+        module: AnsibleModule, method: str, cnf: dict, status: (int, None), size: int, took: float,
+        retries: int = 0, error: str = None,
+) -> None:
+    entry = {
+        'time': round(time(), 3),
+        'module': getattr(module, '_name', None),
+        'class': _trace_caller(),
+        'method': method,
+        'endpoint': f"{cnf['module']}/{cnf['controller']}/{cnf['command']}",
+        'status': status,
+        'bytes': size,
+        'ms': round(took * 1000, 3),
+        'retries': retries,
+        'error': error,
+    }
+
+    log_file = trace_file()
+
+    with _TRACE_LOCK:
+        if not log_file.parent.exists():
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+
+        # one line per request; parallel module-runs can append to the same file
+        with open(log_file, 'a', encoding='utf-8') as log:
+            log.write(json_dumps(entry) + '\n')
+
+
+def load_trace(path: (str, Path)) -> list:
+    entries = []
+
+    with open(path, 'r', encoding='utf-8') as log:
+        for line in log:
+            try:
+                entries.append(json_loads(line))
+
+            except JSONDecodeError:
+                continue
+
+    return entries
+
+
+def percentile(values: list, pct: int) -> float:
+    # nearest-rank; values need to be sorted
+    if len(values) == 0:
+        return 0.0
+
+    rank = max(1, -(-pct * len(values) // 100))
+    return values[rank - 1]
+
+
+def aggregate_trace(entries: list) -> dict:
+    latencies = {}
+    stats = {}
+
+    for entry in entries:
+        endpoint = f"{entry['method']} {entry['endpoint']}"
+
+        if endpoint not in stats:
+            latencies[endpoint] = []
+            stats[endpoint] = {'calls': 0, 'errors': 0, 'retries': 0, 'bytes': 0}
+
+        latencies[endpoint].append(entry['ms'])
+        stats[endpoint]['calls'] += 1
+        stats[endpoint]['retries'] += entry.get('retries', 0)
+        stats[endpoint]['bytes'] += entry.get('bytes', 0)
+
+        if entry.get('error') is not None or entry.get('status') is None or entry['status'] >= 400:
+            stats[endpoint]['errors'] += 1
+
+    for endpoint, values in latencies.items():
+        values.sort()
+
+        for pct in TRACE_PERCENTILES:
+            stats[endpoint][f'p{pct}'] = percentile(values=values, pct=pct)
+
+        stats[endpoint]['max'] = values[-1]
+
+    return stats
+
+
+def format_trace_table(stats: dict) -> str:
+    columns = ['calls', 'errors', 'retries', 'bytes'] + [f'p{pct}' for pct in TRACE_PERCENTILES] + ['max']
+    width = max([len('endpoint')] + [len(endpoint) for endpoint in stats])
+    lines = [f"{'endpoint':<{width}} | " + ' | '.join(f'{c:>10}' for c in columns)]
+    lines.append('-' * len(lines[0]))
+
+    # slowest endpoints first
+    for endpoint, values in sorted(stats.items(), key=lambda e: e[1][f'p{TRACE_PERCENTILES[1]}'], reverse=True):
+        lines.append(f'{endpoint:<{width}} | ' + ' | '.join(f'{values[c]:>10}' for c in columns))
+
+    return '\n'.join(lines)
@@ -0,0 +1,41 @@
+# pylint: disable=C0415
+import pytest
+
+
+def _entry(endpoint: str, ms: float, status: int = 200, method: str = 'GET') -> dict:
+    return {
+        'method': method, 'endpoint': endpoint, 'status': status, 'bytes': 10, 'ms': ms, 'retries': 0,
+        'error': None,
+    }
+
+
+@pytest.mark.parametrize('values, pct, expected', [
+    ([], 50, 0.0),
+    ([5], 99, 5),
+    ([1, 2, 3, 4], 50, 2),
+    (list(range(1, 101)), 95, 95),
+    (list(range(1, 101)), 99, 99),
+])
+def test_percentile(values: list, pct: int, expected: float):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.trace import percentile
+    assert percentile(values=values, pct=pct) == expected
+
+
+def test_aggregate_trace():
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.trace import \
+        aggregate_trace, format_trace_table
+
+    entries = [_entry('firewall/alias/get', ms=float(i)) for i in range(1, 21)]
+    entries.append(_entry('firewall/alias/setItem', ms=300.0, status=500, method='POST'))
+    stats = aggregate_trace(entries)
+
+    assert stats['GET firewall/alias/get']['calls'] == 20
+    assert stats['GET firewall/alias/get']['p50'] == 10.0
+    assert stats['GET firewall/alias/get']['p95'] == 19.0
+    assert stats['GET firewall/alias/get']['max'] == 20.0
+    assert stats['GET firewall/alias/get']['errors'] == 0
+    assert stats['POST firewall/alias/setItem']['errors'] == 1
+
+    table = format_trace_table(stats).splitlines()
+    assert len(table) == 4
+    assert table[2].startswith('POST firewall/alias/setItem')  # slowest first
@@ -4,6 +4,8 @@ from io import StringIO
 from datetime import datetime
 from pathlib import Path
 from typing import Callable
+from threading import Lock, local
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
 from inspect import stack as inspect_stack
 from inspect import getfile as inspect_getfile
 
@@ -11,6 +13,107 @@ from httpx import ConnectError, ConnectTimeout
 
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import \
     DEBUG_CONFIG
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler import ModuleFailure
+
+# counters that get added to the profiling output
+PROFILE_COUNTERS = {}
+_PROFILE_COUNTERS_LOCK = Lock()
+
+
+def profile_count(counter: str, value: int = 1) -> None:
+    with _PROFILE_COUNTERS_LOCK:
+        if counter not in PROFILE_COUNTERS:
+            PROFILE_COUNTERS[counter] = 0
+
+        PROFILE_COUNTERS[counter] += value
+
+
+_WORKER = local()
+_FAIL_GUARD_LOCK = Lock()
+
+
+def _guard_fail(module) -> None:
+    # workers must not exit the module (every call would print its own result); in them 'fail_json' raises instead
+    with _FAIL_GUARD_LOCK:
+        if vars(module).get('_fail_guarded', False):
+            return
+
+        fail_json = module.fail_json
+
+        def _fail_json(msg: str, **kwargs) -> None:
+            if getattr(_WORKER, 'active', False):
+                raise ModuleFailure(msg=msg, kwargs=kwargs)
+
+            fail_json(msg, **kwargs)
+
+        module.fail_json = _fail_json
+        module._fail_guarded = True  # pylint: disable=W0212
+
+
+def _run_worker(func: Callable, item):
+    _WORKER.active = True
+    return func(item)
+
+
+def _fail_once(module, error: Exception) -> None:
+    if isinstance(error, ModuleFailure) and module is not None:
+        module.fail_json(error.msg, **error.kwargs)
+
+    raise error
+
+
+def parallel_map(func: Callable, items: list, max_parallel: int = 1, module=None) -> list:
+    # apply the function to all items using a bounded thread-pool; the results keep the order of the items
+    #   errors of the workers are raised in the calling thread once all of them are done or cancelled;
+    #   'fail_json' of the provided module is called only once - by the calling thread
+    #   the function may catch the ModuleFailure to collect per-item errors
+    if module is not None:
+        _guard_fail(module)
+
+    if max_parallel <= 1 or len(items) <= 1:
+        if module is None:
+            return [func(item) for item in items]
+
+        # same error-handling as in the workers
+        was_worker = getattr(_WORKER, 'active', False)
+        _WORKER.active = True
+
+        try:
+            return [func(item) for item in items]
+
+        except ModuleFailure as error:
+            failure = error
+
+        finally:
+            _WORKER.active = was_worker
+
+        _fail_once(module=module, error=failure)
+
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(items))) as pool:
+        futures = [pool.submit(_run_worker, func, item) for item in items]
+        wait(futures, return_when=FIRST_EXCEPTION)
+
+        # do not keep on processing if one of the items failed
+        for future in futures:
+            future.cancel()
+
+        wait(futures)
+
+    for future in futures:
+        if not future.cancelled() and future.exception() is not None:
+            _fail_once(module=module, error=future.exception())
+
+    return [future.result() for future in futures]
+
+
+def _profile_counters_summary() -> str:
+    with _PROFILE_COUNTERS_LOCK:
+        if len(PROFILE_COUNTERS) == 0:
+            return ''
+
+        return 'Counters: ' + ', '.join(
+            f'{counter}={value}' for counter, value in sorted(PROFILE_COUNTERS.items())
+        )
 
 
 def profiler(
@@ -39,6 +142,10 @@ def profiler(
     Stats(_, stream=result).sort_stats(sort).print_stats(show_top_n)
     cleaned_result = result.getvalue().splitlines()[:-1]
     del cleaned_result[1:5]
+    counters = _profile_counters_summary()
+    if counters != '':
+        cleaned_result.append(counters)
+
     cleaned_result = '\n'.join(cleaned_result)
 
     if module_name is not None:
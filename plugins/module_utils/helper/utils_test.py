@@ -0,0 +1,88 @@
+# pylint: disable=C0415
+from json import dumps as json_dumps
+from threading import Lock
+from time import sleep
+
+import pytest
+
+
+class DummyModule:
+    # like the AnsibleModule - the result is printed & the process exits
+    def __init__(self):
+        self.params = {}
+
+    def fail_json(self, msg: str, **kwargs):
+        print(json_dumps({'failed': True, 'msg': msg, **kwargs}))
+        raise SystemExit(1)
+
+
+def test_parallel_map():
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import parallel_map
+
+    assert parallel_map(func=lambda i: i * 2, items=list(range(10)), max_parallel=5) == [i * 2 for i in range(10)]
+    assert not parallel_map(func=lambda i: i, items=[], max_parallel=5)
+
+
+def test_parallel_map_fail(capsys):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import parallel_map
+
+    m = DummyModule()
+    done = []
+    lock = Lock()
+
+    def _fail(i: int) -> None:
+        sleep(0.01)
+        with lock:
+            done.append(i)
+
+        m.fail_json(f'failed {i}')
+
+    with pytest.raises(SystemExit):
+        parallel_map(func=_fail, items=[0, 1, 2], max_parallel=3, module=m)
+
+    # all workers are done before the module is failed once by the calling thread
+    assert sorted(done) == [0, 1, 2]
+    output = capsys.readouterr().out.strip().splitlines()
+    assert output == [json_dumps({'failed': True, 'msg': 'failed 0'})]
+
+    # outside of the workers the module fails as usual
+    with pytest.raises(SystemExit):
+        m.fail_json('main')
+
+    assert capsys.readouterr().out.strip() == json_dumps({'failed': True, 'msg': 'main'})
+
+
+def test_parallel_map_fail_sequential(capsys):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler import ModuleFailure
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import parallel_map
+
+    m = DummyModule()
+
+    def _collect(i: int) -> str:
+        try:
+            m.fail_json(f'failed {i}')
+
+        except ModuleFailure as error:
+            return error.msg
+
+    # the per-item failures can be collected the same way as in the workers
+    assert parallel_map(func=_collect, items=[0, 1], max_parallel=1, module=m) == ['failed 0', 'failed 1']
+    assert capsys.readouterr().out == ''
+
+    with pytest.raises(SystemExit):
+        parallel_map(func=m.fail_json, items=['failed'], max_parallel=1, module=m)
+
+    assert capsys.readouterr().out.strip() == json_dumps({'failed': True, 'msg': 'failed'})
+
+
+def test_parallel_map_error():
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import parallel_map
+
+    def _error(i: int) -> int:
+        if i == 1:
+            raise ValueError('invalid')
+
+        return i
+
+    with pytest.raises(ValueError, match='invalid'):
+        parallel_map(func=_error, items=[0, 1, 2], max_parallel=2, module=DummyModule())
@@ -7,6 +7,7 @@ from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.alias
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import \
     diff_remove_empty, ensure_list
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import Session
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.index import MatchingIndex
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.multi import \
     validate_single, convert_aliases
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.alias import Alias
@@ -17,6 +18,8 @@ def process(m: AnsibleModule, p: dict, r: dict, ) -> None:
     session = Session(module=m)
     meta_alias = Alias(module=m, session=session, result={})
     existing_aliases = meta_alias.get_existing()
+    # the existing entries were already simplified by 'get_existing'
+    existing_aliases_index = MatchingIndex(existing_items=existing_aliases)
 
     defaults = {}
     overrides = {
@@ -83,6 +86,7 @@ def process(m: AnsibleModule, p: dict, r: dict, ) -> None:
             )
             # save on requests
             alias.existing_entries = existing_aliases
+            alias.existing_index = existing_aliases_index
 
             alias.check()
             alias.process()
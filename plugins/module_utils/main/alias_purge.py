@@ -4,7 +4,7 @@ from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main im
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.alias import \
     check_purge_configured, builtin_alias
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.purge import \
-    purge, check_purge_filter
+    purge_items, check_purge_filter
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import Session
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.alias import Alias
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.rule import Rule
@@ -22,7 +22,7 @@ def process(m: AnsibleModule, p: dict, r: dict) -> None:
         if p['debug'] or p['output_info']:
             m.warn(f"Purging alias '{alias_to_purge['name']}'!")
 
-        if 'debug' not in aliases_to_purge:
+        if 'debug' not in alias_to_purge:
             alias_to_purge['debug'] = p['debug']
 
         _alias = Alias(
@@ -47,21 +47,15 @@ def process(m: AnsibleModule, p: dict, r: dict) -> None:
             is_unset(p['filters']):
         m.warn('Forced to purge ALL ALIASES!')
 
-        for alias in existing_aliases:
-            if not builtin_alias(name=alias['name']):
-                purge(
-                    module=m,
-                    result=r,
-                    diff_param='name',
-                    obj_func=obj_func,
-                    item_to_purge=alias,
-                )
+        aliases_to_purge = [alias for alias in existing_aliases if not builtin_alias(name=alias['name'])]
 
     else:
         # checking if existing alias should be purged
+        configured_aliases = set(p['aliases'].keys())
+
         for alias in existing_aliases:
             if not builtin_alias(name=alias['name']):
-                to_purge = check_purge_configured(module=m, existing_alias=alias)
+                to_purge = check_purge_configured(module=m, existing_alias=alias, configured=configured_aliases)
 
                 if to_purge:
                     to_purge = check_purge_filter(module=m, item=alias)
@@ -69,21 +63,20 @@ def process(m: AnsibleModule, p: dict, r: dict) -> None:
                 if to_purge:
                     if p['debug']:
                         m.warn(
-                            f"Existing alias '{alias[p['key_field']]}' "
+                            f"Existing alias '{alias['name']}' "
                             f"will be purged!"
                         )
 
                     aliases_to_purge.append(alias)
 
-        for alias in aliases_to_purge:
-            r['changed'] = True
-            purge(
-                module=m,
-                result=r,
-                diff_param='name',
-                obj_func=obj_func,
-                item_to_purge=alias,
-            )
+    purge_items(
+        module=m,
+        result=r,
+        diff_param='name',
+        obj_func=obj_func,
+        items_to_purge=aliases_to_purge,
+        max_parallel=meta_alias.b.max_parallel,
+    )
 
     if r['changed'] and p['reload']:
         meta_alias.reload()
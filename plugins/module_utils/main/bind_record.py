@@ -94,11 +94,17 @@ class Record(BaseModule):
                     'You may have to create it before managing its records.'
                 )
 
-            self.existing = get_multiple_matching(
-                module=self.m, existing_items=self.existing_entries,
-                compare_item=self.p, match_fields=self.p['match_fields'],
-                simplify_func=self.b.simplify_existing,
-            )
+            if self.existing_index is not None:
+                self.existing = self.existing_index.get_multiple(
+                    module=self.m, compare_item=self.p, match_fields=self.p['match_fields'],
+                )
+
+            else:
+                self.existing = get_multiple_matching(
+                    module=self.m, existing_items=self.existing_entries,
+                    compare_item=self.p, match_fields=self.p['match_fields'],
+                    simplify_func=self.b.simplify_cached,
+                )
 
             self.exists_rr = len(self.existing) > 1
             self.exists = len(self.existing) == 1
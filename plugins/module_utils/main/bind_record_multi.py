@@ -8,6 +8,7 @@ from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.bind_
     RECORD_MOD_ARGS, RECORD_DEFAULTS, RECORD_MOD_ARG_ALIASES
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import diff_remove_empty
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import Session
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.index import MatchingIndex
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.bind_record import Record
 
 # pylint: disable=R0912,R0914,R0915
@@ -17,6 +18,8 @@ def process(m: AnsibleModule, p: dict, r: dict) -> None:
     s = Session(module=m)
     meta_record = Record(module=m, session=s, result={})
     existing_records = meta_record.get_existing()
+    # the existing entries were already simplified by 'get_existing'
+    existing_records_index = MatchingIndex(existing_items=existing_records)
     existing_domains = meta_record.search_call_domains()
     existing_domain_mapping = {}
 
@@ -113,6 +116,7 @@ def process(m: AnsibleModule, p: dict, r: dict) -> None:
             )
             # save on requests
             record.existing_entries = existing_records
+            record.existing_index = existing_records_index
             record.existing_domains = existing_domains
             record.existing_domain_mapping = existing_domain_mapping
 
@@ -4,6 +4,7 @@ from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api impor
     Session
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import \
     validate_int_fields, is_ip, is_unset
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.index import link_index
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.cls import BaseModule
 
 
@@ -99,60 +100,45 @@ class Neighbor(BaseModule):
 
     def _find_links(self) -> None:
         links = {
-            'prefix-list-in': {
-                'found': False,
-                'existing': self.existing_prefixes,
-                'match_fields': {'name': 'prefix_list_in'}
-            },
-            'prefix-list-out': {
-                'found': False,
-                'existing': self.existing_prefixes,
-                'match_fields': {'name': 'prefix_list_out'}
-            },
-            'route-map-in': {
-                'found': False,
-                'existing': self.existing_maps,
-                'match_fields': {'name': 'route_map_in'}
-            },
-            'route-map-out': {
-                'found': False,
-                'existing': self.existing_maps,
-                'match_fields': {'name': 'route_map_out'}
-            },
+            'prefix-list-in': {'existing': self.existing_prefixes, 'field': 'prefix_list_in'},
+            'prefix-list-out': {'existing': self.existing_prefixes, 'field': 'prefix_list_out'},
+            'route-map-in': {'existing': self.existing_maps, 'field': 'route_map_in'},
+            'route-map-out': {'existing': self.existing_maps, 'field': 'route_map_out'},
         }
 
         for key, values in links.items():
-            value_name = values['match_fields']['name']
-            provided = not is_unset(self.p[value_name])
-            seq_uuid_mapping = {}
+            value_name = values['field']
 
-            if not provided:
+            if is_unset(self.p[value_name]):
                 continue
 
+            uuids = []
             if len(values['existing']) > 0:
-                for uuid, entry in values['existing'].items():
-                    matching = []
+                uuids = link_index(existing=values['existing']).get(str(self.p[value_name]), [])
 
-                    for api_field, ans_field in values['match_fields'].items():
-                        if not is_unset(self.p[ans_field]):
-                            matching.append(str(entry[api_field]) == str(self.p[ans_field]))
-
-                    if all(matching):
-                        self.p[value_name] = uuid
-                        values['found'] = True
-
-                        if 'seqnumber' in entry:
-                            seq_uuid_mapping[int(entry['seqnumber'])] = uuid
-
-            if not values['found']:
+            if len(uuids) == 0:
                 self.m.fail_json(
                     f"Provided {key} '{value_name}' was not found!"
                 )
 
+            seq_uuid_mapping = {
+                int(values['existing'][uuid]['seqnumber']): uuid
+                for uuid in uuids if 'seqnumber' in values['existing'][uuid]
+            }
+
             if len(seq_uuid_mapping) > 0:
                 # only the lowest prefix-list uuid is linkable - all others are just extensions of the first one
                 self.p[value_name] = seq_uuid_mapping[min(seq_uuid_mapping.keys())]
 
+            else:
+                if len(uuids) > 1:
+                    self.m.warn(
+                        f"Provided {key} '{self.p[value_name]}' matches multiple existing entries: {uuids} - "
+                        f"linking the last one '{uuids[-1]}'; you should make the names unique"
+                    )
+
+                self.p[value_name] = uuids[-1]
+
     def get_existing(self) -> list:
         existing = []
 
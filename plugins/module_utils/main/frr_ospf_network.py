@@ -68,10 +68,12 @@ class Network(BaseModule):
             self.b.find_single_link(
                 field='prefix_list_in',
                 existing=self.existing_prefixes,
+                unique=False,
             )
             self.b.find_single_link(
                 field='prefix_list_out',
                 existing=self.existing_prefixes,
+                unique=False,
             )
 
     def get_existing(self) -> list:
@@ -61,6 +61,7 @@ class RouteMap(BaseModule):
             self.b.find_multiple_links(
                 field='prefix_list',
                 existing=self.existing_prefixes,
+                unique=False,
             )
 
     def get_existing(self) -> list:
@@ -41,7 +41,7 @@ class Policy(BaseModule):
     }
     FIELDS_IGNORE = ['content']
     EXIST_ATTR = 'policy'
-    QUERY_MAX_RULES = 5000
+    QUERY_PAGE_SIZE = 5000
 
     def __init__(self, module: AnsibleModule, result: dict, session: Session = None):
         BaseModule.__init__(self=self, m=module, r=result, s=session)
@@ -85,11 +85,11 @@ class Policy(BaseModule):
     def _search_call(self) -> list:
         # NOTE: workaround for issue with incomplete response-data from 'get' endpoint:
         #   https://github.com/opnsense/core/issues/7094
-        existing = self.s.post(cnf={
+        existing = list(self.b.search_rows(cnf={
             **self.call_cnf,
             'command': self.CMDS['search'],
-            'data': {'current': 1, 'rowCount': self.QUERY_MAX_RULES, 'sort': self.FIELD_ID, 'searchPhrase': ''},
-        })['rows']
+            'data': {'sort': self.FIELD_ID, 'searchPhrase': ''},
+        }))
 
         if self.FIELD_ID in self.p:  # list module
             for policy in existing:
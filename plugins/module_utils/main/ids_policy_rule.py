@@ -31,7 +31,7 @@ class Rule(BaseModule):
         'int': ['sid'],
     }
     EXIST_ATTR = 'rule'
-    QUERY_MAX_RULES = 1000
+    QUERY_PAGE_SIZE = 1000
 
     def __init__(self, module: AnsibleModule, result: dict, session: Session = None):
         BaseModule.__init__(self=self, m=module, r=result, s=session)
@@ -45,14 +45,16 @@ class Rule(BaseModule):
         self.r['changed'] = self.r['diff']['before'] != self.r['diff']['after']
 
     def _search_call(self) -> list:
-        existing = self.s.post(cnf={
+        existing = []
+
+        for rule in self.b.search_rows(cnf={
             **self.call_cnf,
             'command': self.CMDS['search'],
-            'data': {'current': 1, 'rowCount': self.QUERY_MAX_RULES, 'sort': self.FIELD_ID},
-        })['rows']
+            'data': {'sort': self.FIELD_ID},
+        }):
+            existing.append(rule)
 
-        if self.FIELD_ID in self.p:  # list module
-            for rule in existing:
+            if self.FIELD_ID in self.p:  # list module
                 if int(rule[self.FIELD_ID]) == self.p[self.FIELD_ID]:
                     self.exists = True
                     self.rule['uuid'] = rule['uuid']
@@ -28,7 +28,7 @@ class Rule(BaseModule):
         'int': ['sid'],
     }
     EXIST_ATTR = 'rule'
-    QUERY_MAX_RULES = 5000
+    QUERY_PAGE_SIZE = 5000
 
     def __init__(self, module: AnsibleModule, result: dict, session: Session = None):
         BaseModule.__init__(self=self, m=module, r=result, s=session)
@@ -53,20 +53,24 @@ class Rule(BaseModule):
     def _search_call(self) -> list:
         # NOTE: workaround for issue with incomplete response-data from 'get' endpoint:
         #   https://github.com/opnsense/core/issues/7094
-        existing = self.s.post(cnf={
+        existing = []
+
+        for rule in self.b.search_rows(cnf={
             **self.call_cnf,
             'command': self.CMDS['search'],
-            'data': {'current': 1, 'rowCount': self.QUERY_MAX_RULES, 'sort': self.FIELD_PK},
-        })['rows']
+            'data': {'sort': self.FIELD_PK},
+        }):
+            existing.append(rule)
 
-        if self.FIELD_PK in self.p:  # list module
-            for rule in existing:
+            if self.FIELD_PK in self.p:  # list module
                 if rule[self.FIELD_PK] == self.p[self.FIELD_PK]:
                     self.exists = True
                     self.rule[self.FIELD_PK] = rule[self.FIELD_PK]
                     self.rule['enabled'] = rule['status'] == 'enabled'
                     self.rule['action'] = rule['action']
                     self.r['diff']['before'] = self.rule
+                    # the sid is unique - no need to pull the remaining pages
+                    break
 
         return existing
 
@@ -0,0 +1,237 @@
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.parsing.convert_bool import boolean
+
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import Session
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler import \
+    ModuleSoftError, ModuleFailure
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import to_digit
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import parallel_map
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.ids_rule import Rule
+
+IDS_RULE_FILTER_MAX = 20  # up to this many rules are looked-up using server-side filtering; else all are pulled once
+IDS_RULE_TOGGLE_CHUNK = 100  # sids per toggle-call; they are passed in the url
+IDS_RULE_ACTIONS = ['alert', 'drop']
+
+
+def _rule_state(rule: dict) -> dict:
+    return {'action': rule['action'], 'enabled': rule['status'] == 'enabled'}
+
+
+def _search_filtered(meta_rule: Rule, sids: set) -> dict:
+    # the search-phrase also matches other rules containing the sid (p.e. in their message); we only keep exact ones
+    def _search(sid: int) -> list:
+        return list(meta_rule.b.search_rows(cnf={
+            **meta_rule.call_cnf,
+            'command': meta_rule.CMDS['search'],
+            'data': {'sort': meta_rule.FIELD_PK, 'searchPhrase': str(sid)},
+        }))
+
+    existing = {}
+
+    # errors of the searches fail the module once - by the calling thread
+    for rows in parallel_map(
+            func=_search, items=sorted(sids), max_parallel=meta_rule.b.max_parallel, module=meta_rule.m,
+    ):
+        for rule in rows:
+            sid = int(rule[meta_rule.FIELD_PK])
+            if sid in sids:
+                existing[sid] = _rule_state(rule)
+
+    return existing
+
+
+def _search_all(meta_rule: Rule, sids: set) -> dict:
+    # no need to pull the remaining pages once all rules were found
+    existing = {}
+
+    for rule in meta_rule.b.search_rows(cnf={
+        **meta_rule.call_cnf,
+        'command': meta_rule.CMDS['search'],
+        'data': {'sort': meta_rule.FIELD_PK},
+    }):
+        sid = int(rule[meta_rule.FIELD_PK])
+        if sid in sids:
+            existing[sid] = _rule_state(rule)
+
+            if len(existing) == len(sids):
+                break
+
+    return existing
+
+
+def _configured_rules(m: AnsibleModule, p: dict) -> dict:
+    rules = {}
+
+    def _invalid(msg: str) -> None:
+        if p['fail_verification']:
+            m.fail_json(msg)
+
+        m.warn(msg)
+
+    for sid, rule in p['rules'].items():
+        if rule is None:
+            rule = {}
+
+        elif isinstance(rule, str):
+            # allowing only the action to be supplied
+            rule = {'action': rule}
+
+        if not isinstance(rule, dict):
+            _invalid(f"Got invalid config for rule '{sid}': '{rule}' - need a dict with 'action' and/or 'enabled'")
+            continue
+
+        try:
+            sid = int(sid)
+
+        except ValueError:
+            _invalid(f"Got invalid sid: '{sid}' - needs to be numeric")
+            continue
+
+        config = {
+            'action': rule.get('action', p['action']),
+            'enabled': rule.get('enabled', p['enabled']),
+        }
+
+        if config['action'] is not None and config['action'] not in IDS_RULE_ACTIONS:
+            _invalid(f"Got invalid action for rule '{sid}': '{config['action']}' - one of {IDS_RULE_ACTIONS}")
+            continue
+
+        if config['enabled'] is not None:
+            # the per-rule values are not validated by ansible
+            try:
+                config['enabled'] = boolean(config['enabled'], strict=True)
+
+            except TypeError:
+                _invalid(f"Got invalid state for rule '{sid}': '{config['enabled']}' - needs to be a boolean")
+                continue
+
+        rules[sid] = config
+
+    return rules
+
+
+def _apply(meta_rule: Rule, action_changes: dict, toggle_changes: dict) -> None:
+    def _set_action(sid: int) -> (str, None):
+        # returns the error; collected so all other rules are still changed
+        try:
+            meta_rule.s.post(cnf={
+                **meta_rule.call_cnf,
+                'command': meta_rule.CMDS['set'],
+                'params': [sid],
+                'data': {'action': action_changes[sid]},
+            })
+            return None
+
+        except (ModuleFailure, ModuleSoftError) as error:
+            return str(error)
+
+    # the action can only be set per rule
+    errors = {
+        sid: error for sid, error in zip(
+            action_changes,
+            parallel_map(
+                func=_set_action, items=list(action_changes), max_parallel=meta_rule.b.max_parallel,
+                module=meta_rule.m,
+            ),
+        ) if error is not None
+    }
+
+    def _toggle(chunk: tuple) -> (str, None):
+        enabled, sids = chunk
+
+        try:
+            meta_rule.s.post(cnf={
+                **meta_rule.call_cnf,
+                'command': meta_rule.CMDS['toggle'],
+                'params': [','.join(sids), to_digit(enabled)],
+            })
+            return None
+
+        except (ModuleFailure, ModuleSoftError) as error:
+            return str(error)
+
+    # the enabled-state of many rules can be changed at once
+    chunks = [
+        (enabled, sids[idx:idx + IDS_RULE_TOGGLE_CHUNK])
+        for enabled, sids in toggle_changes.items()
+        for idx in range(0, len(sids), IDS_RULE_TOGGLE_CHUNK)
+    ]
+    toggle_errors = {}
+
+    for (_, sids), error in zip(chunks, parallel_map(func=_toggle, items=chunks, module=meta_rule.m)):
+        if error is not None:
+            toggle_errors.update({int(sid): error for sid in sids})
+
+    msgs = []
+    if len(errors) > 0:
+        msgs.append(f"Failed to set the action of rules: {errors}")
+
+    if len(toggle_errors) > 0:
+        msgs.append(f"Failed to set the state of rules: {toggle_errors}")
+
+    if len(msgs) > 0:
+        meta_rule.m.fail_json(' | '.join(msgs))
+
+
+def _changes(m: AnsibleModule, p: dict, r: dict, rules: dict, existing: dict) -> tuple:
+    action_changes = {}
+    toggle_changes = {True: [], False: []}
+
+    for sid, rule in rules.items():
+        if sid not in existing:
+            continue
+
+        before = existing[sid]
+        after = {k: before[k] if v is None else v for k, v in rule.items()}
+
+        if after == before:
+            continue
+
+        if p['debug'] or p['output_info']:
+            m.warn(f"Changing rule: '{sid} => {after}'")
+
+        r['changed'] = True
+        r['diff']['before'][sid] = before
+        r['diff']['after'][sid] = after
+
+        if after['action'] != before['action']:
+            action_changes[sid] = after['action']
+
+        if after['enabled'] != before['enabled']:
+            toggle_changes[after['enabled']].append(str(sid))
+
+    return action_changes, toggle_changes
+
+
+def process(m: AnsibleModule, p: dict, r: dict) -> None:
+    rules = _configured_rules(m=m, p=p)
+    if len(rules) == 0:
+        return
+
+    s = Session(module=m)
+    meta_rule = Rule(module=m, result=r, session=s)
+    sids = set(rules)
+
+    if len(sids) <= IDS_RULE_FILTER_MAX:
+        existing = _search_filtered(meta_rule=meta_rule, sids=sids)
+
+    else:
+        existing = _search_all(meta_rule=meta_rule, sids=sids)
+
+    missing = sorted(sids - set(existing))
+    if len(missing) > 0:
+        msg = f"The provided rules were not found: {missing}"
+        if p['fail_processing']:
+            m.fail_json(msg)
+
+        m.warn(msg)
+
+    action_changes, toggle_changes = _changes(m=m, p=p, r=r, rules=rules, existing=existing)
+
+    if r['changed'] and not m.check_mode:
+        _apply(meta_rule=meta_rule, action_changes=action_changes, toggle_changes=toggle_changes)
+
+    if r['changed'] and p['reload']:
+        meta_rule.reload()
+
+    s.close()
@@ -29,7 +29,7 @@ class Ruleset(BaseModule):
         'bool': ['enabled'],
     }
     EXIST_ATTR = 'ruleset'
-    QUERY_MAX_RULES = 1000
+    QUERY_PAGE_SIZE = 1000
 
     def __init__(self, module: AnsibleModule, result: dict, session: Session = None):
         BaseModule.__init__(self=self, m=module, r=result, s=session)
@@ -55,11 +55,11 @@ class Ruleset(BaseModule):
     def _search_call(self) -> list:
         # NOTE: workaround for issue with incomplete response-data from 'get' endpoint:
         #   https://github.com/opnsense/core/issues/7094
-        existing = self.s.post(cnf={
+        existing = list(self.b.search_rows(cnf={
             **self.call_cnf,
             'command': self.CMDS['search'],
-            'data': {'current': 1, 'rowCount': self.QUERY_MAX_RULES, 'sort': self.FIELD_PK, 'searchPhrase': ''},
-        })['rows']
+            'data': {'sort': self.FIELD_PK, 'searchPhrase': ''},
+        }))
 
         if self.FIELD_ID in self.p:  # list module
             for ruleset in existing:
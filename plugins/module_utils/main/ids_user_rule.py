@@ -34,7 +34,7 @@ class Rule(BaseModule):
         'select': ['action'],
     }
     EXIST_ATTR = 'rule'
-    QUERY_MAX_RULES = 5000
+    QUERY_PAGE_SIZE = 5000
 
     def __init__(self, module: AnsibleModule, result: dict, session: Session = None):
         BaseModule.__init__(self=self, m=module, r=result, s=session)
@@ -49,11 +49,11 @@ class Rule(BaseModule):
         return self._search_call()
 
     def _search_call(self) -> list:
-        existing = self.s.post(cnf={
+        existing = list(self.b.search_rows(cnf={
             **self.call_cnf,
             'command': self.CMDS['search'],
-            'data': {'current': 1, 'rowCount': self.QUERY_MAX_RULES, 'sort': self.FIELD_ID},
-        })['rows']
+            'data': {'sort': self.FIELD_ID},
+        }))
 
         if self.FIELD_ID in self.p:  # list module
             for rule in existing:
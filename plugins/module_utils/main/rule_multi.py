@@ -7,15 +7,37 @@ from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.multi i
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.rule import \
     RULE_MOD_ARGS, RULE_DEFAULTS, RULE_MOD_ARG_ALIASES
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import diff_remove_empty
-from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import Session
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import Session, BatchSession
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.index import MatchingIndex
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.rule import Rule
 
 
-# pylint: disable=R0915
+def _apply_batch(
+        m: AnsibleModule, p: dict, r: dict, rule_session: BatchSession, changed_rules: set, max_parallel: int,
+) -> dict:
+    # failed rules are handled like processing-errors of the single rules; the others are still applied
+    errors = rule_session.flush(max_parallel=max_parallel)
+
+    for rule_key, rule_errors in errors.items():
+        r['diff']['before'].pop(rule_key, None)
+        r['diff']['after'].pop(rule_key, None)
+
+        if not p['fail_processing']:
+            m.warn(f"Failed to apply the changes of rule '{rule_key}': {rule_errors}")
+
+    r['changed'] = len(changed_rules - set(errors)) > 0
+    return errors
+
+
+# pylint: disable=R0914,R0915
 def process(m: AnsibleModule, p: dict, r: dict) -> None:
     s = Session(module=m)
+    # in batch-mode the changes are only sent once all rules were checked
+    rule_session = BatchSession(session=s) if p['batch'] else s
     meta_rule = Rule(module=m, session=s, result={})
     existing_rules = meta_rule.get_existing()
+    # the existing entries were already simplified by 'get_existing'
+    existing_rules_index = MatchingIndex(existing_items=existing_rules)
 
     if isinstance(p['key_field'], list):
         # edge case
@@ -69,6 +91,7 @@ def process(m: AnsibleModule, p: dict, r: dict) -> None:
             valid_rules[rule_key] = real_cnf
 
     # manage rules
+    changed_rules = set()
     for rule_key, rule_config in valid_rules.items():
         # process single rule like in the 'rule' module
         rule_result = dict(
@@ -84,23 +107,29 @@ def process(m: AnsibleModule, p: dict, r: dict) -> None:
         if p['debug'] or p['output_info']:
             m.warn(f"Processing rule: '{rule_key} => {rule_config}'")
 
+        if p['batch']:
+            # errors of the queued calls are mapped back to the rule
+            rule_session.owner = rule_key
+
         try:
             rule = Rule(
                 module=m,
                 result=rule_result,
                 cnf=rule_config,
-                session=s,
+                session=rule_session,
                 fail_verify=p['fail_verification'],
                 fail_proc=p['fail_processing'],
             )
             # save on requests
             rule.existing_entries = existing_rules
+            rule.existing_index = existing_rules_index
 
             rule.check()
             rule.process()
 
             if rule_result['changed']:
                 r['changed'] = True
+                changed_rules.add(rule_key)
                 rule_result['diff'] = diff_remove_empty(rule_result['diff'])
 
                 if 'before' in rule_result['diff']:
@@ -112,5 +141,19 @@ def process(m: AnsibleModule, p: dict, r: dict) -> None:
         except ModuleSoftError:
             continue
 
+    errors = {}
+    if p['batch']:
+        if p['output_info']:
+            m.warn(f"Applying {len(rule_session.calls)} rule changes")
+
+        errors = _apply_batch(
+            m=m, p=p, r=r, rule_session=rule_session, changed_rules=changed_rules,
+            max_parallel=meta_rule.b.max_parallel,
+        )
+
+    # the applied changes are activated even if others failed
     meta_rule.reload()
     s.close()
+
+    if p['fail_processing'] and len(errors) > 0:
+        m.fail_json(f"Failed to apply the changes of rules: {errors}", **r)
@@ -2,16 +2,18 @@ from ansible.module_utils.basic import AnsibleModule
 
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import is_unset
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.purge import \
-    purge, check_purge_filter
+    purge_items, check_purge_filter
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.rule import \
-    check_purge_configured
+    check_purge_configured, configured_rules_index
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import Session
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.rule import Rule
 
 
+# pylint: disable=R0915
 def process(m: AnsibleModule, p: dict, r: dict) -> None:
     s = Session(module=m)
-    existing_rules = Rule(module=m, session=s, result={}).get_existing()
+    meta_rule = Rule(module=m, session=s, result={})
+    existing_rules = meta_rule.get_existing()
     rules_to_purge = []
 
     def obj_func(rule_to_purge: dict) -> Rule:
@@ -43,17 +45,14 @@ def process(m: AnsibleModule, p: dict, r: dict) -> None:
                 is_unset(p['filters']):
             m.warn('Forced to purge ALL RULES!')
 
-            for existing_rule in existing_rules:
-                purge(
-                    module=m, result=r, obj_func=obj_func,
-                    diff_param=p['key_field'],
-                    item_to_purge=existing_rule,
-                )
+            rules_to_purge = existing_rules
 
         else:
             # checking if existing rule should be purged
+            configured_rules = configured_rules_index(module=m)
+
             for existing_rule in existing_rules:
-                to_purge = check_purge_configured(module=m, existing_rule=existing_rule)
+                to_purge = check_purge_configured(module=m, existing_rule=existing_rule, configured=configured_rules)
 
                 if to_purge:
                     to_purge = check_purge_filter(module=m, item=existing_rule)
@@ -67,11 +66,13 @@ def process(m: AnsibleModule, p: dict, r: dict) -> None:
 
                     rules_to_purge.append(existing_rule)
 
-            for rule in rules_to_purge:
-                r['changed'] = True
-                purge(
-                    module=m, result=r, diff_param=p['key_field'],
-                    obj_func=obj_func, item_to_purge=rule
-                )
+    purge_items(
+        module=m, result=r, diff_param=p['key_field'],
+        obj_func=obj_func, items_to_purge=rules_to_purge,
+        max_parallel=meta_rule.b.max_parallel,
+    )
+
+    if r['changed'] and p['reload']:
+        meta_rule.reload()
 
     s.close()
@@ -14,7 +14,9 @@ from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler i
 try:
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import profiler
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import \
-        OPN_MOD_ARGS, INFO_MOD_ARG, STATE_MOD_ARG_MULTI, RELOAD_MOD_ARG, FAIL_MOD_ARG_MULTI
+        INFO_MOD_ARG, STATE_MOD_ARG_MULTI, RELOAD_MOD_ARG, FAIL_MOD_ARG_MULTI, OPN_MOD_ARGS_FLEET, FLEET_MOD_ARGS, \
+        FLEET_REQUIRED_ONE_OF
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.fleet import fleet_process
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import diff_remove_empty
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.alias_multi import process
 
@@ -33,7 +35,8 @@ def run_module():
         **STATE_MOD_ARG_MULTI,
         **RELOAD_MOD_ARG,
         **INFO_MOD_ARG,
-        **OPN_MOD_ARGS,
+        **OPN_MOD_ARGS_FLEET,
+        **FLEET_MOD_ARGS,
     )
 
     result = dict(
@@ -47,17 +50,19 @@ def run_module():
     module = AnsibleModule(
         argument_spec=module_args,
         supports_check_mode=True,
+        required_one_of=FLEET_REQUIRED_ONE_OF,
     )
+    run = process if module.params['firewalls'] is None else fleet_process(process)
 
     if module.params['profiling'] or module.params['debug']:
         profiler(
-            check=process, kwargs=dict(
+            check=run, kwargs=dict(
                 m=module, p=module.params, r=result,
             ),
         )
 
     else:
-        process(m=module, p=module.params, r=result)
+        run(m=module, p=module.params, r=result)
 
     result['diff'] = diff_remove_empty(result['diff'])
     module.exit_json(**result)
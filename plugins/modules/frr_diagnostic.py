@@ -13,7 +13,7 @@ from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler i
 
 try:
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import \
-        OPN_MOD_ARGS
+        OPN_MOD_ARGS, CACHE_MOD_ARGS
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import single_get
 
 except MODULE_EXCEPTIONS:
@@ -37,6 +37,7 @@ def run_module():
             description='What information to query'
         ),
         **OPN_MOD_ARGS,
+        **CACHE_MOD_ARGS,
     )
 
     module = AnsibleModule(
@@ -0,0 +1,91 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (C) 2024, AnsibleGuy <guy@ansibleguy.net>
+# GNU General Public License v3.0+ (see https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# see: https://docs.opnsense.org/development/api/core/ids.html
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler import \
+    module_dependency_error, MODULE_EXCEPTIONS
+
+try:
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import profiler
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import \
+        diff_remove_empty
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import \
+        RELOAD_MOD_ARG, INFO_MOD_ARG, FAIL_MOD_ARG_MULTI, OPN_MOD_ARGS_FLEET, FLEET_MOD_ARGS, \
+        FLEET_REQUIRED_ONE_OF
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.fleet import fleet_process
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.ids_rule_multi import \
+        process
+
+except MODULE_EXCEPTIONS:
+    module_dependency_error()
+
+
+# DOCUMENTATION = 'https://opnsense.ansibleguy.net/en/latest/modules/ids.html'
+# EXAMPLES = 'https://opnsense.ansibleguy.net/en/latest/modules/ids.html'
+
+
+def run_module():
+    module_args = dict(
+        rules=dict(
+            type='dict', required=True, aliases=['sids'],
+            description="Rules to modify by their signature-ID. Format: {2400000: {'action': 'drop', 'enabled': true}}"
+        ),
+        action=dict(
+            type='str', required=False, aliases=['a'], default=None,
+            choices=['alert', 'drop'],
+            description='Default action of the rules, only used when in IPS mode. '
+                        'Rules without an action keep their current one',
+        ),
+        enabled=dict(
+            type='bool', required=False, default=None,
+            description='Default state of the rules. Rules without a state keep their current one',
+        ),
+        **FAIL_MOD_ARG_MULTI,
+        **INFO_MOD_ARG,
+        **OPN_MOD_ARGS_FLEET,
+        **FLEET_MOD_ARGS,
+        **RELOAD_MOD_ARG,
+    )
+
+    result = dict(
+        changed=False,
+        diff={
+            'before': {},
+            'after': {},
+        }
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+        required_one_of=FLEET_REQUIRED_ONE_OF,
+    )
+    run = process if module.params['firewalls'] is None else fleet_process(process)
+
+    if module.params['profiling'] or module.params['debug']:
+        profiler(
+            check=run,
+            kwargs=dict(
+                m=module, p=module.params, r=result,
+            ),
+        )
+
+    else:
+        run(m=module, p=module.params, r=result)
+
+    result['diff'] = diff_remove_empty(result['diff'])
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -7,13 +7,18 @@
 # module to query running config
 # pylint: disable=R0912,R0915,R0914
 
+from time import perf_counter
+
 from ansible.module_utils.basic import AnsibleModule
 
 from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler import \
-    module_dependency_error, MODULE_EXCEPTIONS
+    module_dependency_error, MODULE_EXCEPTIONS, ModuleSoftError, ModuleFailure, AnsibleModuleError
 
 try:
-    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import OPN_MOD_ARGS
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import \
+        OPN_MOD_ARGS, CACHE_MOD_ARGS
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import Session
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import parallel_map
 
 except MODULE_EXCEPTIONS:
     module_dependency_error()
@@ -38,28 +43,10 @@ TARGETS = [
     'openvpn_instance', 'openvpn_static_key', 'openvpn_client_override', 'dhcrelay_destination', 'dhcrelay_relay',
     'interface_lagg', 'interface_loopback', 'unbound_dnsbl', 'dhcp_reservation',
 ]
+TARGET_ALL = 'all'
 
 
-def run_module():
-    module_args = dict(
-        target=dict(
-            type='str', required=True, aliases=['tgt', 't'],
-            choices=TARGETS,
-            description='What part of the running config should be listed'
-        ),
-        **OPN_MOD_ARGS,
-    )
-
-    result = dict(
-        changed=False,
-    )
-
-    module = AnsibleModule(
-        argument_spec=module_args,
-        supports_check_mode=True,
-    )
-
-    target = module.params['target']
+def _load_target(module: AnsibleModule, target: str, session: (Session, None)):
     Target_Obj, target_inst = None, None
 
     try:
@@ -129,7 +116,7 @@ def run_module():
 
         elif target == 'package':
             from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.package import Package
-            target_inst = Package(module=module, name='dummy')
+            target_inst = Package(module=module, name='dummy', session=session)
 
         elif target == 'ipsec_cert':
             from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.ipsec_cert import \
@@ -406,32 +393,120 @@ def run_module():
     except AttributeError:
         module_dependency_error()
 
-    result['data'] = None
+    if target_inst is None and Target_Obj is not None:
+        target_inst = Target_Obj(module=module, result={}, session=session)
 
-    if Target_Obj is not None or target_inst is not None:
-        if target_inst is None:
-            target_inst = Target_Obj(module=module, result=result)
+    return target_inst
 
-        if hasattr(target_inst, 'get_existing'):
-            # has additional filtering
-            target_func = getattr(target_inst, 'get_existing')
 
-        elif hasattr(target_inst, 'search_call'):
-            target_func = getattr(target_inst, 'search_call')
+def _list_target(module: AnsibleModule, target: str, session: (Session, None)) -> (list, dict):
+    target_inst = _load_target(module=module, target=target, session=session)
 
-        elif hasattr(target_inst, '_search_call'):
-            target_func = getattr(target_inst, '_search_call')
+    if target_inst is None:
+        module.fail_json(f"Got unsupported target: '{target}'")
 
-        else:
-            target_func = getattr(target_inst.b, 'get_existing')
+    if hasattr(target_inst, 'get_existing'):
+        # has additional filtering
+        target_func = getattr(target_inst, 'get_existing')
 
-        result['data'] = target_func()
+    elif hasattr(target_inst, 'search_call'):
+        target_func = getattr(target_inst, 'search_call')
 
-        if hasattr(target_inst, 's'):
-            target_inst.s.close()
+    elif hasattr(target_inst, '_search_call'):
+        target_func = getattr(target_inst, '_search_call')
 
     else:
-        module.fail_json(f"Got unsupported target: '{target}'")
+        target_func = getattr(target_inst.b, 'get_existing')
+
+    data = target_func()
+
+    if session is None and hasattr(target_inst, 's'):
+        target_inst.s.close()
+
+    return data
+
+
+class TargetModule:
+    # wraps the module so errors of a single target do not fail the listing of all other targets
+
+    def __init__(self, module: AnsibleModule, params: dict = None):
+        self._module = module
+        self.params = module.params if params is None else params
+
+    def __getattr__(self, name: str):
+        return getattr(self._module, name)
+
+    def fail_json(self, msg: str, **kwargs) -> None:
+        del kwargs
+        raise ModuleSoftError(msg)
+
+
+def _list_targets(module: AnsibleModule, targets: list) -> tuple:
+    data, timing, errors = {}, {}, {}
+    max_parallel = max(1, module.params['api_max_parallel'])
+    # the parallel targets share the request-limit - their detail-fetching gets its part of it
+    parallel_targets = min(max_parallel, len(targets))
+    target_params = {**module.params, 'api_max_parallel': max(1, max_parallel // max(1, parallel_targets))}
+
+    def _list(target: str) -> None:
+        start = perf_counter()
+        target_module = TargetModule(module=module, params=target_params)
+
+        try:
+            data[target] = _list_target(module=target_module, target=target, session=session)
+
+        except (ModuleSoftError, ModuleFailure, AnsibleModuleError) as error:
+            errors[target] = str(error)
+
+        timing[target] = round(perf_counter() - start, 3)
+
+    # one session for all targets; its errors are raised as ModuleFailure inside the workers
+    with Session(module=module) as session:
+        parallel_map(func=_list, items=targets, max_parallel=parallel_targets, module=module)
+
+    return data, timing, errors
+
+
+def run_module():
+    module_args = dict(
+        target=dict(
+            type='list', elements='str', required=True, aliases=['tgt', 't'],
+            choices=TARGETS + [TARGET_ALL],
+            description="What part of the running config should be listed. "
+                        "Can also be multiple targets or 'all' - "
+                        "the targets are then fetched in parallel and the data is returned per target"
+        ),
+        **OPN_MOD_ARGS,
+        **CACHE_MOD_ARGS,
+    )
+
+    result = dict(
+        changed=False,
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+    )
+
+    targets = module.params['target']
+    list_all = TARGET_ALL in targets
+    if list_all:
+        targets = TARGETS
+
+    if list_all or len(targets) > 1:
+        result['data'], result['timing'], errors = _list_targets(module=module, targets=targets)
+
+        for _target, error in errors.items():
+            if list_all:
+                # plugins might not be installed
+                module.warn(f"Unable to list target '{_target}': {error}")
+
+            else:
+                module.fail_json(f"Unable to list target '{_target}': {error}")
+
+    else:
+        result['data'] = _list_target(module=module, target=targets[0], session=None)
 
     module.exit_json(**result)
 
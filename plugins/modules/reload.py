@@ -14,6 +14,8 @@ from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler i
 
 try:
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import OPN_MOD_ARGS
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import Session
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.reload import flush_reloads
 
 except MODULE_EXCEPTIONS:
     module_dependency_error()
@@ -50,8 +52,11 @@ def run_module():
                 'ids',
                 'openvpn',
                 'dhcrelay',
+                'pending',
             ],
-            description='What part of the running config should be reloaded'
+            description="What part of the running config should be reloaded. "
+                        "'pending' executes the reloads that were deferred using 'reload_defer' - "
+                        "each distinct one only once"
         ),
         **OPN_MOD_ARGS,
     )
@@ -68,6 +73,14 @@ def run_module():
     target = module.params['target']
     Target_Obj = None
 
+    if target == 'pending':
+        with Session(module=module) as s:
+            reloads = flush_reloads(module=module, session=s)
+
+        result['changed'] = len(reloads) > 0
+        result['reloaded'] = [f"{r['module']}/{r['controller']}/{r['command']}" for r in reloads]
+        module.exit_json(**result)
+
     try:
         # NOTE: dynamic imports not working as Ansible will not copy those modules to the temporary directory
         #   the module is executed in!
@@ -15,7 +15,9 @@ try:
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import profiler
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import diff_remove_empty
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import \
-        OPN_MOD_ARGS, STATE_MOD_ARG_MULTI, INFO_MOD_ARG, FAIL_MOD_ARG_MULTI, RELOAD_MOD_ARG
+        STATE_MOD_ARG_MULTI, INFO_MOD_ARG, FAIL_MOD_ARG_MULTI, RELOAD_MOD_ARG, OPN_MOD_ARGS_FLEET, FLEET_MOD_ARGS, \
+        FLEET_REQUIRED_ONE_OF
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.fleet import fleet_process
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.rule import \
         RULE_MATCH_FIELDS_ARG, RULE_MOD_ARG_KEY_FIELD
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.rule_multi import process
@@ -39,13 +41,19 @@ def run_module():
         defaults=dict(
             type='dict', required=False, default={}, description='Default values for all rules'
         ),
+        batch=dict(
+            type='bool', required=False, default=False,
+            description='If enabled - the changes of all rules are computed first and sent in parallel afterwards. '
+                        "The number of parallel requests is limited by 'api_max_parallel'"
+        ),
         **FAIL_MOD_ARG_MULTI,
         **STATE_MOD_ARG_MULTI,
         **INFO_MOD_ARG,
         **RULE_MOD_ARG_KEY_FIELD,
         **RULE_MATCH_FIELDS_ARG,
         **RELOAD_MOD_ARG,
-        **OPN_MOD_ARGS,
+        **OPN_MOD_ARGS_FLEET,
+        **FLEET_MOD_ARGS,
     )
 
     result = dict(
@@ -59,17 +67,19 @@ def run_module():
     module = AnsibleModule(
         argument_spec=module_args,
         supports_check_mode=True,
+        required_one_of=FLEET_REQUIRED_ONE_OF,
     )
+    run = process if module.params['firewalls'] is None else fleet_process(process)
 
     if module.params['profiling'] or module.params['debug']:
         profiler(
-            check=process, kwargs=dict(
+            check=run, kwargs=dict(
                 m=module, p=module.params, r=result,
             ),
         )
 
     else:
-        process(m=module, p=module.params, r=result)
+        run(m=module, p=module.params, r=result)
 
     result['diff'] = diff_remove_empty(result['diff'])
     module.exit_json(**result)
@@ -16,7 +16,7 @@ try:
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.main.rule_purge import process
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.main import diff_remove_empty
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import \
-        OPN_MOD_ARGS, PURGE_MOD_ARGS, INFO_MOD_ARG
+        OPN_MOD_ARGS, PURGE_MOD_ARGS, INFO_MOD_ARG, RELOAD_MOD_ARG
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.rule import \
         RULE_MATCH_FIELDS_ARG, RULE_MOD_ARG_KEY_FIELD
 
@@ -38,6 +38,7 @@ def run_module():
             type='bool', required=False, default=False, aliases=['fail'],
             description='Fail module if single rule fails to be purged.'
         ),
+        **RELOAD_MOD_ARG,
         **PURGE_MOD_ARGS,
         **INFO_MOD_ARG,
         **RULE_MOD_ARG_KEY_FIELD,
@@ -13,7 +13,7 @@ from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.handler i
 
 try:
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import \
-        OPN_MOD_ARGS
+        OPN_MOD_ARGS, CACHE_MOD_ARGS
     from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import \
         single_get, single_post
 
@@ -92,6 +92,7 @@ def run_module():
                         'the module will inform you in that case'
         ),
         **OPN_MOD_ARGS,
+        **CACHE_MOD_ARGS,
     )
 
     result = dict(
@@ -0,0 +1,78 @@
+# ansible keeps the module arguments in protected module-level variables
+# pylint: disable=W0212
+
+from io import StringIO
+from contextlib import redirect_stdout
+from importlib import import_module
+from json import dumps as json_dumps
+from json import loads as json_loads
+from json import JSONDecodeError
+
+from ansible.module_utils import basic
+from ansible.module_utils.common import warnings
+from ansible.module_utils.common.json import AnsibleJSONEncoder
+
+IN_PROCESS_VAR = 'opnsense_in_process'
+MODULE_PATH = 'ansible_collections.ansibleguy.opnsense.plugins.modules'
+
+
+def _reset_module_state() -> None:
+    # arguments & warnings must not leak into the next run
+    basic._ANSIBLE_ARGS = None
+    warnings._global_warnings.clear()
+    warnings._global_deprecations.clear()
+
+
+def _reset_process_state() -> None:
+    # the per-run state of the module-utils must not leak into the next run
+    #   the pooled API clients (per firewall) are kept, so their connections are re-used; they are closed on exit
+    # pylint: disable=C0415
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper import index, utils
+
+    utils.PROFILE_COUNTERS.clear()
+    utils._WORKER.active = False
+    index._LINK_INDEXES.clear()
+
+
+def run_module_in_process(
+        name: str, args: dict, internal_args: dict = None, check_mode: bool = False, diff: bool = False,
+) -> dict:
+    # 'internal_args' are the '_ansible_*' arguments ansible passes to the module (no_log, verbosity, socket, ..);
+    #   they take precedence over 'check_mode' & 'diff'
+    module = import_module(f'{MODULE_PATH}.{name}')
+    _reset_module_state()
+    basic._ANSIBLE_ARGS = json_dumps(
+        {'ANSIBLE_MODULE_ARGS': {
+            **args,
+            '_ansible_module_name': name,
+            '_ansible_check_mode': check_mode,
+            '_ansible_diff': diff,
+            **({} if internal_args is None else internal_args),
+        }},
+        cls=AnsibleJSONEncoder,
+    ).encode('utf-8')
+
+    if hasattr(basic, '_ANSIBLE_PROFILE'):
+        basic._ANSIBLE_PROFILE = 'legacy'
+
+    output = StringIO()
+
+    try:
+        with redirect_stdout(output):
+            module.main()
+
+    except SystemExit:
+        pass
+
+    except Exception as error:  # pylint: disable=W0718
+        return {'failed': True, 'msg': f"Module '{name}' failed: {type(error).__name__} - {error}"}
+
+    finally:
+        _reset_module_state()
+        _reset_process_state()
+
+    try:
+        return json_loads(output.getvalue())
+
+    except JSONDecodeError:
+        return {'failed': True, 'msg': f"Module '{name}' returned no valid result", 'module_stdout': output.getvalue()}
@@ -0,0 +1,101 @@
+# pylint: disable=C0415
+
+import pytest
+
+PORT = 51343
+
+
+class MockModule:
+    def __init__(self, params: dict):
+        self.params = params
+
+
+def _args(**kwargs) -> dict:
+    return {
+        'firewall': '127.0.0.1',
+        'api_port': PORT,
+        'api_key': 'key',
+        'api_secret': 'secret',
+        'ssl_verify': False,
+        **kwargs,
+    }
+
+
+@pytest.fixture(name='api')
+def fixture_api():
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.defaults.main import OPN_MOD_ARGS
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api_mock import build_mock_api
+
+    mock = build_mock_api(size=10)
+    module = MockModule({**{k: v.get('default') for k, v in OPN_MOD_ARGS.items()}, **_args()})
+    mock.install(module)
+    yield mock, module
+    mock.uninstall(module)
+
+
+def _run(**kwargs) -> dict:
+    # the mocked API is installed by the fixture
+    from ansible_collections.ansibleguy.opnsense.plugins.plugin_utils.controller import run_module_in_process
+
+    return run_module_in_process(name='alias', **kwargs)
+
+
+def test_run_module_in_process(api):
+    alias = _args(name='in_process', content=['192.168.0.1'], reload=False)
+
+    result = _run(args=alias, diff=True)
+    assert result['changed'] and 'failed' not in result
+    assert result['diff']['after']['name'] == 'in_process'
+
+    result = _run(args=alias)
+    assert not result['changed'] and 'failed' not in result
+    assert api[0].count(method='GET') > 0
+
+    result = _run(args={**alias, 'content': ['192.168.0.2']}, check_mode=True)
+    assert result['changed']
+    assert api[0].count(command='setItem') == 0
+
+    # the internal arguments take precedence
+    result = _run(
+        args={**alias, 'content': ['192.168.0.3']}, check_mode=True,
+        internal_args={'_ansible_check_mode': False, '_ansible_no_log': True},
+    )
+    assert result['changed']
+    assert api[0].count(command='setItem') == 1
+
+
+def test_run_module_in_process_reset(api):
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.base.api import get_pooled_client
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.index import _LINK_INDEXES
+    from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.utils import PROFILE_COUNTERS, _WORKER
+
+    client = get_pooled_client(module=api[1])
+    result = _run(args=_args(name='in_process', content=['192.168.0.1'], reload=False, profiling=True))
+    assert 'failed' not in result
+
+    # the per-run state does not leak into the next run
+    assert len(_LINK_INDEXES) == 0
+    assert len(PROFILE_COUNTERS) == 0
+    assert not getattr(_WORKER, 'active', False)
+
+    # the connections of the firewall are re-used
+    assert get_pooled_client(module=api[1]) is client
+    assert not client.is_closed
+
+
+def test_run_module_in_process_socket(api):
+    # with a persistent connection the requests are sent through its socket
+    result = _run(
+        args=_args(name='in_process', content=['192.168.0.1'], reload=False),
+        internal_args={'_ansible_socket': '/nonexistent/opnsense.sock'},
+    )
+    assert result['failed']
+    assert api[0].total == 0
+
+
+def test_run_module_in_process_fail():
+    from ansible_collections.ansibleguy.opnsense.plugins.plugin_utils.controller import run_module_in_process
+
+    result = run_module_in_process(name='alias', args={'name': 'in_process'})
+    assert result['failed']
+    assert 'firewall' in result['msg']
@@ -138,6 +138,7 @@ run_test 'ids_action' 1
 run_test 'ids_general' 1
 run_test 'ids_ruleset' 1
 run_test 'ids_rule' 1
+run_test 'ids_rule_multi' 1
 run_test 'ids_user_rule' 1
 run_test 'ids_policy' 1
 run_test 'ids_policy_rule' 1
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+
+# summarizes the API trace (see module argument 'api_trace') as per-endpoint latency percentiles
+#   usage: python3 scripts/trace_summary.py [/tmp/ansibleguy.opnsense/api_trace.jsonl]
+
+import sys
+from pathlib import Path
+
+# the collection is expected at '<path>/ansible_collections/ansibleguy/opnsense' (p.e. installed using ansible-galaxy)
+sys.path.append(str(Path(__file__).absolute().parents[4]))
+
+# pylint: disable=C0413
+from ansible_collections.ansibleguy.opnsense.plugins.module_utils.helper.trace import \
+    trace_file, load_trace, aggregate_trace, format_trace_table
+
+
+if __name__ == '__main__':
+    print(format_trace_table(aggregate_trace(load_trace(sys.argv[1] if len(sys.argv) > 1 else trace_file()))))